@@ -12,22 +12,43 @@ import time
 import unicodedata
 
 from defcon import Glyph
-from PyQt5.QtCore import QRectF, QSize, Qt, pyqtSignal
-from PyQt5.QtGui import QColor, QCursor, QDrag, QPainter, QPainterPath, QPalette
+from PyQt5.QtCore import QRect, QRectF, QSize, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import (
+    QColor,
+    QCursor,
+    QDrag,
+    QPainter,
+    QPainterPath,
+    QPalette,
+    QPixmap,
+)
 from PyQt5.QtWidgets import QApplication, QScrollArea, QSizePolicy, QWidget
 
 from defconQt.representationFactories.glyphCellFactory import (
     GlyphCellHeaderHeight,
+    GlyphCellInfoAttributes,
     GlyphCellMinHeightForHeader,
 )
 from defconQt.tools import platformSpecific
+from defconQt.tools.glyphCellCache import representationKey
+from defconQt.tools.glyphCellRenderer import GlyphCellRenderer
+from defconQt.tools.glyphNameIndex import GlyphNameIndex
 from defconQt.tools.glyphsMimeData import GlyphsMimeData
+from defconQt.tools.indexSet import IndexSet
 
 backgroundColor = Qt.white
 cellGridColor = QColor(190, 190, 190)
+pendingCellColor = QColor(240, 240, 240)
 insertionPositionColor = QColor.fromRgbF(0.16, 0.3, 0.85, 1)
 
-cacheBustSize = 10
+# approximate height of the bands of rows cells are composited into
+rowBandHeight = 256
+
+# cell heights cells are drawn at while the cell size keeps changing, then
+# scaled down
+cellSizeLevels = (32, 64, 128, 256)
+# in ms, time the cell size must stay the same to draw cells at that size
+cellSizeSettleDelay = 200
 
 
 class GlyphCellWidget(QWidget):
@@ -44,6 +65,24 @@ class GlyphCellWidget(QWidget):
     then supports reordering its glyph cells (in which case it emits
     *orderChanged*).
 
+    The glyph list may contain None entries for glyphs that are still being
+    loaded; these are drawn as empty placeholder cells until replaced with
+    *replaceGlyphs()*.
+
+    It may also contain stand-ins, lightweight objects that are drawn like
+    glyphs and have a *promote()* method that returns the actual Glyph_.
+    Stand-ins are promoted, and replaced in the list, as they are handed
+    out by *glyphsForIndexes()*, *lastSelectedGlyph()* and *glyphActivated*.
+
+    Cells are drawn in worker threads by a
+    :class:`defconQt.tools.glyphCellRenderer.GlyphCellRenderer`, those in
+    view first, then those of the rows around. Cells that aren’t drawn yet
+    are painted as placeholders.
+
+    While the cell size keeps changing, e.g. as a size slider is dragged,
+    cells are drawn at a few set sizes (*cellSizeLevels*) and scaled, until
+    the size settles.
+
     # TODO: navigation with Shift is perfectible
 
     .. _Glyph: http://ts-defcon.readthedocs.org/en/ufo3/objects/glyph.html
@@ -61,12 +100,16 @@ class GlyphCellWidget(QWidget):
         self._cellWidth = 50
         self._cellHeight = 50
         self._cellWidthExtra = 0
-        self._cellSizeCache = set()
         self._glyphs = []
+        # glyph: indexes, built when needed
+        self._glyphIndexes = None
+        # for type-to-select, built when first needed
+        self._nameIndex = None
+        self._dirtyIndexes = set()
 
         self._inputString = ""
         self._lastKeyInputTime = None
-        self._selection = set()
+        self._selection = IndexSet()
         self._lastSelectedCell = None
 
         self._currentDropIndex = None
@@ -77,6 +120,28 @@ class GlyphCellWidget(QWidget):
 
         self._cellRepresentationName = "defconQt.GlyphCell"
         self._cellRepresentationArguments = {}
+        self._renderer = GlyphCellRenderer(self)
+        self._renderer.cellRendered.connect(self._updateGlyphCells)
+
+        # whether cells are drawn at a level size and scaled
+        self._scalingCells = False
+        # key of the level size representation, scaled in place of cells
+        # not drawn yet
+        self._levelKey = None
+        self._cellSizeTimer = QTimer(self)
+        self._cellSizeTimer.setSingleShot(True)
+        self._cellSizeTimer.setInterval(cellSizeSettleDelay)
+        self._cellSizeTimer.timeout.connect(self._cellSizeSettled)
+
+        # band: pixmap
+        self._bands = {}
+        # band: indexes of the cells to draw again
+        self._staleCells = {}
+        self._bandKey = None
+        self._bandRows = 1
+        self._bandSelection = set()
+        # what the renderer was last given cells for
+        self._queueKey = None
 
     # --------------
     # Custom methods
@@ -89,25 +154,48 @@ class GlyphCellWidget(QWidget):
         scrollArea.setWidget(self)
         self._scrollArea = scrollArea
 
-    def _getCurrentRepresentation(self, glyph):
+    def renderer(self):
+        """
+        Returns the :class:`defconQt.tools.glyphCellRenderer.GlyphCellRenderer`
+        that draws the cells.
+        """
+        return self._renderer
+
+    def _updateRenderer(self):
         name = self._cellRepresentationName
-        args = self._cellRepresentationArguments
+        args = dict(self._cellRepresentationArguments)
         args["width"] = self._cellWidth + 2 * self._cellWidthExtra
         args["height"] = self._cellHeight
         args["pixelRatio"] = self.devicePixelRatio()
-
-        self._cellSizeCache.add((args["width"], args["height"]))
-        return glyph.getRepresentation(name, **args)
+        # the smallest level at least as large as the cell, with the same
+        # proportions sans extra width so that it doesn't change with the
+        # column count
+        height = self._cellHeight
+        level = next(
+            (level for level in cellSizeLevels if level >= height), cellSizeLevels[-1]
+        )
+        levelArgs = dict(
+            args, width=round(level * self._cellWidth / height), height=level
+        )
+        if self._scalingCells:
+            self._renderer.setRepresentation(name, levelArgs)
+            self._levelKey = None
+        else:
+            self._renderer.setRepresentation(name, args)
+            self._levelKey = representationKey(name, levelArgs)
+            if self._levelKey == self._renderer.representationKey():
+                self._levelKey = None
 
     def preloadGlyphCellImages(self):
         """
-        This preloads the glyphs’ current cell representations in the defcon
-        representations_ cache.
-
-        .. _representations: http://ts-defcon.readthedocs.org/en/ufo3/concepts/representations.html
+        This draws the glyphs’ current cell representations right away,
+        rather than in the background as cells come into view.
         """
+        self._updateRenderer()
+        renderer = self._renderer
         for glyph in self._glyphs:
-            self._getCurrentRepresentation(glyph)
+            if glyph is not None and renderer.pixmap(glyph) is None:
+                renderer.renderCell(glyph)
 
     def glyphs(self):
         """
@@ -126,21 +214,178 @@ class GlyphCellWidget(QWidget):
 
         .. _Glyph: http://ts-defcon.readthedocs.org/en/ufo3/objects/glyph.html
         """
-        currentSelection = [self._glyphs[index] for index in self._selection]
-        newSelection = {
-            glyphs.index(glyph) for glyph in currentSelection if glyph in glyphs
+        # selected glyphs go to their first index in the new list
+        currentSelection = {
+            self._glyphs[index]
+            for index in self._selection
+            if self._glyphs[index] is not None
         }
+        newSelection = set()
+        if currentSelection:
+            for index, glyph in enumerate(glyphs):
+                if glyph in currentSelection:
+                    newSelection.add(index)
+                    currentSelection.remove(glyph)
+                    if not currentSelection:
+                        break
         self._glyphs = glyphs
+        self._glyphIndexes = None
+        self._nameIndex = None
+        self._invalidateBands()
         self.setSelection(newSelection)
         self.adjustSize()
 
+    def appendGlyphs(self, glyphs):
+        """
+        Appends the list of Glyph_ *glyphs* to the glyphs displayed by this
+        widget. Selection is left untouched.
+
+        .. _Glyph: http://ts-defcon.readthedocs.org/en/ufo3/objects/glyph.html
+        """
+        nameIndex = self._nameIndex
+        if nameIndex is not None:
+            for index, glyph in enumerate(glyphs, len(self._glyphs)):
+                nameIndex.setGlyph(index, glyph)
+        self._glyphs.extend(glyphs)
+        self._glyphIndexes = None
+        self._invalidateBands()
+        self.adjustSize()
+        self.update()
+
+    def replaceGlyphs(self, glyphs):
+        """
+        Replaces glyphs in place, where *glyphs* is a dict of
+        *{index: glyph}*. Selection is left untouched.
+
+        This is used to fill in placeholder cells as glyphs are loaded.
+        """
+        nameIndex = self._nameIndex
+        for index, glyph in glyphs.items():
+            self._glyphs[index] = glyph
+            if nameIndex is not None:
+                nameIndex.setGlyph(index, glyph)
+        self._glyphIndexes = None
+        self._invalidateCells(glyphs.keys())
+        self.update()
+
     def glyphsForIndexes(self, indexes):
         """
-        Returns a list of glyphs that are at *indexes*.
+        Returns a list of glyphs that are at *indexes*, omitting placeholder
+        cells and promoting stand-ins.
 
         Indexes must be in range(len(glyphs)).
         """
-        return [self._glyphs[i] for i in indexes]
+        self._promoteGlyphs(indexes)
+        glyphs = self._glyphs
+        return [glyphs[i] for i in indexes if glyphs[i] is not None]
+
+    def _promoteGlyphs(self, indexes):
+        glyphs = self._glyphs
+        promoted = []
+        for index in indexes:
+            promote = getattr(glyphs[index], "promote", None)
+            if promote is not None:
+                glyphs[index] = promote()
+                promoted.append(index)
+        if promoted:
+            self._glyphIndexes = None
+            nameIndex = self._nameIndex
+            if nameIndex is not None:
+                for index in promoted:
+                    nameIndex.setGlyph(index, glyphs[index])
+            self._invalidateCells(promoted)
+            self.update()
+
+    def updateGlyph(self, glyph):
+        """
+        Schedules a repaint of the cells that display *glyph*.
+
+        Changes are collected until control returns to the event loop, and
+        only cells that are in view are then repainted.
+        """
+        self._renderer.invalidate(glyph)
+        nameIndex = self._nameIndex
+        if nameIndex is not None:
+            # it may have been renamed
+            for index in self._indexesOfGlyph(glyph):
+                nameIndex.setGlyph(index, glyph)
+        self._updateGlyphCells(glyph)
+
+    def _indexesOfGlyph(self, glyph):
+        glyphIndexes = self._glyphIndexes
+        if glyphIndexes is None:
+            glyphIndexes = self._glyphIndexes = {}
+            for index, glyph_ in enumerate(self._glyphs):
+                if glyph_ is not None:
+                    glyphIndexes.setdefault(glyph_, []).append(index)
+        return glyphIndexes.get(glyph, ())
+
+    def _updateGlyphCells(self, glyph):
+        indexes = self._indexesOfGlyph(glyph)
+        if not indexes:
+            return
+        if not self._dirtyIndexes:
+            QTimer.singleShot(0, self._updateDirtyCells)
+        self._dirtyIndexes.update(indexes)
+
+    def _updateDirtyCells(self):
+        indexes = self._dirtyIndexes
+        self._dirtyIndexes = set()
+        self._invalidateCells(indexes)
+        visibleRect = self.visibleRegion().boundingRect()
+        glyphCount = len(self._glyphs)
+        for index in indexes:
+            if index >= glyphCount:
+                continue
+            rect = self._cellRect(index)
+            if rect.intersects(visibleRect):
+                self.update(rect)
+
+    def _queueCells(self):
+        # cells in view first, then a page of rows below and above it,
+        # nearest first
+        glyphs = self._glyphs
+        visibleRect = self.visibleRegion().boundingRect()
+        if not glyphs or visibleRect.isEmpty():
+            self._renderer.setQueue([])
+            self._queueKey = None
+            return
+        columns = max(self._columnCount, 1)
+        rowCount = -(-len(glyphs) // columns)
+        firstRow = visibleRect.top() // self._cellHeight
+        lastRow = visibleRect.bottom() // self._cellHeight
+        # unless cells changed or were drawn since, the queue needs no update
+        # until the view is past half the rows around it
+        key = (self._renderer.representationKey(), columns, self._cellHeight)
+        queueKey = self._queueKey
+        if (
+            queueKey is not None
+            and queueKey[0] == key
+            and queueKey[1] <= firstRow
+            and lastRow <= queueKey[2]
+        ):
+            return
+        margin = (lastRow - firstRow + 2) // 2
+        self._queueKey = (key, firstRow - margin, lastRow + margin)
+        rows = list(range(firstRow, lastRow + 1))
+        for distance in range(1, lastRow - firstRow + 2):
+            rows.append(lastRow + distance)
+            rows.append(firstRow - distance)
+        queue = []
+        for row in rows:
+            if 0 <= row < rowCount:
+                queue.extend(glyphs[row * columns : (row + 1) * columns])
+        self._renderer.setQueue(queue)
+
+    def _cellRect(self, index):
+        cellWidth = self._cellWidth + 2 * self._cellWidthExtra
+        columns = max(self._columnCount, 1)
+        return QRect(
+            (index % columns) * cellWidth,
+            (index // columns) * self._cellHeight,
+            cellWidth,
+            self._cellHeight,
+        )
 
     def cellSize(self):
         """
@@ -158,12 +403,23 @@ class GlyphCellWidget(QWidget):
         """
         if height is None:
             height = width
+        if (width, height) != (self._cellWidth, self._cellHeight):
+            # when the size changes again before it settled, draw cells
+            # scaled from a few sizes until it does
+            timer = self._cellSizeTimer
+            if timer.isActive():
+                self._scalingCells = True
+            timer.start()
         self._cellWidth = width
         self._cellHeight = height
         self._calculateCellWidthExtra()
-        self._checkFlushCache()
         self.adjustSize()
 
+    def _cellSizeSettled(self):
+        if self._scalingCells:
+            self._scalingCells = False
+            self.update()
+
     def cellRepresentationName(self):
         """
         Returns the name of the current glyph cell representation.
@@ -202,13 +458,16 @@ class GlyphCellWidget(QWidget):
 
     def selection(self):
         """
-        Returns a list of the current selection indexes, in ascending order.
+        Returns the current selection indexes as an
+        :class:`defconQt.tools.indexSet.IndexSet`, which iterates them in
+        ascending order.
         """
-        return sorted(self._selection)
+        return self._selection.copy()
 
     def setSelection(self, selection, lastSelectedCell=None):
         """
-        Sets this widget’s selection to a set of indexes *selection*.
+        Sets this widget’s selection to a set of indexes *selection*, which
+        may also be an :class:`defconQt.tools.indexSet.IndexSet` or a range.
 
         *lastSelectedCell* can be specified as an index that’s a member of the
         *selection* set, otherwise it will be set to min(selection) or None if
@@ -217,16 +476,13 @@ class GlyphCellWidget(QWidget):
         The default *selection* is set(). The default *lastSelectedCell*
         is None.
         """
-        self._selection = set(selection)
+        self._selection = IndexSet(selection)
         if lastSelectedCell is not None:
             assert lastSelectedCell in self._selection
             self._lastSelectedCell = lastSelectedCell
         else:
             # fallback
-            if not selection:
-                self._lastSelectedCell = None
-            else:
-                self._lastSelectedCell = min(self._selection)
+            self._lastSelectedCell = self._selection.first()
         if self._lastSelectedCell is not None:
             self.scrollToCell(self._lastSelectedCell)
         self.selectionChanged.emit()
@@ -238,6 +494,7 @@ class GlyphCellWidget(QWidget):
     def lastSelectedGlyph(self):
         cell = self._lastSelectedCell
         if cell is not None:
+            self._promoteGlyphs((cell,))
             return self._glyphs[cell]
         return None
 
@@ -248,12 +505,6 @@ class GlyphCellWidget(QWidget):
         else:
             self._cellWidthExtra = 0
 
-    def _checkFlushCache(self):
-        if len(self._cellSizeCache) >= cacheBustSize:
-            for glyph in self._glyphs:
-                glyph.destroyRepresentation(self._cellRepresentationName)
-            self._cellSizeCache = set()
-
     # ----------
     # Qt methods
     # ----------
@@ -281,59 +532,33 @@ class GlyphCellWidget(QWidget):
         return QSize(newWidth, newHeight)
 
     def paintEvent(self, event):
+        self._updateRenderer()
         painter = QPainter(self)
         visibleRect = event.rect()
         columnCount = self._columnCount
-        extra = self._cellWidthExtra
-        cellWidth, cellHeight = self._cellWidth + 2 * extra, self._cellHeight
+        cellWidth = self._cellWidth + 2 * self._cellWidthExtra
+        cellHeight = self._cellHeight
         glyphCount = len(self._glyphs)
-        if columnCount:
-            paintWidth = min(glyphCount, columnCount) * cellWidth
-        else:
-            paintWidth = 0
-        left = 0
-        top = cellHeight
-
-        painter.fillRect(visibleRect, Qt.white)
-        for index, glyph in enumerate(self._glyphs):
-            t = top - cellHeight
-            rect = (left, t, cellWidth, cellHeight)
-
-            if visibleRect.intersects(visibleRect.__class__(*rect)):
-                if index in self._selection:
-                    palette = self.palette()
-                    active = palette.currentColorGroup() != QPalette.Inactive
-                    opacityMultiplier = platformSpecific.colorOpacityMultiplier()
-                    selectionColor = palette.color(QPalette.Highlight)
-                    # TODO: alpha values somewhat arbitrary (here and in
-                    # glyphLineView)
-                    selectionColor.setAlphaF(0.2 * opacityMultiplier if active else 0.7)
-                    painter.fillRect(
-                        QRectF(left, t, cellWidth, cellHeight), selectionColor
-                    )
 
-                pixmap = self._getCurrentRepresentation(glyph)
-                painter.drawPixmap(left, t, pixmap)
-
-                # XXX: this hacks around the repr internals
-                if (
-                    index in self._selection
-                    and cellHeight >= GlyphCellMinHeightForHeader
-                ):
-                    painter.fillRect(
-                        QRectF(
-                            left,
-                            t + cellHeight - GlyphCellHeaderHeight,
-                            cellWidth,
-                            GlyphCellHeaderHeight,
-                        ),
-                        selectionColor,
-                    )
-
-            left += cellWidth
-            if left + cellWidth > paintWidth:
-                left = 0
-                top += cellHeight
+        self._updateBands()
+        columns = max(columnCount, 1)
+        bandHeight = self._bandRows * cellHeight
+        bandCount = -(-glyphCount // (columns * self._bandRows))
+        firstBand = max(visibleRect.top() // bandHeight, 0)
+        lastBand = min(visibleRect.bottom() // bandHeight, bandCount - 1)
+        for band in range(firstBand, lastBand + 1):
+            painter.drawPixmap(0, band * bandHeight, self._bandPixmap(band))
+        # bands are opaque, fill what's past them
+        bandsBottom = bandCount * bandHeight
+        if visibleRect.bottom() >= bandsBottom:
+            painter.fillRect(
+                visibleRect.intersected(
+                    QRect(0, bandsBottom, self.width(), visibleRect.bottom() + 1)
+                ),
+                backgroundColor,
+            )
+        self._pruneBands()
+        self._queueCells()
 
         # drop insertion position
         dropIndex = self._currentDropIndex
@@ -364,6 +589,163 @@ class GlyphCellWidget(QWidget):
             painter.drawPath(path)
             painter.fillPath(path, insertionPositionColor)
 
+    # row bands: the cells are composited into pixmaps of a few rows each,
+    # and only cells that changed are drawn again
+
+    def _invalidateBands(self):
+        self._bands = {}
+        self._staleCells = {}
+        self._queueKey = None
+
+    def _invalidateCells(self, indexes):
+        self._queueKey = None
+        bands = self._bands
+        if not bands:
+            return
+        staleCells = self._staleCells
+        bandSize = max(self._columnCount, 1) * self._bandRows
+        for index in indexes:
+            band = index // bandSize
+            if band in bands:
+                staleCells.setdefault(band, set()).add(index)
+
+    def _selectionColor(self):
+        palette = self.palette()
+        active = palette.currentColorGroup() != QPalette.Inactive
+        opacityMultiplier = platformSpecific.colorOpacityMultiplier()
+        selectionColor = palette.color(QPalette.Highlight)
+        # TODO: alpha values somewhat arbitrary (here and in
+        # glyphLineView)
+        selectionColor.setAlphaF(0.2 * opacityMultiplier if active else 0.7)
+        return selectionColor
+
+    def _updateBands(self):
+        selectionColor = self._selectionColor()
+        key = (
+            self.width(),
+            self._cellWidth + 2 * self._cellWidthExtra,
+            self._cellHeight,
+            self._columnCount,
+            self.devicePixelRatio(),
+            selectionColor.rgba(),
+            self._renderer.representationKey(),
+        )
+        if key != self._bandKey:
+            self._bandKey = key
+            self._bandRows = max(rowBandHeight // self._cellHeight, 1)
+            self._invalidateBands()
+            self._bandSelection = self._selection.copy()
+        elif self._selection != self._bandSelection:
+            changed = self._selection ^ self._bandSelection
+            # only the cells of cached bands are drawn again
+            bandSize = max(self._columnCount, 1) * self._bandRows
+            for band in list(self._bands):
+                start = band * bandSize
+                self._invalidateCells(
+                    changed & IndexSet(range(start, start + bandSize))
+                )
+            self._bandSelection = self._selection.copy()
+
+    def _bandPixmap(self, band):
+        pixmap = self._bands.get(band)
+        if pixmap is None:
+            pixelRatio = self.devicePixelRatio()
+            height = self._bandRows * self._cellHeight
+            pixmap = QPixmap(self.width() * pixelRatio, height * pixelRatio)
+            pixmap.setDevicePixelRatio(pixelRatio)
+            pixmap.fill(backgroundColor)
+            bandSize = max(self._columnCount, 1) * self._bandRows
+            start = band * bandSize
+            indexes = range(start, min(start + bandSize, len(self._glyphs)))
+            self._drawCells(pixmap, band, indexes, False)
+            self._bands[band] = pixmap
+            self._staleCells.pop(band, None)
+        else:
+            indexes = self._staleCells.pop(band, None)
+            if indexes:
+                self._drawCells(pixmap, band, sorted(indexes), True)
+        return pixmap
+
+    def _drawCells(self, pixmap, band, indexes, clear):
+        renderer = self._renderer
+        cache = renderer.cache()
+        levelKey = self._levelKey
+        scaling = self._scalingCells
+        glyphs = self._glyphs
+        glyphCount = len(glyphs)
+        selection = self._selection
+        selectionColor = self._selectionColor()
+        columns = max(self._columnCount, 1)
+        cellWidth = self._cellWidth + 2 * self._cellWidthExtra
+        cellHeight = self._cellHeight
+        firstRow = band * self._bandRows
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        for index in indexes:
+            row, column = divmod(index, columns)
+            t = (row - firstRow) * cellHeight
+            left = column * cellWidth
+            if clear:
+                painter.fillRect(left, t, cellWidth, cellHeight, backgroundColor)
+            if index >= glyphCount:
+                continue
+            glyph = glyphs[index]
+
+            if glyph is None:
+                painter.fillRect(
+                    QRectF(left + 1, t + 1, cellWidth - 2, cellHeight - 2),
+                    pendingCellColor,
+                )
+                continue
+            selected = index in selection
+            if selected:
+                painter.fillRect(QRectF(left, t, cellWidth, cellHeight), selectionColor)
+
+            cellPixmap = renderer.pixmap(glyph)
+            scaled = scaling
+            if cellPixmap is None and levelKey is not None:
+                # until the cell is drawn at this size
+                cellPixmap = cache.get(glyph, levelKey)
+                scaled = True
+            if cellPixmap is not None:
+                if scaled:
+                    painter.drawPixmap(
+                        QRect(left, t, cellWidth, cellHeight), cellPixmap
+                    )
+                else:
+                    painter.drawPixmap(left, t, cellPixmap)
+            else:
+                # until the cell is drawn in the background
+                painter.fillRect(
+                    QRectF(left + 1, t + 1, cellWidth - 2, cellHeight - 2),
+                    pendingCellColor,
+                )
+
+            # XXX: this hacks around the repr internals
+            if selected and cellHeight >= GlyphCellMinHeightForHeader:
+                painter.fillRect(
+                    QRectF(
+                        left,
+                        t + cellHeight - GlyphCellHeaderHeight,
+                        cellWidth,
+                        GlyphCellHeaderHeight,
+                    ),
+                    selectionColor,
+                )
+        painter.end()
+
+    def _pruneBands(self):
+        # keep a screenful of bands on either side of the view
+        visibleRect = self.visibleRegion().boundingRect()
+        bandHeight = self._bandRows * self._cellHeight
+        firstBand = visibleRect.top() // bandHeight
+        lastBand = visibleRect.bottom() // bandHeight
+        margin = lastBand - firstBand + 1
+        for band in list(self._bands):
+            if not firstBand - margin <= band <= lastBand + margin:
+                del self._bands[band]
+                self._staleCells.pop(band, None)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._calculateCellWidthExtra()
@@ -373,17 +755,13 @@ class GlyphCellWidget(QWidget):
     # ---------
 
     def _linearSelection(self, index):
-        if not self._selection:
-            newSelection = {index}
+        newSelection = self._selection.copy()
+        if not newSelection:
+            newSelection.add(index)
+        elif index < self._lastSelectedCell:
+            newSelection.addRange(index, self._lastSelectedCell + 1)
         else:
-            if index < self._lastSelectedCell:
-                newSelection = self._selection | set(
-                    range(index, self._lastSelectedCell + 1)
-                )
-            else:
-                newSelection = self._selection | set(
-                    range(self._lastSelectedCell, index + 1)
-                )
+            newSelection.addRange(self._lastSelectedCell, index + 1)
         return newSelection
 
     def scrollToCell(self, index):
@@ -406,7 +784,7 @@ class GlyphCellWidget(QWidget):
 
     def mousePressEvent(self, event):
         if event.button() in (Qt.LeftButton, Qt.RightButton):
-            self._oldSelection = set(self._selection)
+            self._oldSelection = self._selection.copy()
             index = self._findIndexForEvent(event)
             modifiers = event.modifiers()
 
@@ -418,13 +796,13 @@ class GlyphCellWidget(QWidget):
 
             if modifiers & Qt.ControlModifier:
                 if index in self._selection:
-                    self._selection.remove(index)
+                    self._selection.discard(index)
                 else:
                     self._selection.add(index)
             elif modifiers & Qt.ShiftModifier:
                 self._selection = self._linearSelection(index)
             elif index not in self._selection:
-                self._selection = {index}
+                self._selection = IndexSet((index,))
             else:
                 self._maybeDragPosition = event.localPos()
             self._lastSelectedCell = index
@@ -447,13 +825,13 @@ class GlyphCellWidget(QWidget):
             modifiers = event.modifiers()
             if modifiers & Qt.ControlModifier:
                 if index in self._selection and index in self._oldSelection:
-                    self._selection.remove(index)
+                    self._selection.discard(index)
                 elif index not in self._selection and index not in self._oldSelection:
                     self._selection.add(index)
             elif modifiers & Qt.ShiftModifier:
                 self._selection = self._linearSelection(index)
             else:
-                self._selection = {index}
+                self._selection = IndexSet((index,))
             self._lastSelectedCell = index
             self.selectionChanged.emit()
             self.update()
@@ -466,9 +844,9 @@ class GlyphCellWidget(QWidget):
             # XXX: we should use modifiers registered on click
             if not event.modifiers() & Qt.ShiftModifier:
                 if self._lastSelectedCell is not None:
-                    self._selection = {self._lastSelectedCell}
+                    self._selection = IndexSet((self._lastSelectedCell,))
                 else:
-                    self._selection = set()
+                    self._selection = IndexSet()
                 self.update()
             self._oldSelection = None
         else:
@@ -477,7 +855,8 @@ class GlyphCellWidget(QWidget):
     def mouseDoubleClickEvent(self, event):
         if event.button() in (Qt.LeftButton, Qt.RightButton):
             index = self._findIndexForEvent(event)
-            if index is not None:
+            if index is not None and self._glyphs[index] is not None:
+                self._promoteGlyphs((index,))
                 self.glyphActivated.emit(self._glyphs[index])
         else:
             super().mouseDoubleClickEvent(event)
@@ -507,8 +886,7 @@ class GlyphCellWidget(QWidget):
         """
         Selects all glyphs displayed by this widget.
         """
-        newSelection = set(range(len(self._glyphs)))
-        self.setSelection(newSelection)
+        self.setSelection(range(len(self._glyphs)))
 
     def keyPressEvent(self, event):
         key = event.key()
@@ -516,9 +894,9 @@ class GlyphCellWidget(QWidget):
         if key in (Qt.Key_Up, Qt.Key_Down, Qt.Key_Left, Qt.Key_Right):
             self._arrowKeyPressEvent(event)
         elif key == Qt.Key_Return:
-            index = self._lastSelectedCell
-            if index is not None:
-                self.glyphActivated.emit(self._glyphs[index])
+            glyph = self.lastSelectedGlyph()
+            if glyph is not None:
+                self.glyphActivated.emit(glyph)
         elif modifiers in (Qt.NoModifier, Qt.ShiftModifier):
             self._glyphNameInputEvent(event)
         else:
@@ -543,9 +921,9 @@ class GlyphCellWidget(QWidget):
             if newSel < 0 or newSel >= len(self._glyphs):
                 return
             if modifiers & Qt.ShiftModifier:
-                self._selection |= self._linearSelection(newSel)
+                self._selection = self._linearSelection(newSel)
             else:
-                self._selection = {newSel}
+                self._selection = IndexSet((newSel,))
             self._lastSelectedCell = newSel
             self.scrollToCell(newSel)
             self.selectionChanged.emit()
@@ -568,56 +946,26 @@ class GlyphCellWidget(QWidget):
         self._lastKeyInputTime = rightNow
         self._inputString = self._inputString + inputText
 
-        match = None
-        matchIndex = None
-        lastResort = None
-        lastResortIndex = None
-        for index, glyph in enumerate(self._glyphs):
-            item = glyph.name
-            if item is None:
-                continue
-            # if the item starts with the input string, it is considered
-            # a match
-            if item.startswith(self._inputString):
-                if match is None:
-                    match = item
-                    matchIndex = index
-                    continue
-                # only if the item is less than the previous match is it
-                # a more relevant match
-                # example:
-                # given this order: sys, signal
-                # and this input string: s
-                # sys will be the first match, but signal is the more
-                # accurate match
-                if item < match:
-                    match = item
-                    matchIndex = index
-                    continue
-            # if the item is greater than the input string,it can be used
-            # as a last resort
-            # example:
-            # given this order: vanilla, zipimport
-            # and this input string: x
-            # zipimport will be used as the last resort
-            if item > self._inputString:
-                if lastResort is None:
-                    lastResort = item
-                    lastResortIndex = index
-                    continue
-                # if existing the last resort is greater than the item
-                # the item is a closer match to the input string
-                if lastResort > item:
-                    lastResort = item
-                    lastResortIndex = index
-                    continue
-
-        if matchIndex is not None:
-            newSelection = matchIndex
-        elif lastResortIndex is not None:
-            newSelection = lastResortIndex
-        else:
-            return
+        inputString = self._inputString
+        nameIndex = self._nameIndex
+        if nameIndex is None:
+            nameIndex = self._nameIndex = GlyphNameIndex(self._glyphs)
+        # the glyph with the first name in sorted order that starts with the
+        # input string, e.g. signal rather than sys for "s"
+        newSelection = nameIndex.find(inputString)
+        if newSelection is None or not self._glyphs[newSelection].name.startswith(
+            inputString
+        ):
+            # a character no glyph name starts with, e.g. "é", selects the
+            # glyph mapped to it, or else the first name after the input
+            # string is used as a last resort, e.g. zipimport for "x" given
+            # vanilla and zipimport
+            if len(inputString) == 1:
+                index = nameIndex.indexForCodepoint(ord(inputString))
+                if index is not None:
+                    newSelection = index
+            if newSelection is None:
+                return
         self.setSelection({newSelection})
 
     def _isUnicodeChar(self, char):
@@ -667,19 +1015,23 @@ class GlyphCellWidget(QWidget):
     def dropEvent(self, event):
         insert = self._currentDropIndex
         newGlyphs = event.mimeData().glyphs()
-        # put all glyphs to be moved to None (deleting them would
-        # invalidate our insert indexes)
+        # mark all glyphs to be moved (deleting them would invalidate our
+        # insert indexes)
+        moved = object()
         if event.source() == self:
             selection = self._selection
             if selection:
                 for index in selection:
-                    self._glyphs[index] = None
+                    self._glyphs[index] = moved
         # insert newGlyphs into the list
         lst = self._glyphs[:insert] + newGlyphs + self._glyphs[insert:]
         self._glyphs = lst
-        # now, elide None
+        # now, elide moved glyphs
         self._currentDropIndex = None
-        self._glyphs = [glyph for glyph in self._glyphs if glyph is not None]
+        self._glyphs = [glyph for glyph in self._glyphs if glyph is not moved]
+        self._glyphIndexes = None
+        self._nameIndex = None
+        self._invalidateBands()
         self.setSelection(set())
         self.glyphsDropped.emit()
         self.update()
@@ -723,57 +1075,51 @@ class GlyphCellView(QScrollArea):
         self.glyphActivated = self._glyphCellWidget.glyphActivated
         self.glyphsDropped = self._glyphCellWidget.glyphsDropped
         self.selectionChanged = self._glyphCellWidget.selectionChanged
+        self._fonts = set()
 
     # -------------
     # Notifications
     # -------------
 
-    def _subscribeToGlyphs(self, glyphs):
-        handledGlyphs = set()
-        handledFonts = set()
+    def _fontsForGlyphs(self, glyphs):
+        fonts = set()
         for glyph in glyphs:
-            if glyph in handledGlyphs:
+            if glyph is None:
                 continue
-            handledGlyphs.add(glyph)
-            glyph.addObserver(self, "_glyphChanged", "Glyph.Changed")
             font = glyph.font
-            if font is None:
-                continue
-            if font in handledFonts:
-                continue
-            handledFonts.add(font)
-            font.info.addObserver(self, "_fontChanged", "Info.Changed")
-
-    def _unsubscribeFromGlyphs(self):
-        handledGlyphs = set()
-        handledFonts = set()
-        if self._glyphCellWidget is not None:
-            glyphs = self._glyphCellWidget.glyphs()
-            for glyph in glyphs:
-                if glyph in handledGlyphs:
-                    continue
-                handledGlyphs.add(glyph)
-                glyph.removeObserver(self, "Glyph.Changed")
-                font = glyph.font
-                if font is None:
-                    continue
-                if font in handledFonts:
-                    continue
-                handledFonts.add(font)
-                font.info.removeObserver(self, "Info.Changed")
+            if font is not None:
+                fonts.add(font)
+        return fonts
+
+    def _subscribeToFonts(self, fonts):
+        # one observation per font for the changes of any of its glyphs,
+        # rather than one per glyph
+        for font in fonts - self._fonts:
+            font.dispatcher.addObserver(self, "_glyphChanged", "Glyph.Changed")
+            font.info.addObserver(self, "_fontInfoChanged", "Info.ValueChanged")
+        self._fonts |= fonts
+
+    def _unsubscribeFromFonts(self, fonts):
+        for font in fonts & self._fonts:
+            font.dispatcher.removeObserver(self, "Glyph.Changed")
+            font.info.removeObserver(self, "Info.ValueChanged")
+            # the cells of other fonts are of no more use
+            self._glyphCellWidget.renderer().removeFont(font)
+        self._fonts -= fonts
 
     def _glyphChanged(self, notification):
-        self._glyphCellWidget.update()
+        self._glyphCellWidget.updateGlyph(notification.object)
 
-    def _fontChanged(self, notification):
+    def _fontInfoChanged(self, notification):
+        # most of the font info doesn't show in cells
+        if notification.data["attribute"] not in GlyphCellInfoAttributes:
+            return
         info = notification.object
         font = info.font
-        glyphs = self._glyphCellWidget.glyphs()
-        representationName = self._glyphCellWidget.cellRepresentationName()
-        for glyph in glyphs:
-            if glyph.font == font:
-                glyph.destroyRepresentation(representationName)
-        self._glyphCellWidget.update()
+        widget = self._glyphCellWidget
+        for glyph in set(widget.glyphs()):
+            if glyph is not None and glyph.font == font:
+                widget.updateGlyph(glyph)
 
     # --------------
     # Public methods
@@ -786,9 +1132,18 @@ class GlyphCellView(QScrollArea):
         return self._glyphCellWidget.glyphs()
 
     def setGlyphs(self, glyphs):
-        self._unsubscribeFromGlyphs()
+        fonts = self._fontsForGlyphs(glyphs)
+        self._unsubscribeFromFonts(self._fonts - fonts)
         self._glyphCellWidget.setGlyphs(glyphs)
-        self._subscribeToGlyphs(glyphs)
+        self._subscribeToFonts(fonts)
+
+    def appendGlyphs(self, glyphs):
+        self._glyphCellWidget.appendGlyphs(glyphs)
+        self._subscribeToFonts(self._fontsForGlyphs(glyphs))
+
+    def replaceGlyphs(self, glyphs):
+        self._subscribeToFonts(self._fontsForGlyphs(glyphs.values()))
+        self._glyphCellWidget.replaceGlyphs(glyphs)
 
     def glyphsForIndexes(self, indexes):
         return self._glyphCellWidget.glyphsForIndexes(indexes)
@@ -8,16 +8,28 @@ from defconQt.representationFactories.glyphViewFactory import (
     QPixmapFactory,
 )
 from defconQt.representationFactories.qPainterPathFactory import QPainterPathFactory
+from defconQt.tools.representationStats import instrumentedFactory
+
+# composite glyphs build their path from that of their base glyphs, which
+# must therefore be gone by the time their composites hear of a change
+_outlineNotifications = (
+    "Glyph.Changed",
+    "Glyph.ContoursChanged",
+    "Glyph.ComponentsChanged",
+    "Glyph.ComponentBaseGlyphDataChanged",
+)
 
-# TODO: fine-tune the destructive notifications
 _glyphFactories = {
-    "defconQt.QPainterPath": (QPainterPathFactory, None),
+    "defconQt.QPainterPath": (QPainterPathFactory, _outlineNotifications),
     "defconQt.NoComponentsQPainterPath": (NoComponentsQPainterPathFactory, None),
-    "defconQt.OnlyComponentsQPainterPath": (OnlyComponentsQPainterPathFactory, None),
+    "defconQt.OnlyComponentsQPainterPath": (
+        OnlyComponentsQPainterPathFactory,
+        _outlineNotifications,
+    ),
     "defconQt.GlyphCell": (GlyphCellFactory, None),
     "defconQt.OutlineInformation": (
         OutlineInformationFactory,
-        ("Glyph.Changed", "Glyph.SelectionChanged"),
+        ("Glyph.ContoursChanged", "Glyph.ComponentsChanged"),
     ),
 }
 _imageFactories = {
@@ -31,9 +43,15 @@ _imageFactories = {
 def registerAllFactories():
     for name, (factory, destructiveNotifications) in _glyphFactories.items():
         registerRepresentationFactory(
-            Glyph, name, factory, destructiveNotifications=destructiveNotifications
+            Glyph,
+            name,
+            instrumentedFactory(name, factory),
+            destructiveNotifications=destructiveNotifications,
         )
     for name, (factory, destructiveNotifications) in _imageFactories.items():
         registerRepresentationFactory(
-            Image, name, factory, destructiveNotifications=destructiveNotifications
+            Image,
+            name,
+            instrumentedFactory(name, factory),
+            destructiveNotifications=destructiveNotifications,
         )
@@ -1,5 +1,5 @@
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QFontMetrics, QPainter, QPainterPath, QPixmap
+from PyQt5.QtGui import QColor, QFontMetrics, QImage, QPainter, QPainterPath, QPixmap
 
 from defconQt.tools import platformSpecific
 from defconQt.tools.drawing import colorToQColor
@@ -7,6 +7,10 @@ from defconQt.tools.drawing import colorToQColor
 GlyphCellHeaderHeight = platformSpecific.glyphCellHeaderHeight()
 GlyphCellMinHeightForHeader = 40
 GlyphCellMinHeightForMetrics = 100
+# font info attributes cells are drawn from
+GlyphCellInfoAttributes = frozenset(
+    ("unitsPerEm", "ascender", "descender", "capHeight", "xHeight")
+)
 
 cellMetricsFillColor = cellMetricsLineColor = QColor(224, 226, 220)
 cellMetricsTextColor = QColor(72, 72, 72)
@@ -16,6 +20,27 @@ headerFont = platformSpecific.otherUIFont()
 
 # TODO: fine-tune dirty appearance
 
+# (name, width, font key): elided name
+_elidedNames = {}
+_maxElidedNames = 16384
+
+
+def elidedText(text, width, font):
+    """
+    Returns *text* elided to fit in *width* when drawn with *font*.
+
+    Results are cached, so that cell headers are elided once per name and
+    cell width.
+    """
+    key = (text, width, font.key())
+    elided = _elidedNames.get(key)
+    if elided is None:
+        elided = QFontMetrics(font).elidedText(text, Qt.ElideRight, width)
+        if len(_elidedNames) >= _maxElidedNames:
+            _elidedNames.clear()
+        _elidedNames[key] = elided
+    return elided
+
 
 def GlyphCellFactory(
     glyph,
@@ -26,7 +51,12 @@ def GlyphCellFactory(
     drawHeader=None,
     drawMetrics=None,
     pixelRatio=1.0,
+    image=False,
 ):
+    """
+    Draws the cell of *glyph* into a QPixmap, or into a QImage if *image* is
+    True. Unlike pixmaps, images can be drawn outside of the GUI thread.
+    """
     if drawHeader is None:
         drawHeader = height >= GlyphCellMinHeightForHeader
     if drawMetrics is None:
@@ -42,6 +72,8 @@ def GlyphCellFactory(
         drawMetrics=drawMetrics,
         pixelRatio=pixelRatio,
     )
+    if image:
+        return obj.getImage()
     return obj.getPixmap()
 
 
@@ -110,11 +142,32 @@ class GlyphCellFactoryDrawingController:
         self.xOffset = (width - (glyph.width * self.scale)) / 2
         self.yOffset = abs(descender * self.scale) + 0.4 * self.buffer
 
+    def _deviceSize(self):
+        # Qt wants whole pixels, the ratio may be fractional
+        return (
+            int(round(self.width * self.pixelRatio)),
+            int(round(self.height * self.pixelRatio)),
+        )
+
     def getPixmap(self):
-        pixmap = QPixmap(self.width * self.pixelRatio, self.height * self.pixelRatio)
+        pixmap = QPixmap(*self._deviceSize())
         pixmap.setDevicePixelRatio(self.pixelRatio)
         pixmap.fill(Qt.transparent)
         painter = QPainter(pixmap)
+        self.drawCell(painter)
+        painter.end()
+        return pixmap
+
+    def getImage(self):
+        image = QImage(*self._deviceSize(), QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(self.pixelRatio)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        self.drawCell(painter)
+        painter.end()
+        return image
+
+    def drawCell(self, painter):
         painter.setRenderHint(QPainter.Antialiasing)
         painter.translate(0, self.height)
         painter.scale(1, -1)
@@ -164,7 +217,6 @@ class GlyphCellFactoryDrawingController:
             self.drawCellHeaderBackground(painter, headerRect)
             self.drawCellHeaderText(painter, headerRect)
             painter.restore()
-        return pixmap
 
     def drawCellBackground(self, painter, rect):
         if self.shouldDrawMarkColor:
@@ -270,12 +322,11 @@ class GlyphCellFactoryDrawingController:
 
     def drawCellHeaderText(self, painter, rect):
         _, _, width, height = rect
-        metrics = QFontMetrics(headerFont)
         minOffset = painter.pen().width()
 
         painter.setFont(headerFont)
         painter.setPen(cellMetricsTextColor)
-        name = metrics.elidedText(self.glyph.name, Qt.ElideRight, width - 2)
+        name = elidedText(self.glyph.name, width - 2, headerFont)
         painter.drawText(
             1,
             0,
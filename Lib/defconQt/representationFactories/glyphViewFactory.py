@@ -13,12 +13,12 @@ import math
 
 from fontTools.pens.basePen import BasePen
 from fontTools.pens.qtPen import QtPen
-from fontTools.pens.transformPen import TransformPen
 from fontTools.ufoLib.pointPen import AbstractPointPen
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QGraphicsColorizeEffect
 
+from defconQt.representationFactories.qPainterPathFactory import addComponentPath
 from defconQt.tools.drawing import applyEffectToPixmap, colorToQColor
 
 # -------------
@@ -66,13 +66,7 @@ class OnlyComponentsQtPen(BasePen):
         pass
 
     def addComponent(self, glyphName, transformation):
-        try:
-            glyph = self.glyphSet[glyphName]
-        except KeyError:
-            return
-        else:
-            tPen = TransformPen(self.pen, transformation)
-            glyph.draw(tPen)
+        addComponentPath(self.path, self.glyphSet, glyphName, transformation)
 
 
 # ----------
@@ -87,10 +81,20 @@ def OutlineInformationFactory(glyph):
 
 
 class OutlineInformationPen(AbstractPointPen):
+    """
+    Collects the points, handles and components of a glyph. Points are
+    dicts of the arguments of :meth:`addPoint`, with the *index* of the point
+    in the order it was drawn.
+
+    Point selection isn’t stored, so that the data only changes with the
+    outline.
+    """
+
     def __init__(self):
         self._rawPointData = []
         self._rawComponentData = []
         self._bezierHandleData = []
+        self._pointCount = 0
 
     def getData(self):
         data = dict(
@@ -163,8 +167,17 @@ class OutlineInformationPen(AbstractPointPen):
         pass
 
     def addPoint(self, pt, segmentType=None, smooth=False, name=None, **kwargs):
-        d = dict(point=pt, segmentType=segmentType, smooth=smooth, name=name, **kwargs)
+        kwargs.pop("selected", None)
+        d = dict(
+            point=pt,
+            segmentType=segmentType,
+            smooth=smooth,
+            name=name,
+            index=self._pointCount,
+            **kwargs,
+        )
         self._rawPointData[-1].append(d)
+        self._pointCount += 1
 
     def addComponent(self, baseGlyphName, transformation):
         self._rawComponentData.append((baseGlyphName, transformation))
@@ -18,10 +18,33 @@ You can then draw such paths on screen with the QPainter_ method
 
 from fontTools.pens.qtPen import QtPen
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTransform
 
 
 def QPainterPathFactory(glyph):
-    pen = QtPen(glyph.layer)
+    pen = ComponentsQtPen(glyph.layer)
     glyph.draw(pen)
     pen.path.setFillRule(Qt.WindingFill)
     return pen.path
+
+
+def addComponentPath(path, glyphSet, glyphName, transformation):
+    """
+    Adds to *path* the outline of *glyphName* in *glyphSet*, transformed by
+    *transformation*.
+
+    The outline is mapped from the QPainterPath representation of the base
+    glyph, so that a glyph used by many composite glyphs is walked only
+    once, and nested components come from their own cached paths.
+    """
+    try:
+        glyph = glyphSet[glyphName]
+    except KeyError:
+        return
+    basePath = glyph.getRepresentation("defconQt.QPainterPath")
+    path.addPath(QTransform(*transformation).map(basePath))
+
+
+class ComponentsQtPen(QtPen):
+    def addComponent(self, glyphName, transformation):
+        addComponentPath(self.path, self.glyphSet, glyphName, transformation)
@@ -0,0 +1,172 @@
+"""
+The *glyphCellCache* submodule
+------------------------------
+
+The *glyphCellCache* submodule provides a cache of glyph cell pixmaps that
+holds to a memory budget.
+"""
+
+from collections import OrderedDict
+
+# in bytes
+defaultMaxSize = 256 * 2**20
+
+_defaultCache = None
+
+
+def defaultCache():
+    """
+    Returns the :class:`GlyphCellCache` glyph cell views share by default.
+    """
+    global _defaultCache
+    if _defaultCache is None:
+        _defaultCache = GlyphCellCache()
+    return _defaultCache
+
+
+def representationKey(name, arguments):
+    """
+    Returns the key of the cell representation *name* drawn with the
+    *arguments* dict, for use with :class:`GlyphCellCache`.
+    """
+    return (name, tuple(sorted(arguments.items())))
+
+
+def pixmapSize(pixmap):
+    """
+    Returns the number of bytes taken by *pixmap*.
+    """
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+class GlyphCellCache:
+    """
+    Holds glyph cell pixmaps, keyed by glyph and by the representation key
+    of the cell (its name and arguments, which include the cell size and
+    device pixel ratio).
+
+    When the pixmaps take up more than *maxSize* bytes, the least recently
+    used ones are evicted. Hits, misses and evictions are counted, see
+    :meth:`stats`.
+
+    Pixmaps of a glyph that changed are kept until replaced, but marked as
+    outdated.
+    """
+
+    def __init__(self, maxSize=defaultMaxSize):
+        self._pixmaps = OrderedDict()
+        # glyph: representation keys
+        self._glyphKeys = {}
+        self._outdatedKeys = set()
+        self._maxSize = maxSize
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+    def maxSize(self):
+        return self._maxSize
+
+    def setMaxSize(self, maxSize):
+        """
+        Sets the memory budget to *maxSize* bytes, evicting pixmaps if
+        needed.
+        """
+        self._maxSize = maxSize
+        self._evict()
+
+    def size(self):
+        """
+        Returns the number of bytes taken by the pixmaps.
+        """
+        return self._size
+
+    def stats(self):
+        """
+        Returns a dict with the number of *hits*, *misses* and *evictions*
+        since the cache was created or :meth:`resetStats` was called.
+        """
+        return dict(hits=self._hits, misses=self._misses, evictions=self._evictions)
+
+    def resetStats(self):
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, glyph, representationKey):
+        """
+        Returns the pixmap of *glyph* for *representationKey*, possibly
+        outdated, or None.
+        """
+        key = (glyph, representationKey)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._pixmaps.move_to_end(key)
+        return pixmap
+
+    def contains(self, glyph, representationKey):
+        """
+        Returns whether there’s an up-to-date pixmap of *glyph* for
+        *representationKey*. This doesn’t count as a hit or miss.
+        """
+        key = (glyph, representationKey)
+        return key in self._pixmaps and key not in self._outdatedKeys
+
+    def put(self, glyph, representationKey, pixmap):
+        key = (glyph, representationKey)
+        pixmaps = self._pixmaps
+        if key in pixmaps:
+            self._size -= pixmapSize(pixmaps[key])
+            self._outdatedKeys.discard(key)
+        pixmaps[key] = pixmap
+        pixmaps.move_to_end(key)
+        self._size += pixmapSize(pixmap)
+        self._glyphKeys.setdefault(glyph, set()).add(representationKey)
+        self._evict()
+
+    def invalidate(self, glyph):
+        """
+        Marks the pixmaps of *glyph* as outdated.
+        """
+        for representationKey in self._glyphKeys.get(glyph, ()):
+            self._outdatedKeys.add((glyph, representationKey))
+
+    def remove(self, glyph):
+        """
+        Drops the pixmaps of *glyph*.
+        """
+        for representationKey in self._glyphKeys.pop(glyph, ()):
+            key = (glyph, representationKey)
+            self._size -= pixmapSize(self._pixmaps.pop(key))
+            self._outdatedKeys.discard(key)
+
+    def removeFont(self, font):
+        """
+        Drops the pixmaps of the glyphs of *font*.
+        """
+        for glyph in [glyph for glyph in self._glyphKeys if glyph.font is font]:
+            self.remove(glyph)
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._glyphKeys.clear()
+        self._outdatedKeys.clear()
+        self._size = 0
+
+    def _evict(self):
+        pixmaps = self._pixmaps
+        glyphKeys = self._glyphKeys
+        while self._size > self._maxSize and pixmaps:
+            key, pixmap = pixmaps.popitem(last=False)
+            self._size -= pixmapSize(pixmap)
+            self._outdatedKeys.discard(key)
+            glyph, representationKey = key
+            representationKeys = glyphKeys[glyph]
+            representationKeys.discard(representationKey)
+            if not representationKeys:
+                del glyphKeys[glyph]
+            self._evictions += 1
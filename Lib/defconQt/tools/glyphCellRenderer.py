@@ -0,0 +1,273 @@
+"""
+The *glyphCellRenderer* submodule
+---------------------------------
+
+The *glyphCellRenderer* submodule provides an object that draws glyph cells
+in worker threads, for :class:`defconQt.controls.glyphCellView.GlyphCellView`.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QPixmap
+
+from defconQt.representationFactories.glyphCellFactory import GlyphCellInfoAttributes
+from defconQt.tools.glyphCellCache import defaultCache, pixmapSize, representationKey
+
+# jobs handed to each worker ahead of time. Queued glyphs that haven't been
+# handed out yet can still be reordered or dropped.
+_jobsPerWorker = 2
+
+
+class _CellInfo:
+    """
+    The font info attributes cells are drawn from, read on the GUI thread.
+    """
+
+    __slots__ = tuple(GlyphCellInfoAttributes)
+
+    def __init__(self, info):
+        for attr in self.__slots__:
+            setattr(self, attr, getattr(info, attr))
+
+
+class _CellFont:
+    """
+    Stands in for the font of cell glyphs.
+    """
+
+    __slots__ = ("info",)
+
+    def __init__(self, info):
+        self.info = info
+
+
+class _CellGlyph:
+    """
+    The glyph attributes cells are drawn from and the representations made
+    from it, all read on the GUI thread, so that workers never touch defcon
+    objects (which may load data lazily).
+    """
+
+    __slots__ = (
+        "name",
+        "unicode",
+        "width",
+        "markColor",
+        "dirty",
+        "template",
+        "font",
+        "_representations",
+    )
+
+    def __init__(self, glyph, font, representations):
+        self.name = glyph.name
+        self.unicode = glyph.unicode
+        self.width = glyph.width
+        self.markColor = glyph.markColor
+        self.dirty = glyph.dirty
+        self.template = getattr(glyph, "template", False)
+        self.font = font
+        self._representations = representations
+
+    def getRepresentation(self, name, **kwargs):
+        return self._representations[name]
+
+
+def _renderCell(factory, glyph, arguments):
+    return factory(glyph, image=True, **arguments)
+
+
+class GlyphCellRenderer(QObject):
+    """
+    Draws glyph cells into QImages in a pool of worker threads, and keeps
+    the resulting pixmaps in a
+    :class:`defconQt.tools.glyphCellCache.GlyphCellCache`, by default the
+    one shared by all renderers.
+
+    The cell representation factory is called with *image=True* outside of
+    the GUI thread. The representations listed in
+    *prefetchedRepresentationNames* (the glyph outline) are made on the GUI
+    thread before, along with the glyph attributes and font info cells are
+    drawn from, since defcon objects may only be used there; the factory
+    is handed a stand-in holding those. Cells that can’t be drawn that way
+    are drawn on the GUI thread instead.
+
+    Glyphs to draw are given to :meth:`setQueue`, most urgent first, and
+    no more than fit in the cache. The *cellRendered* signal yields glyphs
+    as their cell pixmap becomes available.
+    """
+
+    cellRendered = pyqtSignal(object)
+    _jobDone = pyqtSignal(object, object)
+
+    prefetchedRepresentationNames = ("defconQt.QPainterPath",)
+
+    def __init__(self, parent=None, maxWorkers=None, cache=None):
+        super().__init__(parent)
+        if maxWorkers is None:
+            maxWorkers = min(4, os.cpu_count() or 1)
+        if cache is None:
+            cache = defaultCache()
+        self._executor = ThreadPoolExecutor(max_workers=maxWorkers)
+        self._maxJobs = _jobsPerWorker * maxWorkers
+        self._cache = cache
+        self._representationName = None
+        self._representationArguments = {}
+        self._representationKey = None
+        # size in bytes of the last cell drawn
+        self._cellSize = 0
+        # reversed, so that the most urgent glyph is popped first
+        self._queue = []
+        self._jobs = {}
+        self._jobDone.connect(self._finishJob)
+
+    def cache(self):
+        return self._cache
+
+    def setRepresentation(self, name, arguments):
+        """
+        Sets the *name* and the *arguments* dict of the cell representation.
+
+        Jobs of another representation are cancelled, its pixmaps are left
+        in the cache.
+        """
+        key = representationKey(name, arguments)
+        if key == self._representationKey:
+            return
+        self.cancel()
+        self._representationName = name
+        self._representationArguments = dict(arguments)
+        self._representationKey = key
+
+    def representationKey(self):
+        """
+        Returns the key of the cell representation in the cache.
+        """
+        return self._representationKey
+
+    def cancel(self):
+        """
+        Cancels all jobs.
+        """
+        for future in self._jobs.values():
+            future.cancel()
+        self._jobs = {}
+        self._queue = []
+
+    def pixmap(self, glyph):
+        """
+        Returns the cell pixmap of *glyph*, or None if it isn’t in the cache.
+
+        The pixmap may be outdated if *glyph* changed since, until it’s
+        drawn again.
+        """
+        return self._cache.get(glyph, self._representationKey)
+
+    def invalidate(self, glyph):
+        """
+        Marks the cell pixmaps of *glyph* as outdated, to be drawn again when
+        next queued.
+        """
+        self._cache.invalidate(glyph)
+        future = self._jobs.pop(glyph, None)
+        if future is not None:
+            # a job that already started is left to finish, and ignored
+            future.cancel()
+
+    def renderCell(self, glyph):
+        """
+        Draws the cell of *glyph* on the GUI thread, and returns its pixmap.
+        """
+        factory = glyph.representationFactories[self._representationName]["factory"]
+        pixmap = factory(glyph, **self._representationArguments)
+        self._storePixmap(glyph, pixmap)
+        return pixmap
+
+    def removeFont(self, font):
+        """
+        Cancels the jobs of the glyphs of *font* and drops their pixmaps
+        from the cache.
+        """
+        for glyph in [glyph for glyph in self._jobs if glyph.font is font]:
+            self._jobs.pop(glyph).cancel()
+        self._queue = [glyph for glyph in self._queue if glyph.font is not font]
+        self._cache.removeFont(font)
+
+    def setQueue(self, glyphs):
+        """
+        Sets the list of glyphs whose cells should be drawn, most urgent
+        first. Glyphs whose pixmap is up-to-date are skipped, as are those
+        past what the cache can hold.
+
+        Jobs for glyphs that aren’t in the list anymore are cancelled,
+        unless they already started.
+        """
+        if self._cellSize:
+            glyphs = glyphs[: max(self._cache.maxSize() // self._cellSize, 1)]
+        contains = self._cache.contains
+        key = self._representationKey
+        jobs = self._jobs
+        queue = []
+        for glyph in glyphs:
+            if glyph is None or glyph in jobs or contains(glyph, key):
+                continue
+            queue.append(glyph)
+        queue.reverse()
+        self._queue = queue
+        if jobs:
+            glyphs = set(glyphs)
+            for glyph in [glyph for glyph in jobs if glyph not in glyphs]:
+                if jobs[glyph].cancel():
+                    del jobs[glyph]
+        self._submitJobs()
+
+    def _submitJobs(self):
+        name = self._representationName
+        if name is None:
+            return
+        arguments = self._representationArguments
+        contains = self._cache.contains
+        key = self._representationKey
+        jobs = self._jobs
+        queue = self._queue
+        # glyphs of a font share its info snapshot
+        fonts = {}
+        while queue and len(jobs) < self._maxJobs:
+            glyph = queue.pop()
+            if glyph in jobs or contains(glyph, key):
+                continue
+            factory = glyph.representationFactories[name]["factory"]
+            representations = {
+                representationName: glyph.getRepresentation(representationName)
+                for representationName in self.prefetchedRepresentationNames
+            }
+            font = glyph.font
+            cellFont = fonts.get(id(font))
+            if cellFont is None and font is not None:
+                cellFont = fonts[id(font)] = _CellFont(_CellInfo(font.info))
+            cellGlyph = _CellGlyph(glyph, cellFont, representations)
+            future = self._executor.submit(_renderCell, factory, cellGlyph, arguments)
+            jobs[glyph] = future
+            future.add_done_callback(
+                lambda future, glyph=glyph: self._jobDone.emit(glyph, future)
+            )
+
+    def _finishJob(self, glyph, future):
+        if future.cancelled() or self._jobs.get(glyph) is not future:
+            return
+        del self._jobs[glyph]
+        try:
+            image = future.result()
+        except Exception:
+            # the factory may not draw images, or need more from the glyph
+            self.renderCell(glyph)
+        else:
+            self._storePixmap(glyph, QPixmap.fromImage(image))
+        self.cellRendered.emit(glyph)
+        self._submitJobs()
+
+    def _storePixmap(self, glyph, pixmap):
+        self._cellSize = pixmapSize(pixmap)
+        self._cache.put(glyph, self._representationKey, pixmap)
@@ -0,0 +1,117 @@
+"""
+The *glyphNameIndex* submodule
+------------------------------
+
+The *glyphNameIndex* submodule provides an index of a glyph list by glyph
+name and by codepoint, for type-to-select in
+:class:`defconQt.controls.glyphCellView.GlyphCellView`.
+"""
+
+from bisect import bisect_left, insort
+
+
+class GlyphNameIndex:
+    """
+    Indexes the positions of a list of glyphs by glyph name, in sorted order,
+    and by codepoint.
+
+    Entries are set and removed by position with :meth:`setGlyph` and
+    :meth:`removeGlyph`, so that the index can follow glyphs being added to
+    the list or renamed without being built again.
+    """
+
+    def __init__(self, glyphs=()):
+        # (name, index), sorted
+        self._names = []
+        # codepoint: indexes, sorted
+        self._codepoints = {}
+        # index: (name, unicodes)
+        self._entries = {}
+        self.setGlyphs(glyphs)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def setGlyphs(self, glyphs):
+        """
+        Indexes the list of *glyphs* anew. None entries are skipped.
+        """
+        names = []
+        codepoints = {}
+        entries = {}
+        for index, glyph in enumerate(glyphs):
+            if glyph is None:
+                continue
+            entry = entries[index] = (glyph.name, tuple(glyph.unicodes))
+            name, unicodes = entry
+            if name is not None:
+                names.append((name, index))
+            for uni in unicodes:
+                codepoints.setdefault(uni, []).append(index)
+        names.sort()
+        self._names = names
+        self._codepoints = codepoints
+        self._entries = entries
+
+    def setGlyph(self, index, glyph):
+        """
+        Indexes *glyph* at position *index*, in place of the glyph indexed
+        there before if any.
+
+        Does nothing if its name and unicodes didn’t change.
+        """
+        if glyph is None:
+            self.removeGlyph(index)
+            return
+        entry = (glyph.name, tuple(glyph.unicodes))
+        if self._entries.get(index) == entry:
+            return
+        self.removeGlyph(index)
+        self._entries[index] = entry
+        name, unicodes = entry
+        if name is not None:
+            insort(self._names, (name, index))
+        for uni in unicodes:
+            insort(self._codepoints.setdefault(uni, []), index)
+
+    def removeGlyph(self, index):
+        """
+        Removes the glyph at position *index* from the index.
+        """
+        entry = self._entries.pop(index, None)
+        if entry is None:
+            return
+        name, unicodes = entry
+        names = self._names
+        if name is not None:
+            del names[bisect_left(names, (name, index))]
+        codepoints = self._codepoints
+        for uni in unicodes:
+            indexes = codepoints[uni]
+            del indexes[bisect_left(indexes, index)]
+            if not indexes:
+                del codepoints[uni]
+
+    def find(self, text):
+        """
+        Returns the position of the glyph with the first name in sorted
+        order that starts with *text*, or else of the first one that sorts
+        after it, or None.
+
+        Of glyphs with the same name, the first in the list is returned.
+        """
+        names = self._names
+        position = bisect_left(names, (text,))
+        if position < len(names):
+            return names[position][1]
+        return None
+
+    def indexForCodepoint(self, codepoint):
+        """
+        Returns the position of the first glyph mapped to *codepoint*, or
+        None.
+        """
+        indexes = self._codepoints.get(codepoint)
+        if indexes:
+            return indexes[0]
+        return None
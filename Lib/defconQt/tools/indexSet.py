@@ -0,0 +1,197 @@
+"""
+The *indexSet* submodule
+------------------------
+
+The *indexSet* submodule provides a set of integers stored as sorted ranges,
+for selections of consecutive indexes such as that of
+:class:`defconQt.controls.glyphCellView.GlyphCellView`.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import chain
+
+
+class IndexSet:
+    """
+    A set of non-negative integers, stored as sorted, disjoint ranges.
+
+    Its size, membership tests and set operations depend on the number of
+    ranges rather than on the number of indexes, so that selecting all of a
+    large list of items remains cheap. Iterating it yields indexes in
+    ascending order.
+
+    *indexes* can be another IndexSet, a range or an iterable of integers.
+    """
+
+    __slots__ = ("_starts", "_stops", "_length")
+
+    def __init__(self, indexes=()):
+        if isinstance(indexes, IndexSet):
+            self._starts = list(indexes._starts)
+            self._stops = list(indexes._stops)
+            self._length = indexes._length
+            return
+        starts = []
+        stops = []
+        if isinstance(indexes, range) and indexes.step == 1:
+            if indexes:
+                starts.append(indexes.start)
+                stops.append(indexes.stop)
+        else:
+            for index in sorted(set(indexes)):
+                if stops and stops[-1] == index:
+                    stops[-1] += 1
+                else:
+                    starts.append(index)
+                    stops.append(index + 1)
+        self._starts = starts
+        self._stops = stops
+        self._length = sum(stops) - sum(starts)
+
+    @classmethod
+    def _fromRanges(cls, starts, stops):
+        indexSet = cls.__new__(cls)
+        indexSet._starts = starts
+        indexSet._stops = stops
+        indexSet._length = sum(stops) - sum(starts)
+        return indexSet
+
+    def __repr__(self):
+        ranges = ", ".join(f"{start}-{stop - 1}" for start, stop in self._ranges())
+        return f"<{self.__class__.__name__} [{ranges}]>"
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return bool(self._starts)
+
+    def __contains__(self, index):
+        position = bisect_right(self._starts, index) - 1
+        return position >= 0 and index < self._stops[position]
+
+    def __iter__(self):
+        return chain.from_iterable(self.ranges())
+
+    def __eq__(self, other):
+        if not isinstance(other, IndexSet):
+            return NotImplemented
+        return self._starts == other._starts and self._stops == other._stops
+
+    def __or__(self, other):
+        return self._combine(other, lambda a, b: a or b)
+
+    def __and__(self, other):
+        return self._combine(other, lambda a, b: a and b)
+
+    def __sub__(self, other):
+        return self._combine(other, lambda a, b: a and not b)
+
+    def __xor__(self, other):
+        return self._combine(other, lambda a, b: a != b)
+
+    def _ranges(self):
+        return zip(self._starts, self._stops)
+
+    def _combine(self, other, keep):
+        if not isinstance(other, IndexSet):
+            return NotImplemented
+        # between two consecutive bounds, indexes are all in or all out of
+        # either set
+        bounds = sorted(
+            set(chain(self._starts, self._stops, other._starts, other._stops))
+        )
+        starts = []
+        stops = []
+        for start, stop in zip(bounds, bounds[1:]):
+            if keep(start in self, start in other):
+                if stops and stops[-1] == start:
+                    stops[-1] = stop
+                else:
+                    starts.append(start)
+                    stops.append(stop)
+        return self._fromRanges(starts, stops)
+
+    def copy(self):
+        return self.__class__(self)
+
+    def ranges(self):
+        """
+        Returns the list of ranges of consecutive indexes in this set, in
+        ascending order.
+        """
+        return [range(start, stop) for start, stop in self._ranges()]
+
+    def first(self):
+        """
+        Returns the lowest index in this set, or None if it is empty.
+        """
+        if self._starts:
+            return self._starts[0]
+        return None
+
+    def last(self):
+        """
+        Returns the highest index in this set, or None if it is empty.
+        """
+        if self._stops:
+            return self._stops[-1] - 1
+        return None
+
+    def complement(self, stop):
+        """
+        Returns the indexes in range(*stop*) that are not in this set.
+        """
+        return self.__class__(range(stop)) - self
+
+    def add(self, index):
+        self.addRange(index, index + 1)
+
+    def discard(self, index):
+        self.discardRange(index, index + 1)
+
+    def addRange(self, start, stop):
+        """
+        Adds the indexes in range(*start*, *stop*) to this set.
+        """
+        if start >= stop:
+            return
+        starts = self._starts
+        stops = self._stops
+        # ranges that overlap or touch the new one are merged into it
+        first = bisect_left(stops, start)
+        last = bisect_right(starts, stop)
+        if first < last:
+            start = min(start, starts[first])
+            stop = max(stop, stops[last - 1])
+            self._length -= sum(stops[first:last]) - sum(starts[first:last])
+        starts[first:last] = [start]
+        stops[first:last] = [stop]
+        self._length += stop - start
+
+    def discardRange(self, start, stop):
+        """
+        Removes the indexes in range(*start*, *stop*) from this set, if
+        present.
+        """
+        if start >= stop:
+            return
+        starts = self._starts
+        stops = self._stops
+        first = bisect_right(stops, start)
+        last = bisect_left(starts, stop)
+        if first >= last:
+            return
+        self._length -= sum(stops[first:last]) - sum(starts[first:last])
+        # the ends of the first and last ranges that are kept
+        newStarts = []
+        newStops = []
+        if starts[first] < start:
+            newStarts.append(starts[first])
+            newStops.append(start)
+        if stops[last - 1] > stop:
+            newStarts.append(stop)
+            newStops.append(stops[last - 1])
+        self._length += sum(newStops) - sum(newStarts)
+        starts[first:last] = newStarts
+        stops[first:last] = newStops
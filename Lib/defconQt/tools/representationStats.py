@@ -0,0 +1,225 @@
+"""
+The *representationStats* submodule
+-----------------------------------
+
+The *representationStats* submodule records how the representations of
+defcon objects are made, reused and destroyed, for debugging drawing
+performance.
+
+Factories are wrapped with :func:`instrumentedFactory` when registered, and
+record nothing until :func:`setEnabled` is called.
+"""
+
+import functools
+import sys
+import time
+import weakref
+from bisect import bisect_right
+from threading import Lock
+
+from defcon.objects.base import BaseObject
+from PyQt5.QtGui import QImage, QPainterPath, QPixmap
+
+from defconQt.tools.glyphCellCache import pixmapSize
+
+# upper bounds of the factory time histogram buckets, in seconds. the last
+# bucket holds longer times
+histogramBounds = (1e-5, 1e-4, 1e-3, 1e-2, 1e-1)
+
+_enabled = False
+_lock = Lock()
+# name: _RepresentationStats
+_stats = {}
+# names of the instrumented factories
+_names = set()
+# objects whose representations were requested, to estimate the cache size
+_objects = weakref.WeakSet()
+# BaseObject methods replaced while enabled
+_baseMethods = {}
+
+
+class _RepresentationStats:
+    __slots__ = ("hits", "misses", "destructions", "time", "histogram")
+
+    def __init__(self):
+        self.hits = self.misses = self.destructions = 0
+        self.time = 0.0
+        self.histogram = [0] * (len(histogramBounds) + 1)
+
+
+def _statsFor(name):
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = _RepresentationStats()
+    return stats
+
+
+def instrumentedFactory(name, factory):
+    """
+    Returns a representation factory that calls *factory* and, while
+    recording is enabled, counts the call as a miss of *name* and records
+    how long it took.
+    """
+    _names.add(name)
+
+    @functools.wraps(factory)
+    def instrumented(obj, **kwargs):
+        if not _enabled:
+            return factory(obj, **kwargs)
+        start = time.perf_counter()
+        representation = factory(obj, **kwargs)
+        elapsed = time.perf_counter() - start
+        with _lock:
+            stats = _statsFor(name)
+            stats.misses += 1
+            stats.time += elapsed
+            stats.histogram[bisect_right(histogramBounds, elapsed)] += 1
+        return representation
+
+    return instrumented
+
+
+def _countedRepresentations(obj):
+    representations = obj._representations or {}
+    return {
+        name: len(subDict)
+        for name, subDict in representations.items()
+        if name in _names
+    }
+
+
+def _getRepresentation(self, name, **kwargs):
+    if name not in _names:
+        return _baseMethods["getRepresentation"](self, name, **kwargs)
+    with _lock:
+        stats = _statsFor(name)
+        misses = stats.misses
+    representation = _baseMethods["getRepresentation"](self, name, **kwargs)
+    # the factory wasn't called
+    if stats.misses == misses:
+        with _lock:
+            stats.hits += 1
+    _objects.add(self)
+    return representation
+
+
+def _destroyRepresentation(self, name, **kwargs):
+    if name not in _names:
+        _baseMethods["destroyRepresentation"](self, name, **kwargs)
+        return
+    before = _countedRepresentations(self).get(name, 0)
+    _baseMethods["destroyRepresentation"](self, name, **kwargs)
+    destroyed = before - _countedRepresentations(self).get(name, 0)
+    if destroyed:
+        with _lock:
+            _statsFor(name).destructions += destroyed
+
+
+def _destroyAllRepresentations(self, notification=None):
+    counts = _countedRepresentations(self)
+    _baseMethods["destroyAllRepresentations"](self, notification)
+    with _lock:
+        for name, count in counts.items():
+            _statsFor(name).destructions += count
+
+
+_hooks = dict(
+    getRepresentation=_getRepresentation,
+    destroyRepresentation=_destroyRepresentation,
+    destroyAllRepresentations=_destroyAllRepresentations,
+)
+
+
+def isEnabled():
+    return _enabled
+
+
+def setEnabled(value):
+    """
+    Starts or stops recording representation statistics.
+
+    While enabled, requests and destructions of the representations of
+    defcon objects are also counted, which slows them down a little.
+    """
+    global _enabled
+    value = bool(value)
+    if value == _enabled:
+        return
+    _enabled = value
+    if value:
+        for methodName, hook in _hooks.items():
+            _baseMethods[methodName] = getattr(BaseObject, methodName)
+            setattr(BaseObject, methodName, hook)
+    else:
+        for methodName, method in _baseMethods.items():
+            setattr(BaseObject, methodName, method)
+        _baseMethods.clear()
+
+
+def resetStats():
+    with _lock:
+        _stats.clear()
+    _objects.clear()
+
+
+def estimateSize(representation):
+    """
+    Returns an estimate of the number of bytes taken by *representation*.
+    """
+    if isinstance(representation, QPixmap):
+        return pixmapSize(representation)
+    if isinstance(representation, QImage):
+        return representation.sizeInBytes()
+    if isinstance(representation, QPainterPath):
+        # two coordinates and a type per element
+        return sys.getsizeof(representation) + 24 * representation.elementCount()
+    size = sys.getsizeof(representation)
+    if isinstance(representation, dict):
+        for key, value in representation.items():
+            size += estimateSize(key) + estimateSize(value)
+    elif isinstance(representation, (list, tuple, set, frozenset)):
+        for item in representation:
+            size += estimateSize(item)
+    return size
+
+
+def stats():
+    """
+    Returns a dict of representation name to a dict with:
+
+    - *hits*, *misses*: the number of requests served from the cache or
+      made by the factory
+    - *destructions*: the number of cached representations destroyed
+    - *time*: the total time spent in the factory, in seconds
+    - *histogram*: the number of factory calls that took less than each of
+      :data:`histogramBounds`, then longer
+    - *cached*: the number of representations in cache
+    - *memory*: an estimate of the bytes they take
+
+    since recording was enabled or :func:`resetStats` was called. Cached
+    representations are those of objects whose representations were
+    requested since then.
+    """
+    cached = {}
+    memory = {}
+    for obj in list(_objects):
+        for name, subDict in (obj._representations or {}).items():
+            if name not in _stats:
+                continue
+            cached[name] = cached.get(name, 0) + len(subDict)
+            memory[name] = memory.get(name, 0) + sum(
+                estimateSize(representation) for representation in subDict.values()
+            )
+    with _lock:
+        return {
+            name: dict(
+                hits=entry.hits,
+                misses=entry.misses,
+                destructions=entry.destructions,
+                time=entry.time,
+                histogram=list(entry.histogram),
+                cached=cached.get(name, 0),
+                memory=memory.get(name, 0),
+            )
+            for name, entry in _stats.items()
+        }
@@ -36,6 +36,19 @@ class ReloadMessageBox(MessageBox):
             )
         return dialog.exec_()
 
+    @classmethod
+    def getReloadChanges(cls, parent, documentName):
+        dialog = cls(parent)
+        dialog.setText(
+            dialog.tr(
+                "“{}” was modified by another application. " "Do you want to reload it?"
+            ).format(documentName)
+        )
+        dialog.setInformativeText(
+            dialog.tr("Your changes to the modified items will be lost.")
+        )
+        return dialog.exec_()
+
 
 class CloseMessageBox(MessageBox):
     def __init__(self, parent=None):
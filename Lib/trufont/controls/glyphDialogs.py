@@ -1,4 +1,4 @@
-from PyQt5.QtCore import QEvent, QLocale, Qt
+from PyQt5.QtCore import QAbstractListModel, QEvent, QLocale, QModelIndex, Qt
 from PyQt5.QtGui import QDoubleValidator
 from PyQt5.QtWidgets import (
     QDialog,
@@ -6,20 +6,96 @@ from PyQt5.QtWidgets import (
     QGridLayout,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
     QRadioButton,
 )
 
+from trufont.objects.defcon import TemplateGlyph
 
-class FindDialog(QDialog):
-    alphabetical = [dict(type="alphabetical", allowPseudoUnicode=True)]
 
+class GlyphNameListModel(QAbstractListModel):
+    """
+    A list of glyph names, filtered by :meth:`setFilter`.
+
+    When the filter text gets longer, only the names that matched before
+    are looked through again.
+    """
+
+    def __init__(self, glyphNames=(), parent=None):
+        super().__init__(parent)
+        self._glyphNames = glyphNames
+        self._names = [glyphName for glyphName in glyphNames if glyphName]
+        self._text = ""
+        self._beginsWith = True
+
+    def glyphNames(self):
+        """
+        Returns the names that match the filter.
+        """
+        return self._names
+
+    def setGlyphNames(self, glyphNames):
+        self._glyphNames = glyphNames
+        text, self._text = self._text, None
+        self.setFilter(text, self._beginsWith)
+
+    def setFilter(self, text, beginsWith=True):
+        """
+        Only keeps the names that start with *text* if *beginsWith* is True,
+        or else that contain it.
+        """
+        oldText = self._text
+        if text == oldText and beginsWith == self._beginsWith:
+            return
+        # matches are a subset of the previous ones
+        if oldText is not None and (
+            oldText in text
+            if not self._beginsWith
+            else beginsWith and text.startswith(oldText)
+        ):
+            glyphNames = self._names
+        else:
+            glyphNames = self._glyphNames
+        if beginsWith:
+            names = [
+                glyphName
+                for glyphName in glyphNames
+                if glyphName and glyphName.startswith(text)
+            ]
+        else:
+            names = [
+                glyphName for glyphName in glyphNames if glyphName and text in glyphName
+            ]
+        self.beginResetModel()
+        self._names = names
+        self._text = text
+        self._beginsWith = beginsWith
+        self.endResetModel()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role == Qt.DisplayRole:
+            return self._names[index.row()]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._names)
+
+
+class FindDialog(QDialog):
     def __init__(self, currentGlyph, parent=None):
         super().__init__(parent)
         self.setWindowModality(Qt.WindowModal)
         self.setWindowTitle(self.tr("Find…"))
-        self._sortedGlyphNames = currentGlyph.font.unicodeData.sortGlyphNames(
-            currentGlyph.layer.keys(), self.alphabetical
+        layer = currentGlyph.layer
+        font = layer.font
+        # the glyph order entries that are drawn as template glyphs
+        templates = font is not None and layer is font.layers.defaultLayer
+        # cached by the layer until its glyph set or the glyph order changes
+        self._sortedGlyphNames = layer.getRepresentation(
+            "TruFont.SortedGlyphNames", templates=templates
         )
 
         layout = QGridLayout(self)
@@ -34,8 +110,13 @@ class FindDialog(QDialog):
         self.beginsWithBox.setChecked(True)
         self.beginsWithBox.toggled.connect(self.updateGlyphList)
 
-        self.glyphList = QListWidget(self)
-        self.glyphList.itemDoubleClicked.connect(self.accept)
+        self.glyphModel = GlyphNameListModel(self._sortedGlyphNames, self)
+        self.glyphList = QListView(self)
+        # lay out rows a batch at a time rather than all upfront
+        self.glyphList.setLayoutMode(QListView.Batched)
+        self.glyphList.setUniformItemSizes(True)
+        self.glyphList.setModel(self.glyphModel)
+        self.glyphList.doubleClicked.connect(self.accept)
 
         buttonBox = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttonBox.accepted.connect(self.accept)
@@ -73,36 +154,23 @@ class FindDialog(QDialog):
 
     def updateGlyphList(self):
         beginsWith = self.beginsWithBox.isChecked()
-        self.glyphList.clear()
-        if not self.glyphEdit.isModified():
-            self.glyphList.addItems(self._sortedGlyphNames)
-        else:
-            text = self.glyphEdit.text()
-            if beginsWith:
-                glyphs = [
-                    glyphName
-                    for glyphName in self._sortedGlyphNames
-                    if glyphName and glyphName.startswith(text)
-                ]
-            else:
-                glyphs = [
-                    glyphName
-                    for glyphName in self._sortedGlyphNames
-                    if glyphName and text in glyphName
-                ]
-            self.glyphList.addItems(glyphs)
-        self.glyphList.setCurrentRow(0)
+        text = self.glyphEdit.text() if self.glyphEdit.isModified() else ""
+        self.glyphModel.setFilter(text, beginsWith)
+        self.glyphList.setCurrentIndex(self.glyphModel.index(0))
 
     @classmethod
     def getNewGlyph(cls, parent, currentGlyph):
         dialog = cls(currentGlyph, parent)
         result = dialog.exec_()
-        currentItem = dialog.glyphList.currentItem()
+        currentIndex = dialog.glyphList.currentIndex()
         newGlyph = None
-        if currentItem is not None:
-            newGlyphName = currentItem.text()
-            if newGlyphName in currentGlyph.layer:
-                newGlyph = currentGlyph.layer[newGlyphName]
+        if currentIndex.isValid():
+            newGlyphName = currentIndex.data()
+            layer = currentGlyph.layer
+            if newGlyphName in layer:
+                newGlyph = layer[newGlyphName]
+            elif newGlyphName is not None:
+                newGlyph = TemplateGlyph(newGlyphName, layer).promote()
         return (newGlyph, result)
 
 
@@ -110,7 +178,11 @@ class AddComponentDialog(FindDialog):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setWindowTitle(self.tr("Add component…"))
-        self._sortedGlyphNames.remove(args[0].name)
+        glyphName = args[0].name
+        self._sortedGlyphNames = [
+            name for name in self._sortedGlyphNames if name != glyphName
+        ]
+        self.glyphModel.setGlyphNames(self._sortedGlyphNames)
         self.updateGlyphList()
 
 
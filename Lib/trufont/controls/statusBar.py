@@ -1,6 +1,13 @@
-from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtCore import QSize, Qt, pyqtSignal
 from PyQt5.QtGui import QColor, QPainter, QPainterPath
-from PyQt5.QtWidgets import QHBoxLayout, QLabel, QSizePolicy, QSpinBox, QWidget
+from PyQt5.QtWidgets import (
+    QHBoxLayout,
+    QLabel,
+    QProgressBar,
+    QSizePolicy,
+    QSpinBox,
+    QWidget,
+)
 
 from trufont.controls.pathButton import PathButton
 
@@ -17,6 +24,13 @@ _plusPath.lineTo(6, 11)
 _minPath.translate(5, 7)
 _plusPath.translate(5, 7)
 
+_cancelPath = QPainterPath()
+_cancelPath.moveTo(2, 2)
+_cancelPath.lineTo(10, 10)
+_cancelPath.moveTo(2, 10)
+_cancelPath.lineTo(10, 2)
+_cancelPath.translate(5, 7)
+
 
 def Button():
     btn = PathButton()
@@ -28,12 +42,15 @@ def Button():
 
 class StatusBar(QWidget):
     """
-    Use the *sizeChanged* signal for size changes.
+    Use the *sizeChanged* signal for size changes, and the *progressCancelled*
+    signal for clicks on the progress indicator’s cancel button.
 
     TODO: specify only isFontTab/isGlyphTab and put the details
     in the widget internals
     """
 
+    progressCancelled = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._shouldPropagateSize = True
@@ -41,6 +58,18 @@ class StatusBar(QWidget):
         self.statusLabel = QLabel(self)
 
         btnColor = QColor(126, 126, 126)
+        self.progressBar = QProgressBar(self)
+        self.progressBar.setFixedWidth(120)
+        self.progressBar.setMaximumHeight(12)
+        self.progressBar.setTextVisible(False)
+        self.cancelButton = Button()
+        self.cancelButton.setDrawingCommands(
+            [QSize(23, 25), (_cancelPath, "1a", btnColor)]
+        )
+        self.cancelButton.setToolTip(self.tr("Cancel"))
+        self.cancelButton.clicked.connect(self.progressCancelled)
+        self.setProgressVisible(False)
+
         minusButton = Button()
         minusButton.setDrawingCommands([QSize(23, 25), (_minPath, "1", btnColor)])
         minusButton.setProperty("delta", -10)
@@ -57,6 +86,8 @@ class StatusBar(QWidget):
 
         layout = QHBoxLayout(self)
         layout.addWidget(self.statusLabel)
+        layout.addWidget(self.progressBar)
+        layout.addWidget(self.cancelButton)
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
         layout.addWidget(spacer)
@@ -80,6 +111,20 @@ class StatusBar(QWidget):
     def setTextVisible(self, value):
         self.statusLabel.setVisible(value)
 
+    def progress(self):
+        return self.progressBar.value(), self.progressBar.maximum()
+
+    def setProgress(self, value, maximum):
+        self.progressBar.setMaximum(maximum)
+        self.progressBar.setValue(value)
+
+    def progressVisible(self):
+        return self.progressBar.isVisible()
+
+    def setProgressVisible(self, value):
+        self.progressBar.setVisible(value)
+        self.cancelButton.setVisible(value)
+
     def minimumSize(self):
         return self.sizeEdit.minimum()
 
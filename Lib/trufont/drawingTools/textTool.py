@@ -5,6 +5,7 @@ from PyQt5.QtGui import QColor, QKeySequence, QPainterPath
 from PyQt5.QtWidgets import QApplication
 
 from trufont.drawingTools.baseTool import BaseTool
+from trufont.objects.defcon import TemplateGlyph
 
 _path = QPainterPath()
 _path.moveTo(5.29, 17.96)
@@ -52,10 +53,13 @@ class TextTool(BaseTool):
 
     # TODO: we might want to fold this into LayoutManager
     def _insertUnicodings(self, text):
-        unicodeData = self._font.unicodeData
+        font = self._font
+        unicodeData = font.unicodeData
         for c in text:
             glyphName = unicodeData.glyphNameForUnicode(ord(c))
             if glyphName is not None:
+                if glyphName not in font:
+                    TemplateGlyph(glyphName, font.layers.defaultLayer).promote()
                 self._layoutManager.insert(glyphName)
 
     # methods
@@ -5,6 +5,7 @@ from PyQt5.QtCore import QEvent, QStandardPaths, Qt, QUrl
 from PyQt5.QtGui import QDesktopServices
 from PyQt5.QtWidgets import QAction, QApplication, QFileDialog
 
+from defconQt.tools import glyphCellCache
 from trufont.controls.aboutDialog import AboutDialog
 from trufont.drawingTools.knifeTool import KnifeTool
 from trufont.drawingTools.penTool import PenTool
@@ -15,10 +16,13 @@ from trufont.drawingTools.textTool import TextTool
 from trufont.objects import settings
 from trufont.objects.defcon import TFont
 from trufont.objects.extension import TExtension
+from trufont.objects.glyphCache import GlyphCache
+from trufont.objects.glyphLoader import GlyphLoader
 from trufont.objects.menu import MAX_RECENT_FILES, Entries, MenuBar, globalMenuBar
 from trufont.tools import errorReports, glyphList, platformSpecific
 from trufont.windows.extensionBuilderWindow import ExtensionBuilderWindow
 from trufont.windows.fontWindow import FontWindow
+from trufont.windows.representationCacheWindow import RepresentationCacheWindow
 from trufont.windows.scriptingWindow import ScriptingWindow
 from trufont.windows.settingsWindow import SettingsWindow
 
@@ -40,6 +44,7 @@ class Application(QApplication):
         self._extensions = []
         self.dispatcher = NotificationCenter()
         self.dispatcher.addObserver(self, "_fontWindowClosed", "fontWillClose")
+        self.dispatcher.addObserver(self, "_preferencesChanged", "preferencesChanged")
         self.focusWindowChanged.connect(self._focusWindowChanged)
         self.GL2UV = None
         self.outputWindow = None
@@ -74,6 +79,9 @@ class Application(QApplication):
             if self._currentGlyph.font == font:
                 self.setCurrentGlyph(None)
 
+    def _preferencesChanged(self, notification):
+        self.updateGlyphCellCache()
+
     def event(self, event):
         eventType = event.type()
         # respond to OSX open events
@@ -87,11 +95,11 @@ class Application(QApplication):
                 if not self._launched:
                     notification = "applicationLaunched"
                     self.loadGlyphList()
+                    self.updateGlyphCellCache()
                     self._launched = True
                 else:
                     notification = "applicationActivated"
-                    # XXX: do it
-                    # self.lookupExternalChanges()
+                    self.lookupExternalChanges()
                 self.postNotification(notification)
             elif applicationState == Qt.ApplicationInactive:
                 self.postNotification("applicationWillIdle")
@@ -121,17 +129,16 @@ class Application(QApplication):
             else:
                 self.GL2UV = glyphList_
 
+    def updateGlyphCellCache(self):
+        cache = glyphCellCache.defaultCache()
+        cache.setMaxSize(settings.glyphCellCacheSize() * 2**20)
+
     def lookupExternalChanges(self):
-        for font in self.allFonts():
-            if not font.path:
-                continue
-            changed = font.testForExternalChanges()
-            for attr in ("info", "kerning", "groups", "features", "lib"):
-                if changed[attr]:
-                    data = dict(font=font)
-                    self.postNotification("fontChangedExternally", data)
-                    return
-            # XXX: do more
+        # edits made while we were in the background, which the font
+        # watchers may not have been told about
+        for widget in self.topLevelWidgets():
+            if isinstance(widget, FontWindow):
+                widget.lookupExternalChanges()
 
     # -----------------
     # Window management
@@ -205,6 +212,9 @@ class Application(QApplication):
         windowMenu.fetchAction(Entries.Window_Scripting, self.scripting)
         if self.outputWindow is not None:
             windowMenu.fetchAction(Entries.Window_Output, self.output)
+        windowMenu.fetchAction(
+            Entries.Window_Representation_Cache, self.representationCache
+        )
         # TODO: add a list of open windows in window menu, check active window
         # maybe add helper function that filters topLevelWidgets into windows
         # bc we need this in a few places
@@ -477,7 +487,9 @@ class Application(QApplication):
                     return
         font = TFont()
         try:
-            font.extract(path)
+            # large fonts are converted in worker processes, or in-process
+            # on a single CPU
+            font.extract(path, maxWorkers=os.cpu_count() or 1)
             self._loadFont(font)
         except Exception as e:
             errorReports.showCriticalException(e)
@@ -498,14 +510,22 @@ class Application(QApplication):
                     return
         try:
             font = TFont(path)
-            self._loadFont(font)
+            if settings.cacheParsedGlyphs():
+                for layer in font.layers:
+                    glyphSet = layer.glyphSet()
+                    if glyphSet is not None:
+                        layer.setGlyphCache(GlyphCache.forGlyphSet(glyphSet))
+            glyphLoader = None
+            if settings.loadGlyphsInBackground():
+                glyphLoader = GlyphLoader(font)
+            self._loadFont(font, glyphLoader)
         except Exception as e:
             msg = self.tr("There was an issue opening the font at {}.").format(path)
             errorReports.showCriticalException(e, msg)
             return
         self.setCurrentFile(font.path)
 
-    def _loadFont(self, font):
+    def _loadFont(self, font, glyphLoader=None):
         currentFont = self.currentFont()
         # Open new font in current font window if it contains an unmodified
         # empty font (e.g. after startup).
@@ -516,9 +536,9 @@ class Application(QApplication):
             and currentFont.dirty is False
         ):
             window = self._currentFontWindow
-            window.setFont_(font)
+            window.setFont_(font, glyphLoader)
         else:
-            window = FontWindow(font)
+            window = FontWindow(font, glyphLoader=glyphLoader)
         window.show()
 
     def openRecentFile(self):
@@ -593,6 +613,14 @@ class Application(QApplication):
     def output(self):
         self.outputWindow.setVisible(not self.outputWindow.isVisible())
 
+    def representationCache(self):
+        if not hasattr(self, "_representationCacheWindow"):
+            self._representationCacheWindow = RepresentationCacheWindow()
+        if self._representationCacheWindow.isVisible():
+            self._representationCacheWindow.raise_()
+        else:
+            self._representationCacheWindow.show()
+
     # Help
 
     def about(self):
@@ -1,5 +1,8 @@
 import math
+import os
 import types
+from copy import deepcopy
+from datetime import datetime, timezone
 
 import fontTools
 from booleanOperations import union
@@ -15,13 +18,21 @@ from defcon import (
     Kerning,
     Layer,
     Point,
+    UnicodeData,
 )
 from fontTools.misc.transform import Identity
+from fontTools.pens.recordingPen import RecordingPointPen
+from fontTools.ufoLib import UFOReader, fontInfoAttributesVersion3
+from fontTools.ufoLib.glifLib import readGlyphFromString
 from PyQt5.QtWidgets import QApplication
 from ufo2ft import compileOTF, compileTTF
 
 from trufont.objects import settings
-from trufont.objects.undoManager import UndoManager
+from trufont.objects.fontExtractor import extractFont, fileStamp
+from trufont.objects.glyphCache import glyphSetDirectory
+from trufont.objects.glyphLoader import readGlyphRecord
+from trufont.objects.glyphOrderIndex import GlyphOrderIndex
+from trufont.objects.undoManager import UndoManager, isUndoableNotification
 
 _shaper = True
 try:
@@ -34,6 +45,106 @@ except ImportError:
     except ImportError:
         _shaper = False
 
+# font attributes and the files they're stored in, in reload order
+fontFiles = (
+    ("info", "fontinfo.plist"),
+    ("groups", "groups.plist"),
+    ("kerning", "kerning.plist"),
+    ("features", "features.fea"),
+    ("lib", "lib.plist"),
+)
+
+
+def _glifModificationTimes(glyphSet):
+    # one directory scan rather than a filesystem lookup per glyph; times
+    # go through datetime like GlyphSet.getGLIFModificationTime, so that
+    # they compare equal to glyph stamps
+    directory = glyphSetDirectory(glyphSet)
+    if directory is None:
+        return None
+    modTimes = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                mtime = entry.stat().st_mtime
+                modTimes[entry.name] = datetime.fromtimestamp(
+                    mtime, timezone.utc
+                ).timestamp()
+    except OSError:
+        return None
+    return modTimes
+
+
+def _glyphData(glyph):
+    # what copyDataFromGlyph copies, in comparable form
+    pen = RecordingPointPen()
+    glyph.drawPoints(pen)
+    # leave out selection state, which TContour draws, and unset identifiers
+    outline = [
+        (
+            method,
+            args,
+            (
+                {key: value for key, value in kwargs.items() if key == "identifier"}
+                if kwargs.get("identifier") is not None
+                else None
+            ),
+        )
+        for method, args, kwargs in pen.value
+    ]
+    image = glyph._image
+    return (
+        glyph.width,
+        glyph.height,
+        glyph.unicodes,
+        glyph.note,
+        outline,
+        [
+            (anchor.x, anchor.y, anchor.name, anchor.color, anchor.identifier)
+            for anchor in glyph.anchors
+        ],
+        [
+            (
+                guideline.x,
+                guideline.y,
+                guideline.angle,
+                guideline.name,
+                guideline.color,
+                guideline.identifier,
+            )
+            for guideline in glyph.guidelines
+        ],
+        # don't bring in an empty image or lib
+        (
+            image.getDataForSerialization()
+            if image is not None and image.fileName is not None
+            else None
+        ),
+        glyph._lib or {},
+    )
+
+
+def _unicodeForGlyphName(name):
+    app = QApplication.instance()
+    if app.GL2UV is not None:
+        GL2UV = app.GL2UV
+    else:
+        GL2UV = fontTools.agl.AGL2UV
+    hexes = "ABCDEF0123456789"
+    if name in GL2UV:
+        return GL2UV[name]
+    elif (
+        name.startswith("uni") and len(name) == 7 and all(c in hexes for c in name[3:])
+    ):
+        return int(name[3:], 16)
+    elif (
+        name.startswith("u")
+        and len(name) in (5, 7)
+        and all(c in hexes for c in name[1:])
+    ):
+        return int(name[1:], 16)
+    return None
+
 
 class TFont(Font):
     def __init__(self, *args, **kwargs):
@@ -49,10 +160,12 @@ class TFont(Font):
             ("layerClass", TLayer),
             ("groupsClass", TGroups),
             ("kerningClass", TKerning),
+            ("unicodeDataClass", TUnicodeData),
         )
         for attr, defaultClass in attrs:
             if attr not in kwargs:
                 kwargs[attr] = defaultClass
+        self._glyphOrderIndex = GlyphOrderIndex()
         super().__init__(*args, **kwargs)
         self._engine = None
 
@@ -67,6 +180,18 @@ class TFont(Font):
             return self._binaryPath
         return None
 
+    @property
+    def binaryStamp(self):
+        """
+        The modification time and size of the binary font when it was last
+        read, as given by :func:`fileStamp`.
+        """
+        return getattr(self, "_binaryStamp", None)
+
+    @binaryStamp.setter
+    def binaryStamp(self, value):
+        self._binaryStamp = value
+
     @property
     def engine(self):
         if _shaper and self._engine is None:
@@ -89,8 +214,9 @@ class TFont(Font):
             if defaultGlyphSet in glyphSets:
                 glyphNames = glyphSets[defaultGlyphSet]
             if glyphNames is not None:
-                for name in glyphNames:
-                    font.get(name, asTemplate=True)
+                # template glyphs are drawn from the glyph order, see
+                # TemplateGlyph
+                font.glyphOrder = list(dict.fromkeys(glyphNames))
         font.dirty = False
 
         app = QApplication.instance()
@@ -102,7 +228,57 @@ class TFont(Font):
     def get(self, name, **kwargs):
         return self._glyphSet.get(name, **kwargs)
 
-    def extract(self, path):
+    def postNotification(self, notification, data=None):
+        if notification == "Font.GlyphOrderChanged":
+            # sorted along with the glyphs of the default layer, whichever
+            # layer that is
+            for layer in self.layers:
+                layer.destroyRepresentation("TruFont.SortedGlyphNames", templates=True)
+        super().postNotification(notification, data)
+
+    @property
+    def glyphOrderIndex(self):
+        """
+        The :class:`GlyphOrderIndex` of the glyph order, brought up to date
+        when requested.
+        """
+        index = self._glyphOrderIndex
+        glyphOrder = self.lib.get("public.glyphOrder")
+        if not index.isCurrent(glyphOrder):
+            index.update(glyphOrder)
+        return index
+
+    def updateGlyphOrder(self, addedGlyph=None, removedGlyph=None):
+        # like Font.updateGlyphOrder, which scans the glyph order for every
+        # glyph added
+        index = self.glyphOrderIndex
+        position = None
+        if removedGlyph is not None and removedGlyph in index:
+            if removedGlyph == addedGlyph:
+                return
+            position = index.index(removedGlyph)
+        if addedGlyph in index:
+            addedGlyph = None
+        if addedGlyph is None and position is None:
+            return
+        order = index.glyphNames()
+        if addedGlyph is not None:
+            if position is not None:
+                order[position] = addedGlyph
+                position = None
+            else:
+                order.append(addedGlyph)
+        if position is not None:
+            del order[position]
+        self.glyphOrder = order
+
+    def extract(self, path, maxWorkers=1):
+        """
+        Reads the binary font at *path* into this font.
+
+        Glyph outlines of large OpenType fonts are converted by up to
+        *maxWorkers* processes, one by default.
+        """
         import extractor
 
         fileFormat = extractor.extractFormat(path)
@@ -110,17 +286,108 @@ class TFont(Font):
         data = dict(font=self, format=fileFormat)
         app.postNotification("fontWillExtract", data)
         # don't bring on UndoManager just yet
-        func = self.newGlyph
+        layer = self._glyphSet
+        func = layer.newGlyph
+        stamp = fileStamp(path)
         try:
-            self.newGlyph = types.MethodType(Font.newGlyph, self)
-            extractor.extractUFO(path, self, fileFormat)
+            layer.newGlyph = types.MethodType(Layer.newGlyph, layer)
+            extractFont(path, self, fileFormat, maxWorkers)
             for glyph in self:
                 glyph.dirty = False
+                glyph.undoable = True
+                # there's no GLIF to undo the first change back to
                 glyph.undoManager = UndoManager(glyph)
         finally:
-            self.newGlyph = func
+            layer.newGlyph = func
         self.dirty = False
         self._binaryPath = path
+        self._binaryStamp = stamp
+
+    def mergeFont(self, source, glyphNames=None):
+        """
+        Makes this font match the default layer and font data of *source*,
+        changing in place only the glyphs, info attributes, kerning, groups,
+        features and lib that differ.
+
+        If given, only the glyphs in *glyphNames* (and those that are only
+        in one of the fonts) are compared, others being known to match.
+
+        Changed glyphs lose their undo history. Glyph notifications are
+        posted once everything is in place, and layer and font notifications
+        are held until then.
+
+        Returns a dictionary with the names of the glyphs changed, added and
+        removed and the names of the font data that changed.
+        """
+        changes = dict(changed=[], added=[], removed=[], fontData=[])
+        # font data
+        info = self.info
+        info.holdNotifications()
+        for attr in fontInfoAttributesVersion3:
+            value = getattr(source.info, attr)
+            if getattr(info, attr) != value:
+                setattr(info, attr, deepcopy(value))
+                if "info" not in changes["fontData"]:
+                    changes["fontData"].append("info")
+        info.releaseHeldNotifications()
+        for attr in ("groups", "kerning", "lib"):
+            obj, sourceObj = getattr(self, attr), getattr(source, attr)
+            if dict(obj) != dict(sourceObj):
+                obj.holdNotifications()
+                obj.clear()
+                obj.update(deepcopy(dict(sourceObj)))
+                obj.releaseHeldNotifications()
+                changes["fontData"].append(attr)
+        if self.features.text != source.features.text:
+            self.features.text = source.features.text
+            changes["fontData"].append("features")
+        # glyphs
+        layer = self._glyphSet
+        sourceNames = set(source.keys())
+        for glyphName in sorted(self.keys() - sourceNames):
+            del layer[glyphName]
+            changes["removed"].append(glyphName)
+        if glyphNames is None:
+            glyphNames = sourceNames
+        # observers hear about the glyphs once they are all in place, and the
+        # layer and font post their changes once
+        self.holdNotifications(note="Requested by TFont.mergeFont.")
+        layer.holdNotifications(note="Requested by TFont.mergeFont.")
+        flush = []
+        for glyphName in sorted(sourceNames):
+            sourceGlyph = source[glyphName]
+            if glyphName not in layer:
+                glyph = layer.newGlyph(glyphName)
+                changes["added"].append(glyphName)
+            elif glyphName in glyphNames:
+                glyph = layer[glyphName]
+                if _glyphData(glyph) == _glyphData(sourceGlyph):
+                    if glyph.dirty:
+                        glyph.dirty = False
+                    continue
+                changes["changed"].append(glyphName)
+            else:
+                continue
+            glyph.resetUndoManager()
+            glyph.undoable = False
+            glyph.holdNotifications(note="Requested by TFont.mergeFont.")
+            glyph.clear()
+            glyph.copyDataFromGlyph(sourceGlyph)
+            glyph.dirty = False
+            flush.append(glyph)
+        # the outline notifications index the components of changed glyphs
+        # as well, but those of added glyphs may be posted before they are
+        # in the layer
+        layer._unindexedGlyphNames.update(glyph.name for glyph in flush)
+        for glyph in flush:
+            glyph.releaseHeldNotifications()
+            glyph.undoable = True
+            # the first change undoes back to the merged glyph, not its GLIF
+            glyph.undoManager = UndoManager(glyph)
+        layer.releaseHeldNotifications()
+        self.releaseHeldNotifications()
+        self.dirty = False
+        return changes
 
     def save(
         self,
@@ -135,6 +402,105 @@ class TFont(Font):
         super().save(path, formatVersion, removeUnreferencedImages, progressBar)
         app.postNotification("fontSaved", data)
 
+    def reloadChanges(self):
+        """
+        Reverts the font to what is on disk, reloading only the font files
+        and glyphs that were modified since they were read, whether in the
+        font or in the UFO.
+
+        Glyphs and files that weren’t loaded yet are left alone, as are the
+        undo managers of glyphs that aren’t reloaded.
+
+        Returns a dictionary with the names of the reloaded font files and
+        the reloaded glyph names of each layer.
+        """
+        changes = dict(fontFiles=[], layers={})
+        if self.path is None:
+            return changes
+        with UFOReader(self.path, validate=False) as reader:
+            for attr, fileName in fontFiles:
+                obj = getattr(self, "_" + attr)
+                if obj is None:
+                    continue
+                if obj.dirty or self._testFontDataForExternalModifications(
+                    obj, fileName, reader
+                ):
+                    changes["fontFiles"].append(fileName)
+        # groups come before kerning, which is validated against them
+        for attr, fileName in fontFiles:
+            if fileName in changes["fontFiles"]:
+                obj = getattr(self, "_" + attr)
+                getattr(self, "reload" + attr.capitalize())()
+                obj.dirty = False
+        for layer in self.layers:
+            glyphNames = layer.changedGlyphNames()
+            if glyphNames:
+                changes["layers"][layer.name] = glyphNames
+        if changes["layers"]:
+            self.reloadLayers(
+                dict(
+                    layers={
+                        layerName: dict(glyphNames=glyphNames)
+                        for layerName, glyphNames in changes["layers"].items()
+                    }
+                )
+            )
+        self.dirty = False
+        return changes
+
+    def hasLocalChanges(self, changes):
+        """
+        Returns whether any of the font files or glyphs that *changes* lists
+        as changed on disk was modified in the font as well.
+        """
+        for attr, fileName in fontFiles:
+            obj = getattr(self, "_" + attr)
+            if obj is not None and obj.dirty and fileName in changes["fontFiles"]:
+                return True
+        for layerName, glyphChanges in changes["layers"].items():
+            if layerName not in self.layers:
+                continue
+            layer = self.layers[layerName]
+            for glyphName in glyphChanges["modified"] + glyphChanges["deleted"]:
+                if layer.isGlyphLoaded(glyphName) and layer[glyphName].dirty:
+                    return True
+        return False
+
+    def reloadExternalChanges(self, changes):
+        """
+        Reloads the font files and glyphs that *changes* lists as changed on
+        disk, in the format of :meth:`FontWatcher.externalChanges`. Local
+        changes to them are lost.
+        """
+        dirty = self.dirty
+        for attr, fileName in fontFiles:
+            obj = getattr(self, "_" + attr)
+            if obj is None or fileName not in changes["fontFiles"]:
+                continue
+            getattr(self, "reload" + attr.capitalize())()
+            obj.dirty = False
+        layerData = {}
+        for layerName, glyphChanges in changes["layers"].items():
+            if layerName not in self.layers:
+                continue
+            layer = self.layers[layerName]
+            layer.syncGlyphNames(glyphChanges["added"], glyphChanges["deleted"])
+            glyphNames = []
+            for glyphName in glyphChanges["modified"] + glyphChanges["deleted"]:
+                if not layer.isGlyphLoaded(glyphName):
+                    continue
+                glyph = layer[glyphName]
+                # a template whose glyph was written by someone else
+                if glyph.template and glyphName in layer.glyphSet():
+                    glyph.template = False
+                glyphNames.append(glyphName)
+            if glyphNames:
+                layerData[layerName] = dict(glyphNames=glyphNames)
+        if layerData:
+            self.reloadLayers(dict(layers=layerData))
+        if not dirty:
+            self.dirty = False
+
     def export(self, path, format="otf", compression=None, **kwargs):
         if format == "otf":
             func = compileOTF
@@ -209,6 +575,18 @@ class TFont(Font):
 
 
 class TLayer(Layer):
+    def __init__(self, *args, **kwargs):
+        self._glyphCache = None
+        self._glyphCacheGlyphSet = None
+        self._contentsModTime = None
+        # base glyph name: names of the loaded glyphs with such components
+        self._compositeGlyphNames = {}
+        # glyph name: base glyph names of its components
+        self._baseGlyphNames = {}
+        # glyphs whose components may have changed since they were indexed
+        self._unindexedGlyphNames = set()
+        super().__init__(*args, **kwargs)
+
     def get(
         self,
         name,
@@ -246,13 +624,350 @@ class TLayer(Layer):
 
         return glyph
 
-    def loadGlyph(self, name):
-        glyph = super().loadGlyph(name)
-        glyph.undoManager = UndoManager(glyph)
+    def glyphSet(self):
+        return self._glyphSet
+
+    def glyphCache(self):
+        """
+        Returns the :class:`GlyphCache` glyphs are loaded through, or None.
+
+        The cache is dropped once the layer’s glyph set moves to another
+        folder, e.g. after a save as.
+        """
+        cache = self._glyphCache
+        # defcon replaces the glyph set on save
+        if cache is not None and self._glyphSet is not self._glyphCacheGlyphSet:
+            directory = glyphSetDirectory(self._glyphSet)
+            if directory is None or os.path.realpath(directory) != cache.directory():
+                cache.close()
+                cache = self._glyphCache = None
+            self._glyphCacheGlyphSet = self._glyphSet
+        return cache
+
+    def setGlyphCache(self, cache):
+        self._glyphCache = cache
+        self._glyphCacheGlyphSet = self._glyphSet
+
+    def isGlyphLoaded(self, name):
+        return name in self._glyphs
+
+    # component references
+
+    def compositeGlyphNames(self, glyphName):
+        """
+        Returns the names of the loaded glyphs that use *glyphName* as a
+        component, directly or through other composite glyphs.
+
+        Unlike defcon’s componentReferences, this comes from an index kept
+        up to date as glyphs change, and glyphs that aren't loaded, which
+        have nothing drawn from their components yet, are left out.
+        """
+        self._indexComponents()
+        compositeGlyphNames = self._compositeGlyphNames
+        found = set()
+        names = [glyphName]
+        while names:
+            for name in compositeGlyphNames.get(names.pop(), ()):
+                if name not in found:
+                    found.add(name)
+                    names.append(name)
+        # components may reference each other in a cycle
+        found.discard(glyphName)
+        return found
+
+    def _indexComponents(self):
+        for name in self._unindexedGlyphNames:
+            self._unindexGlyph(name)
+            glyph = self._glyphs.get(name)
+            if glyph is None:
+                continue
+            baseGlyphNames = {component.baseGlyph for component in glyph.components}
+            if not baseGlyphNames:
+                continue
+            self._baseGlyphNames[name] = baseGlyphNames
+            for baseGlyphName in baseGlyphNames:
+                self._compositeGlyphNames.setdefault(baseGlyphName, set()).add(name)
+        self._unindexedGlyphNames.clear()
+
+    def _unindexGlyph(self, name):
+        for baseGlyphName in self._baseGlyphNames.pop(name, ()):
+            names = self._compositeGlyphNames[baseGlyphName]
+            names.discard(name)
+            if not names:
+                del self._compositeGlyphNames[baseGlyphName]
+
+    def _postComponentBaseGlyphDataChanged(self, glyphName):
+        compositeGlyphNames = self.compositeGlyphNames(glyphName)
+        if not compositeGlyphNames:
+            return
+        changedGlyphNames = compositeGlyphNames | {glyphName}
+        # the layer would otherwise post its change once per glyph
+        self.holdNotifications(note="Requested by TLayer.")
+        glyphs = [self._glyphs[name] for name in compositeGlyphNames]
+        for glyph in glyphs:
+            for component in glyph.components:
+                if component.baseGlyph in changedGlyphNames:
+                    # including defcon’s bounds, which it keeps otherwise
+                    component.destroyAllRepresentations()
+            # not a change of the glyph itself, so it isn't undoable nor
+            # makes the glyph dirty
+            glyph.postNotification("Glyph.ComponentBaseGlyphDataChanged")
+        # only once all the outlines that composites are built from are
+        # outdated, in case an observer redraws right away
+        for glyph in glyphs:
+            glyph.postNotification(glyph.changeNotificationName)
+        self.releaseHeldNotifications()
+
+    def _glyphOutlineChange(self, notification):
+        glyph = notification.object
+        if notification.name == "Glyph.ComponentsChanged":
+            self._unindexedGlyphNames.add(glyph.name)
+        self._postComponentBaseGlyphDataChanged(glyph.name)
+
+    def beginSelfGlyphNotificationObservation(self, glyph):
+        super().beginSelfGlyphNotificationObservation(glyph)
+        glyph.addObserver(self, "_glyphOutlineChange", "Glyph.ContoursChanged")
+        glyph.addObserver(self, "_glyphOutlineChange", "Glyph.ComponentsChanged")
+
+    def endSelfGlyphNotificationObservation(self, glyph):
+        if glyph.dispatcher is not None:
+            glyph.removeObserver(self, "Glyph.ContoursChanged")
+            glyph.removeObserver(self, "Glyph.ComponentsChanged")
+        super().endSelfGlyphNotificationObservation(glyph)
+
+    def _insertGlyph(self, glyph, beginObservations=True):
+        super()._insertGlyph(glyph, beginObservations)
+        name = glyph.name
+        if not glyph._isLoading:
+            # the glyph was added or renamed
+            self._postComponentBaseGlyphDataChanged(name)
+        # after the above, as the glyph may be filled in with notifications
+        # disabled
+        self._unindexedGlyphNames.add(name)
+
+    def _deleteGlyph(self, name, endObservations=True):
+        super()._deleteGlyph(name, endObservations)
+        self._unindexedGlyphNames.discard(name)
+        self._unindexGlyph(name)
+        # the glyph was deleted or renamed
+        self._postComponentBaseGlyphDataChanged(name)
+
+    def loadGlyph(self, name, record=None):
+        cache = self.glyphCache()
+        if record is None and cache is not None and name in self:
+            try:
+                record = readGlyphRecord(
+                    self._glyphSet, name, self.ufoLibReadValidate, cache
+                )
+            except Exception:
+                # let defcon report it
+                pass
+        if record is None:
+            glyph = super().loadGlyph(name)
+        else:
+            glyph = self._loadGlyphFromRecord(name, record)
+        glyph.undoable = True
+        return glyph
+
+    def _loadGlyphFromRecord(self, name, record):
+        # mirrors Layer.loadGlyph, but with already parsed GLIF data
+        if name not in self:
+            raise KeyError("%s not in layer" % name)
+        glyph = self.instantiateGlyphObject()
+        glyph.disableNotifications()
+        glyph._isLoading = True
+        glyph.name = name
+        glyph._dataOnDisk = record.text
+        glyph._dataOnDiskTimeStamp = record.modTime
+        self._insertGlyph(glyph)
+        record.copyToGlyph(glyph)
+        glyph.dirty = False
+        glyph._isLoading = False
+        glyph.enableNotifications()
         return glyph
 
+    def dirtyGlyphs(self):
+        """
+        Returns the loaded glyphs that changed since the last save, template
+        glyphs excepted.
+        """
+        return [
+            glyph
+            for glyph in self._glyphs.values()
+            if glyph.dirty and not glyph.template
+        ]
+
+    def deletedGlyphNames(self):
+        """
+        Returns the names of the glyphs that were deleted since the last save
+        and still have a file on disk.
+        """
+        return list(self._scheduledForDeletion.keys())
+
+    def glyphsSaved(self, glyphData, deletedGlyphNames, contentsChanged=True):
+        """
+        Updates the layer after its glyph files were written outside of
+        :meth:`save`.
+
+        *glyphData* holds a (glyph, glyphName, data) tuple for each glyph
+        written, *deletedGlyphNames* the names of the glyphs whose file was
+        removed.
+        """
+        glyphSet = self._glyphSet
+        if contentsChanged:
+            glyphSet.rebuildContents()
+        for glyph, glyphName, data in glyphData:
+            modTime = glyphSet.getGLIFModificationTime(glyphName)
+            if self._glyphs.get(glyphName) is glyph:
+                glyph._dataOnDisk = data
+                glyph._dataOnDiskTimeStamp = modTime
+            elif glyphName not in self._keys:
+                # renamed or deleted while being written
+                self._scheduledForDeletion[glyphName] = dict(
+                    dataOnDiskTimeStamp=modTime, dataOnDisk=data
+                )
+        for glyphName in deletedGlyphNames:
+            self._scheduledForDeletion.pop(glyphName, None)
+
+    def glyphDataOnDisk(self, glyphName):
+        """
+        Returns the GLIF source *glyphName* was read from, or None if it
+        isn’t known or the file changed since.
+        """
+        glyph = self._glyphs[glyphName]
+        if glyph._dataOnDisk is not None:
+            return glyph._dataOnDisk
+        glyphSet = self._glyphSet
+        if glyphSet is None or glyphName not in glyphSet.contents:
+            return None
+        # loaded from the glyph cache, which doesn't keep the GLIF source
+        try:
+            modTime = glyphSet.getGLIFModificationTime(glyphName)
+        except Exception:
+            return None
+        if modTime != glyph._dataOnDiskTimeStamp:
+            return None
+        return glyphSet.getGLIF(glyphName)
+
+    def changedGlyphNames(self):
+        """
+        Returns the names of the loaded glyphs that differ from their file,
+        either because they were modified or because the file changed on
+        disk. Template glyphs are left out.
+        """
+        glyphSet = self._glyphSet
+        if glyphSet is None:
+            return []
+        glyphSet.rebuildContents()
+        contents = glyphSet.contents
+        modTimes = _glifModificationTimes(glyphSet)
+        glyphNames = []
+        for glyphName, glyph in self._glyphs.items():
+            if glyph.template:
+                continue
+            if glyph.dirty or glyphName not in contents:
+                glyphNames.append(glyphName)
+                continue
+            if modTimes is not None:
+                modTime = modTimes.get(contents[glyphName])
+            else:
+                modTime = glyphSet.getGLIFModificationTime(glyphName)
+            if modTime is None:
+                glyphNames.append(glyphName)
+                continue
+            if modTime == glyph._dataOnDiskTimeStamp:
+                continue
+            # the glyph cache doesn't keep the source, compare to the file
+            # when it does
+            data = glyph._dataOnDisk
+            if data is None or glyphSet.getGLIF(glyphName) != data:
+                glyphNames.append(glyphName)
+        return glyphNames
+
+    def externalChanges(self):
+        """
+        Returns the names of the glyphs that were added, modified and deleted
+        on disk since the layer read them, as three lists.
+
+        Unlike :meth:`testForExternalChanges`, this leaves the layer as is.
+        Only loaded glyphs can be reported as modified.
+        """
+        glyphSet = self._glyphSet
+        if glyphSet is None:
+            return [], [], []
+        modTimes = _glifModificationTimes(glyphSet)
+        if modTimes is None:
+            glyphSet.rebuildContents()
+        else:
+            # contents.plist is slow to parse on large fonts
+            contentsModTime = modTimes.get("contents.plist")
+            if contentsModTime != self._contentsModTime:
+                glyphSet.rebuildContents()
+                self._contentsModTime = contentsModTime
+        contents = glyphSet.contents
+
+        def getModTime(glyphName):
+            if modTimes is not None:
+                return modTimes.get(contents[glyphName])
+            return glyphSet.getGLIFModificationTime(glyphName)
+
+        added = []
+        for glyphName in contents.keys() - self._keys:
+            deleted = self._scheduledForDeletion.get(glyphName)
+            # a deleted glyph whose file was rewritten is a new one
+            if deleted is None or deleted["dataOnDiskTimeStamp"] != getModTime(
+                glyphName
+            ):
+                added.append(glyphName)
+        deleted = []
+        for glyphName in self._keys - contents.keys():
+            # glyphs that haven't been saved yet never were on disk
+            glyph = self._glyphs.get(glyphName)
+            if glyph is None or glyph._dataOnDiskTimeStamp is not None:
+                deleted.append(glyphName)
+        modified = []
+        for glyphName, glyph in self._glyphs.items():
+            if glyphName not in contents:
+                continue
+            modTime = getModTime(glyphName)
+            if modTime is None or modTime == glyph._dataOnDiskTimeStamp:
+                continue
+            data = glyph._dataOnDisk
+            if data is None or glyphSet.getGLIF(glyphName) != data:
+                modified.append(glyphName)
+        return added, modified, deleted
+
+    def syncGlyphNames(self, added, deleted):
+        """
+        Adds the names of glyphs *added* on disk to the layer, and removes
+        those of *deleted* glyphs that aren't loaded. Loaded glyphs whose file
+        was deleted are to be reloaded, which turns them into templates.
+        """
+        unicodeData = self._unicodeData
+        for glyphName in added:
+            self._scheduledForDeletion.pop(glyphName, None)
+            if glyphName in self._keys:
+                continue
+            self._keys.add(glyphName)
+            if unicodeData is not None:
+                unicodes = self._glyphSet.getUnicodes([glyphName])[glyphName]
+                unicodeData.addGlyphData(glyphName, unicodes)
+        for glyphName in deleted:
+            if glyphName in self._glyphs:
+                continue
+            self._keys.discard(glyphName)
+            if unicodeData is not None:
+                # the file is gone, look the unicodes up the other way round
+                unicodes = [
+                    value
+                    for value, glyphNames in unicodeData.items()
+                    if glyphName in glyphNames
+                ]
+                unicodeData.removeGlyphData(glyphName, unicodes)
+
     def newGlyph(self, name):
         glyph = super().newGlyph(name)
+        glyph.undoable = True
         glyph.undoManager = UndoManager(glyph)
         return glyph
 
@@ -267,11 +982,31 @@ class TLayer(Layer):
                 glyph.clear()
                 glyph.template = True
                 glyph.dirty = False
+                # no longer on disk
+                glyph._dataOnDisk = glyph._dataOnDiskTimeStamp = None
                 continue
             yield glyphName
 
     def reloadGlyphs(self, glyphNames):
-        super().reloadGlyphs(self._glyphsReloadFilter(glyphNames))
+        # defcon walks the names twice
+        glyphNames = list(self._glyphsReloadFilter(glyphNames))
+        # the history of reloaded glyphs no longer applies, and the reload
+        # itself isn't undoable
+        glyphs = [self._glyphs[name] for name in glyphNames if name in self._glyphs]
+        for glyph in glyphs:
+            glyph.resetUndoManager()
+            glyph.undoable = False
+        self.holdNotifications(note="Requested by TLayer.")
+        try:
+            super().reloadGlyphs(glyphNames)
+            # glyphs that weren't loaded are read with notifications disabled
+            self._unindexedGlyphNames.update(glyphNames)
+            for glyphName in glyphNames:
+                self._postComponentBaseGlyphDataChanged(glyphName)
+        finally:
+            for glyph in glyphs:
+                glyph.undoable = True
+            self.releaseHeldNotifications()
 
     def saveGlyph(self, glyph, glyphSet, saveAs=False):
         if not glyph.template:
@@ -280,6 +1015,7 @@ class TLayer(Layer):
 
 class TGlyph(Glyph):
     def __init__(self, *args, **kwargs):
+        self._undoable = False
         super().__init__(*args, **kwargs)
         self._template = False
 
@@ -288,11 +1024,73 @@ class TGlyph(Glyph):
             self.__class__.__name__, self.name, self.layer.name
         )
 
+    # undo
+
+    def _get_undoable(self):
+        return self._undoable
+
+    def _set_undoable(self, value):
+        self._undoable = value
+
+    undoable = property(
+        _get_undoable,
+        _set_undoable,
+        doc="A boolean indicating whether the glyph gets an undo manager. "
+        "The undo manager is created the first time it is requested or the "
+        "glyph is modified.",
+    )
+
+    def _get_undoManager(self):
+        if self._undoManager is None and self._undoable:
+            self._undoManager = UndoManager(self)
+        return self._undoManager
+
+    def _set_undoManager(self, manager):
+        self._undoManager = manager
+
+    undoManager = property(
+        _get_undoManager,
+        _set_undoManager,
+        doc="The undo manager assigned to this glyph.",
+    )
+
+    def resetUndoManager(self):
+        """
+        Drops the undo manager and its history. A new one is made the next
+        time the glyph is modified.
+        """
+        manager = self._undoManager
+        if manager is not None:
+            manager._unsubscribeFromGlyph()
+            self._undoManager = None
+
+    def _undoBaseline(self):
+        # until its first change, the glyph matches what was read from disk
+        layer = self.layer
+        if layer is not None and layer.isGlyphLoaded(self.name):
+            glif = layer.glyphDataOnDisk(self.name)
+        else:
+            glif = getattr(self, "_dataOnDisk", None)
+        if glif is None:
+            return None
+        baseline = self.__class__()
+        readGlyphFromString(glif, baseline, baseline.getPointPen())
+        return baseline
+
+    def postNotification(self, notification, data=None):
+        if (
+            self._undoManager is None
+            and self._undoable
+            and isUndoableNotification(notification)
+        ):
+            self._undoManager = UndoManager(self, self._undoBaseline())
+        super().postNotification(notification, data)
+
     def beginUndoGroup(self, text=None):
-        self._undoManager.beginUndoGroup(text)
+        self.undoManager.beginUndoGroup(text)
 
     def endUndoGroup(self):
-        self._undoManager.endUndoGroup()
+        self.undoManager.endUndoGroup()
 
     # observe anchor selection
 
@@ -431,28 +1229,8 @@ class TGlyph(Glyph):
     )
 
     def autoUnicodes(self):
-        app = QApplication.instance()
-        if app.GL2UV is not None:
-            GL2UV = app.GL2UV
-        else:
-            GL2UV = fontTools.agl.AGL2UV
-        hexes = "ABCDEF0123456789"
-        name = self.name
-        if name in GL2UV:
-            uni = GL2UV[name]
-        elif (
-            name.startswith("uni")
-            and len(name) == 7
-            and all(c in hexes for c in name[3:])
-        ):
-            uni = int(name[3:], 16)
-        elif (
-            name.startswith("u")
-            and len(name) in (5, 7)
-            and all(c in hexes for c in name[1:])
-        ):
-            uni = int(name[1:], 16)
-        else:
+        uni = _unicodeForGlyphName(self.name)
+        if uni is None:
             return
         self.unicodes = [uni]
 
@@ -543,6 +1321,92 @@ class TGlyph(Glyph):
         self.endUndoGroup()
 
 
+class TemplateGlyph:
+    """
+    A stand-in for a template glyph of *layer*, for glyph order entries
+    that aren’t in the layer.
+
+    It holds just what glyph cells need to draw it and never changes.
+    :meth:`promote` adds the actual template glyph to the layer, which
+    cell views do before handing it out to be edited.
+    """
+
+    __slots__ = ("name", "_layer", "_representations")
+
+    dirty = False
+    markColor = None
+    representationFactories = TGlyph.representationFactories
+    template = True
+    width = 600
+
+    def __init__(self, name, layer):
+        self.name = name
+        self._layer = layer
+        self._representations = {}
+
+    def __repr__(self):
+        return "<{} {} ({})>".format(
+            self.__class__.__name__, self.name, self._layer.name
+        )
+
+    @property
+    def font(self):
+        return self._layer.font
+
+    @property
+    def layer(self):
+        return self._layer
+
+    @property
+    def unicode(self):
+        return _unicodeForGlyphName(self.name)
+
+    @property
+    def unicodes(self):
+        uni = self.unicode
+        if uni is None:
+            return []
+        return [uni]
+
+    def promote(self):
+        """
+        Returns the glyph of this name in the layer, adding a template
+        glyph if there is none.
+        """
+        layer = self._layer
+        if self.name in layer:
+            return layer[self.name]
+        return layer.get(self.name, asTemplate=True)
+
+    # templates have no outline
+
+    def draw(self, pen):
+        pass
+
+    def drawPoints(self, pointPen):
+        pass
+
+    # representations, made by the glyph factories
+
+    def getRepresentation(self, name, **kwargs):
+        key = (name, tuple(sorted(kwargs.items())))
+        representation = self._representations.get(key)
+        if representation is None:
+            factory = self.representationFactories[name]["factory"]
+            representation = self._representations[key] = factory(self, **kwargs)
+        return representation
+
+    def destroyRepresentation(self, name, **kwargs):
+        if kwargs:
+            self._representations.pop((name, tuple(sorted(kwargs.items()))), None)
+        else:
+            for key in [key for key in self._representations if key[0] == name]:
+                del self._representations[key]
+
+    def destroyAllRepresentations(self, notification=None):
+        self._representations.clear()
+
+
 class TKerning(Kerning):
     def find(self, firstGlyph, secondGlyph):
         first = firstGlyph.name
@@ -644,6 +1508,70 @@ class TGroups(Groups):
         return self._side2Groups.get(glyphName)
 
 
+class TUnicodeData(UnicodeData):
+    """
+    Unicode data that also covers the template glyphs of the font, i.e. the
+    glyph order entries that aren’t in the font (see :class:`TemplateGlyph`),
+    with the unicode their name stands for.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._templateGlyphOrder = None
+        self._templateUnicodes = {}
+        self._templateCmap = {}
+        self._templatesHeld = False
+        super().__init__(*args, **kwargs)
+
+    def _updateTemplates(self):
+        if self._templatesHeld:
+            return
+        font = self.font
+        glyphOrder = font.lib.get("public.glyphOrder") or []
+        if glyphOrder == self._templateGlyphOrder:
+            return
+        unicodes = {}
+        cmap = {}
+        for name in glyphOrder:
+            if name in unicodes:
+                continue
+            uni = _unicodeForGlyphName(name)
+            if uni is not None:
+                unicodes[name] = uni
+                cmap.setdefault(uni, name)
+        self._templateGlyphOrder = list(glyphOrder)
+        self._templateUnicodes = unicodes
+        self._templateCmap = cmap
+
+    def unicodeForGlyphName(self, glyphName):
+        font = self.font
+        if font is None or glyphName in font:
+            return super().unicodeForGlyphName(glyphName)
+        self._updateTemplates()
+        return self._templateUnicodes.get(glyphName)
+
+    def glyphNameForUnicode(self, value):
+        glyphName = super().glyphNameForUnicode(value)
+        font = self.font
+        if glyphName is None and font is not None:
+            self._updateTemplates()
+            glyphName = self._templateCmap.get(value)
+            if glyphName in font and value not in font[glyphName].unicodes:
+                # a glyph of the font that has other unicodes
+                glyphName = None
+        return glyphName
+
+    def sortGlyphNames(self, glyphNames, sortDescriptors=[dict(type="unicode")]):
+        # the glyph order doesn't change while sorting, no need to compare it
+        # on every lookup
+        if self.font is not None:
+            self._updateTemplates()
+        self._templatesHeld = True
+        try:
+            return super().sortGlyphNames(glyphNames, sortDescriptors)
+        finally:
+            self._templatesHeld = False
+
+
 class TContour(Contour):
     def __init__(self, *args, **kwargs):
         if "pointClass" not in kwargs:
@@ -787,6 +1715,16 @@ class TComponent(Component):
         doc="A boolean indicating the selected state of the component.",
     )
 
+    # the layer tells composite glyphs about changes to their base glyphs,
+    # see TLayer.compositeGlyphNames, rather than each component observing
+    # its base glyph
+
+    def beginSelfBaseGlyphNotificationObservation(self):
+        pass
+
+    def endSelfBaseGlyphNotificationObservation(self):
+        pass
+
     def scale(self, pt, center=(0, 0)):
         dx, dy = center
         x, y = pt
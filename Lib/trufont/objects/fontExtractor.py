@@ -0,0 +1,235 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from defcon import Font
+from fontTools.pens.boundsPen import ControlBoundsPen
+from fontTools.pens.recordingPen import RecordingPen, RecordingPointPen, replayRecording
+from fontTools.ttLib import TTFont
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# below this, starting the worker processes costs more than it saves
+_minGlyphCount = 2000
+
+
+def _extractGlyphRange(path, glyphNames):
+    # mirrors extractor.formats.opentype.extractOpenTypeGlyphs, but records
+    # the outlines instead of drawing them into defcon glyphs
+    source = TTFont(path)
+    vmtx = source.get("vmtx")
+    vorg = source.get("VORG")
+    isTTF = "glyf" in source
+    reversedMapping = source.get("cmap").buildReversed()
+    glyphSet = source.getGlyphSet()
+    records = []
+    for glyphName in glyphNames:
+        sourceGlyph = glyphSet[glyphName]
+        if isTTF:
+            pen = RecordingPointPen()
+            sourceGlyph.drawPoints(pen)
+        else:
+            pen = RecordingPen()
+            sourceGlyph.draw(pen)
+        height = verticalOrigin = None
+        if vmtx is not None and glyphName in vmtx.metrics:
+            height = vmtx[glyphName][0]
+            if vorg is not None:
+                if glyphName in vorg.VOriginRecords:
+                    verticalOrigin = vorg[glyphName]
+                else:
+                    verticalOrigin = vorg.defaultVertOriginY
+            else:
+                tsb = vmtx[glyphName][1]
+                boundsPen = ControlBoundsPen(glyphSet)
+                sourceGlyph.draw(boundsPen)
+                if boundsPen.bounds is not None:
+                    verticalOrigin = tsb + boundsPen.bounds[3]
+        unicodes = list(reversedMapping.get(glyphName, []))
+        records.append(
+            (glyphName, pen.value, sourceGlyph.width, height, verticalOrigin, unicodes)
+        )
+    source.close()
+    return records
+
+
+def _insertGlyphRecords(font, records, isTTF):
+    for glyphName, value, width, height, verticalOrigin, unicodes in records:
+        glyph = font.newGlyph(glyphName)
+        # like Layer.loadGlyph, so that contours are only built when accessed
+        glyph.disableNotifications()
+        glyph._isLoading = True
+        if isTTF:
+            pointPen = glyph.getPointPen()
+            for method, args, kwargs in value:
+                getattr(pointPen, method)(*args, **kwargs)
+        else:
+            replayRecording(value, glyph.getPen())
+        glyph.width = width
+        if height is not None:
+            glyph.height = height
+        if verticalOrigin is not None:
+            glyph.verticalOrigin = verticalOrigin
+        glyph._isLoading = False
+        glyph.enableNotifications()
+        # the layer tracks unicodes through notifications
+        glyph.unicodes = unicodes
+
+
+def extractGlyphs(path, font, fileFormat, maxWorkers=1):
+    """
+    Extracts the glyphs of the binary font at *path* into *font*.
+
+    If *maxWorkers* is more than 1, outlines of large fonts are converted
+    by a pool of up to that many processes. It only pays off with several
+    CPUs, the pool being slower on a single one. The result is the same as
+    that of extractor’s glyph extraction.
+
+    Returns False if *fileFormat* isn’t supported, in which case *font* is
+    left untouched.
+    """
+    if fileFormat != "OTF":
+        return False
+    source = TTFont(path)
+    isTTF = "glyf" in source
+    glyphNames = list(source.getGlyphSet().keys())
+    source.close()
+
+    if maxWorkers < 2 or len(glyphNames) < _minGlyphCount:
+        records = _extractGlyphRange(path, glyphNames)
+        _insertGlyphRecords(font, records, isTTF)
+    else:
+        # a few chunks per worker, so that they all finish around the same time
+        chunkSize = -(-len(glyphNames) // (maxWorkers * 4))
+        # don't fork a process that runs Qt
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(maxWorkers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_extractGlyphRange, path, glyphNames[i : i + chunkSize])
+                for i in range(0, len(glyphNames), chunkSize)
+            ]
+            # insert in order as chunks come in, while workers are busy
+            for future in futures:
+                _insertGlyphRecords(font, future.result(), isTTF)
+    # newer extractor versions read these along with the glyphs
+    from extractor.formats import opentype
+
+    extractUnicodeVariationSequences = getattr(
+        opentype, "extractUnicodeVariationSequences", None
+    )
+    if extractUnicodeVariationSequences is not None:
+        source = TTFont(path)
+        extractUnicodeVariationSequences(source, font)
+        source.close()
+    return True
+
+
+def fileStamp(path):
+    """
+    Returns the modification time and size of the file at *path*, or None
+    if it can’t be read.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def extractFont(path, font, fileFormat, maxWorkers=1):
+    """
+    Extracts the binary font at *path*, of format *fileFormat*, into *font*.
+    See :func:`extractGlyphs` for *maxWorkers*.
+    """
+    import extractor
+
+    if extractGlyphs(path, font, fileFormat, maxWorkers):
+        extractor.extractUFO(path, font, doGlyphs=False, format=fileFormat)
+    else:
+        extractor.extractUFO(path, font, format=fileFormat)
+
+
+class FontReextractor(QObject):
+    """
+    Reloads a font from the binary font it was extracted from.
+
+    The binary font is extracted again by a worker thread into a scratch
+    font, which is then merged into the font with :meth:`TFont.mergeFont`,
+    so that only glyphs and font data that differ are changed. If the file
+    didn’t change since it was extracted, only glyphs that were modified
+    are compared.
+
+    The *finished* signal yields a dict with what :meth:`TFont.mergeFont`
+    changed and the duration in seconds of the reload.
+    """
+
+    finished = pyqtSignal(dict)
+    failed = pyqtSignal(object)
+    _jobDone = pyqtSignal(object)
+
+    def __init__(self, font, parent=None):
+        super().__init__(parent)
+        self._font = font
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = None
+        self._stamp = None
+        self._startTime = None
+        self._jobDone.connect(self._finish)
+
+    def font(self):
+        return self._font
+
+    def isRunning(self):
+        return self._future is not None
+
+    def start(self):
+        if self._future is not None:
+            return
+        import extractor
+
+        path = self._font.binaryPath
+        self._startTime = time.monotonic()
+        # taken before reading, so that a write made meanwhile is seen next
+        # time
+        self._stamp = fileStamp(path)
+        fileFormat = extractor.extractFormat(path)
+        self._future = future = self._executor.submit(self._extract, path, fileFormat)
+        future.add_done_callback(self._jobDone.emit)
+
+    def _extract(self, path, fileFormat):
+        source = Font()
+        extractFont(path, source, fileFormat)
+        return source
+
+    def cancel(self):
+        """
+        Drops the running reload, if any. The worker thread can’t be
+        interrupted and finishes in the background.
+        """
+        if self._future is not None:
+            self._future = None
+        self._executor.shutdown(wait=False)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _finish(self, future):
+        if future is not self._future:
+            return
+        self._future = None
+        try:
+            source = future.result()
+        except Exception as e:
+            self.failed.emit(e)
+            return
+        font = self._font
+        # glyphs that weren't touched still match an unchanged file
+        glyphNames = None
+        if self._stamp is not None and self._stamp == font.binaryStamp:
+            glyphNames = {glyph.name for glyph in font if glyph.dirty}
+        changes = font.mergeFont(source, glyphNames)
+        font.binaryStamp = self._stamp
+        changes["duration"] = time.monotonic() - self._startTime
+        self.finished.emit(changes)
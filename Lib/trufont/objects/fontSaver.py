@@ -0,0 +1,459 @@
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fontTools.misc import plistlib
+from fontTools.pens.recordingPen import RecordingPointPen
+from fontTools.ufoLib import (
+    fontInfoAttributesVersion3ValueData,
+    validateInfoVersion3Data,
+)
+from fontTools.ufoLib.glifLib import validateLayerInfoVersion3Data, writeGlyphToString
+from fontTools.ufoLib.validators import (
+    fontLibValidator,
+    groupsValidator,
+    kerningValidator,
+)
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+from trufont.objects.defcon import fontFiles
+from trufont.objects.glyphLoader import GlyphRecord
+
+
+def _samePath(path1, path2):
+    return os.path.normcase(os.path.realpath(path1)) == os.path.normcase(
+        os.path.realpath(path2)
+    )
+
+
+def _copyPlistObject(value):
+    # plain containers only, so that the copy can be serialized off the GUI
+    # thread and doesn't drag defcon objects along
+    if isinstance(value, dict):
+        return {key: _copyPlistObject(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_copyPlistObject(item) for item in value]
+    return value
+
+
+def _readLayerContents(path):
+    layerContentsPath = os.path.join(path, "layercontents.plist")
+    try:
+        with open(layerContentsPath, "rb") as file:
+            return plistlib.load(file)
+    except Exception:
+        return None
+
+
+def _glyphRecord(glyph):
+    record = GlyphRecord()
+    record.width = glyph.width
+    record.height = glyph.height
+    record.unicodes = list(glyph.unicodes)
+    record.note = glyph.note
+    record.lib = _copyPlistObject(glyph.lib)
+    record.anchors = [dict(anchor) for anchor in glyph.anchors]
+    record.guidelines = [dict(guideline) for guideline in glyph.guidelines]
+    if glyph.image.fileName is not None:
+        record.image = {
+            key: value for key, value in glyph.image.items() if value is not None
+        }
+    pen = RecordingPointPen()
+    glyph.drawPoints(pen)
+    record.points = pen.value
+    return record
+
+
+def _fontFileData(font, attr):
+    if attr == "info":
+        data = {}
+        for name in fontInfoAttributesVersion3ValueData.keys():
+            value = getattr(font.info, name, None)
+            if value is None:
+                continue
+            if name == "guidelines":
+                value = [dict(guideline) for guideline in value]
+            data[name] = _copyPlistObject(value)
+        return data
+    if attr == "groups":
+        return {name: list(glyphNames) for name, glyphNames in font.groups.items()}
+    if attr == "kerning":
+        data = {}
+        for (first, second), value in font.kerning.items():
+            data.setdefault(first, {})[second] = value
+        return data
+    if attr == "lib":
+        return _copyPlistObject(font.lib)
+    return font.features.text
+
+
+def _layerInfoData(layer):
+    data = {}
+    if layer.color is not None:
+        data["color"] = str(layer.color)
+    lib = _copyPlistObject(layer.lib)
+    if lib:
+        data["lib"] = lib
+    return data
+
+
+def _validateFontFileData(attr, data):
+    if attr == "info":
+        validateInfoVersion3Data(data)
+        return
+    if attr == "features":
+        if data is not None and not isinstance(data, str):
+            raise ValueError("The features are not text.")
+        return
+    validator = dict(
+        groups=groupsValidator, kerning=kerningValidator, lib=fontLibValidator
+    )[attr]
+    valid, message = validator(data)
+    if not valid:
+        raise ValueError(message)
+
+
+def _writeFile(path, data):
+    """
+    Writes *data* to *path* through a temporary file in the same folder that
+    replaces the destination once complete, so that a crash midway never
+    leaves a truncated file behind.
+
+    Returns False, without touching the file, if it already holds *data*.
+    """
+    try:
+        with open(path, "rb") as file:
+            if file.read() == data:
+                return False
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+    directory, fileName = os.path.split(path)
+    fd, tempPath = tempfile.mkstemp(prefix=f".{fileName}-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tempPath, mode)
+        os.replace(tempPath, path)
+    except BaseException:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
+    return True
+
+
+def _removeFile(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+# font files that ufoLib doesn't write when they would be empty
+_optionalFileNames = frozenset(
+    ("groups.plist", "kerning.plist", "lib.plist", "features.fea")
+)
+
+
+class _SaveJob:
+    """
+    A snapshot of everything a save needs to write, taken on the GUI thread.
+
+    It only holds plain data, so that it can be serialized and written by
+    the worker thread while the font keeps changing.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.validate = True
+        # (attr, fileName, data)
+        self.fontFiles = []
+        # (layer, layerPath, contents, glyphs, deletedGlyphNames, layerInfo)
+        # glyphs are (glyph, glyphName, fileName, record) and contents is None when the
+        # layer’s glyph names are unchanged
+        self.layers = []
+        # filled by the worker
+        self.glyphData = []
+        self.fileCount = 0
+        self.byteCount = 0
+        self.removedCount = 0
+
+    def _write(self, path, data):
+        if _writeFile(path, data):
+            self.fileCount += 1
+            self.byteCount += len(data)
+
+    def _remove(self, path):
+        if _removeFile(path):
+            self.removedCount += 1
+
+    def run(self):
+        validate = self.validate
+        for attr, fileName, data in self.fontFiles:
+            path = os.path.join(self.path, fileName)
+            if validate:
+                _validateFontFileData(attr, data)
+            if not data and fileName in _optionalFileNames:
+                self._remove(path)
+            elif attr == "features":
+                self._write(path, data.encode("utf-8"))
+            else:
+                self._write(path, plistlib.dumps(data))
+        for layer, layerPath, contents, glyphs, deletedGlyphNames, info in self.layers:
+            for glyph, glyphName, fileName, record in glyphs:
+                text = writeGlyphToString(
+                    glyphName, record, record.drawPoints, 2, validate
+                )
+                data = text.encode("utf-8")
+                self._write(os.path.join(layerPath, fileName), data)
+                self.glyphData.append((glyph, glyphName, data))
+            # reference new files only once they are there, and drop old ones
+            # only once they aren't referenced anymore
+            if contents is not None:
+                self._write(
+                    os.path.join(layerPath, "contents.plist"), plistlib.dumps(contents)
+                )
+            for fileName in deletedGlyphNames.values():
+                self._remove(os.path.join(layerPath, fileName))
+            if info is not None:
+                path = os.path.join(layerPath, "layerinfo.plist")
+                if info:
+                    if validate:
+                        info = validateLayerInfoVersion3Data(info)
+                    self._write(path, plistlib.dumps(info))
+                else:
+                    self._remove(path)
+        if self.fileCount or self.removedCount:
+            os.utime(self.path)
+        return self
+
+
+class FontSaver(QObject):
+    """
+    Saves a font in the background, writing only what changed since the
+    last save.
+
+    The dirty glyphs, layers and font files are snapshotted on the GUI
+    thread, then serialized and written by a worker thread. Each file is
+    written to a temporary file first and moved into place, and files whose
+    content didn’t change are left alone.
+
+    Saves that can’t be done in place (a new path or format version, layer
+    changes, images or data files) go through the regular synchronous
+    :meth:`TFont.save`.
+
+    The *saved* signal yields a dict with the path, number of files written,
+    bytes written, files removed and duration in seconds of each save. The
+    counts are None after a full save.
+    """
+
+    saved = pyqtSignal(dict)
+    failed = pyqtSignal(object)
+    _jobDone = pyqtSignal(object)
+
+    def __init__(self, font, parent=None):
+        super().__init__(parent)
+        self._font = font
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = None
+        self._job = None
+        self._startTime = None
+        self._jobDone.connect(self._finish)
+
+    def font(self):
+        return self._font
+
+    def isRunning(self):
+        return self._future is not None
+
+    def canSaveIncrementally(self, path=None, formatVersion=None):
+        """
+        Returns whether saving to *path* with *formatVersion* only needs to
+        write what changed.
+        """
+        font = self._font
+        if font.path is None or not os.path.isdir(font.path):
+            return False
+        if path is not None and not _samePath(path, font.path):
+            return False
+        # defcon 0.7 only has the integer version
+        version = getattr(font, "ufoFormatVersionTuple", None)
+        version = version[0] if version is not None else font.ufoFormatVersion
+        if version != 3 or formatVersion not in (None, 3):
+            return False
+        if font.images.dirty or font.data.dirty:
+            return False
+        layers = font.layers
+        # layers that were added or made default are checked against the disk
+        # below, but renames and deletions need the full save
+        for action in layers._layerActionHistory:
+            if action["action"] in ("delete", "rename"):
+                return False
+        layerContents = _readLayerContents(font.path)
+        if layerContents is None:
+            return False
+        if [name for name, _ in layerContents] != layers.layerOrder:
+            return False
+        defaultLayerName = layers.defaultLayer.name
+        for name, directory in layerContents:
+            if (directory == "glyphs") != (name == defaultLayerName):
+                return False
+            if layers[name].glyphSet() is None:
+                return False
+        return True
+
+    def save(self, path=None, formatVersion=None):
+        """
+        Saves the font to *path*, in the background if possible.
+
+        A save that is still running is waited upon first.
+        """
+        self.wait()
+        font = self._font
+        if not self.canSaveIncrementally(path, formatVersion):
+            start = time.monotonic()
+            try:
+                font.save(path, formatVersion)
+            except Exception as e:
+                # the font posted fontWillSave, let watchers resume
+                app = QApplication.instance()
+                data = dict(font=font, path=path or font.path)
+                app.postNotification("fontSaveFailed", data)
+                self.failed.emit(e)
+                return
+            stats = dict(
+                path=font.path,
+                files=None,
+                bytes=None,
+                removed=None,
+                duration=time.monotonic() - start,
+            )
+            self.saved.emit(stats)
+            return
+        self._startTime = time.monotonic()
+        app = QApplication.instance()
+        data = dict(font=font, path=font.path)
+        app.postNotification("fontWillSave", data)
+        self._job = job = self._snapshot()
+        self._future = future = self._executor.submit(job.run)
+        future.add_done_callback(self._jobDone.emit)
+
+    def wait(self):
+        """
+        Blocks until the running save, if any, is complete.
+        """
+        future = self._future
+        if future is None:
+            return
+        try:
+            future.result()
+        except Exception:
+            pass
+        self._finish(future)
+
+    def shutdown(self):
+        self.wait()
+        self._executor.shutdown()
+
+    def _snapshot(self):
+        font = self._font
+        job = _SaveJob(font.path)
+        job.validate = font.ufoLibWriteValidate
+        layerContents = dict(_readLayerContents(font.path))
+        for layerName in font.layers.layerOrder:
+            layer = font.layers[layerName]
+            glyphSet = layer.glyphSet()
+            contents = dict(glyphSet.contents)
+            deletedGlyphNames = {}
+            for glyphName in layer.deletedGlyphNames():
+                if glyphName in contents:
+                    deletedGlyphNames[glyphName] = contents.pop(glyphName)
+            existing = None
+            glyphs = []
+            for glyph in layer.dirtyGlyphs():
+                fileName = contents.get(glyph.name)
+                if fileName is None:
+                    if existing is None:
+                        existing = {name.lower() for name in contents.values()}
+                    fileName = glyphSet.glyphNameToFileName(glyph.name, existing)
+                    existing.add(fileName.lower())
+                    contents[glyph.name] = fileName
+                glyphs.append((glyph, glyph.name, fileName, _glyphRecord(glyph)))
+            if contents == glyphSet.contents:
+                contents = None
+            info = _layerInfoData(layer) if layer.dirty else None
+            if glyphs or deletedGlyphNames or info is not None:
+                layerPath = os.path.join(font.path, layerContents[layerName])
+                job.layers.append(
+                    (layer, layerPath, contents, glyphs, deletedGlyphNames, info)
+                )
+        for attr, fileName in fontFiles:
+            # don't load what hasn't been touched
+            obj = getattr(font, "_" + attr)
+            if obj is not None and obj.dirty:
+                job.fontFiles.append((attr, fileName, _fontFileData(font, attr)))
+        # whatever changes from now on will be part of the next save
+        for layer, _, _, glyphs, _, _ in job.layers:
+            for glyph, _, _, _ in glyphs:
+                glyph.dirty = False
+        for layer in font.layers:
+            layer.dirty = False
+        for attr, _, _ in job.fontFiles:
+            getattr(font, attr).dirty = False
+        font.layers.dirty = False
+        font.dirty = False
+        return job
+
+    def _finish(self, future):
+        if future is not self._future:
+            return
+        job = self._job
+        self._future = self._job = None
+        font = self._font
+        try:
+            future.result()
+        except Exception as e:
+            # we don’t know what made it to disk, so write it all again next
+            # time
+            for layer, _, _, glyphs, _, info in job.layers:
+                for glyph, _, _, _ in glyphs:
+                    glyph.dirty = True
+                if info is not None:
+                    layer.dirty = True
+            for attr, _, _ in job.fontFiles:
+                getattr(font, attr).dirty = True
+            font.dirty = True
+            app = QApplication.instance()
+            data = dict(font=font, path=job.path)
+            app.postNotification("fontSaveFailed", data)
+            self.failed.emit(e)
+            return
+        glyphData = job.glyphData
+        for layer, _, contents, glyphs, deletedGlyphNames, info in job.layers:
+            layer.glyphsSaved(
+                glyphData[: len(glyphs)],
+                deletedGlyphNames,
+                contentsChanged=contents is not None,
+            )
+            del glyphData[: len(glyphs)]
+            if info is not None:
+                font.layers._stampLayerInfoDataState(layer)
+        for attr, _, _ in job.fontFiles:
+            stamp = getattr(font, "_stamp%sDataState" % attr.capitalize())
+            stamp()
+        stats = dict(
+            path=job.path,
+            files=job.fileCount,
+            bytes=job.byteCount,
+            removed=job.removedCount,
+            duration=time.monotonic() - self._startTime,
+        )
+        app = QApplication.instance()
+        data = dict(font=font, path=job.path, stats=stats)
+        app.postNotification("fontSaved", data)
+        self.saved.emit(stats)
@@ -0,0 +1,208 @@
+import os
+import time
+
+from fontTools.ufoLib import UFOReader
+from PyQt5.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+from trufont.objects.defcon import fontFiles
+from trufont.objects.glyphCache import glyphSetDirectory
+
+# files watched in each glyph set folder
+_layerFiles = ("contents.plist", "layerinfo.plist")
+
+# quiet time before looking at the disk, in ms
+_debounceInterval = 500
+# don't let a steady stream of writes hold off the check any longer, in s
+_maxDelay = 5
+
+
+class FontWatcher(QObject):
+    """
+    Watches the UFO of a font for changes made by other applications, and
+    works out which font files and glyphs they affect.
+
+    The UFO folder, glyph set folders and metadata files are watched by the
+    system. Bursts of writes, e.g. from a git checkout, are coalesced into
+    one check once the folder has been quiet for a little while. The check
+    compares the files against what the font read from them, so saves made
+    by the application itself go unreported. GLIF files written over in
+    place don't notify the folder they’re in, but they're picked up by the
+    next check: call :meth:`scheduleCheck` to have one, for instance when
+    the application is activated, or on filesystems that don't report
+    changes.
+
+    Changes are reported through the *changed* signal and a
+    ``fontChangedExternally`` notification, in the format of
+    :meth:`externalChanges`. The same changes aren't reported twice in a
+    row, so that changes that are left alone don't keep coming back.
+    """
+
+    changed = pyqtSignal(dict)
+
+    def __init__(self, font, parent=None):
+        super().__init__(parent)
+        self._font = font
+        self._path = None
+        self._saving = False
+        self._lastChanges = None
+        self._firstEventTime = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._pathChanged)
+        self._watcher.fileChanged.connect(self._pathChanged)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(_debounceInterval)
+        self._timer.timeout.connect(self.check)
+        app = QApplication.instance()
+        app.dispatcher.addObserver(self, "_fontWillSave", "fontWillSave")
+        app.dispatcher.addObserver(self, "_fontSaved", "fontSaved")
+        app.dispatcher.addObserver(self, "_fontSaved", "fontSaveFailed")
+        self._watchPaths()
+
+    def font(self):
+        return self._font
+
+    def watchedPaths(self):
+        return self._watcher.directories() + self._watcher.files()
+
+    def shutdown(self):
+        self._timer.stop()
+        app = QApplication.instance()
+        app.dispatcher.removeObserver(self, "fontWillSave")
+        app.dispatcher.removeObserver(self, "fontSaved")
+        app.dispatcher.removeObserver(self, "fontSaveFailed")
+        self._unwatchPaths()
+
+    def _watchPaths(self):
+        self._unwatchPaths()
+        font = self._font
+        self._path = path = font.path
+        if path is None or not os.path.isdir(path):
+            return
+        paths = [path]
+        for fileName in ("metainfo.plist", "layercontents.plist"):
+            paths.append(os.path.join(path, fileName))
+        for _, fileName in fontFiles:
+            paths.append(os.path.join(path, fileName))
+        for layer in font.layers:
+            glyphSet = layer.glyphSet()
+            if glyphSet is None:
+                continue
+            directory = glyphSetDirectory(glyphSet)
+            if directory is None:
+                continue
+            paths.append(directory)
+            for fileName in _layerFiles:
+                paths.append(os.path.join(directory, fileName))
+        paths = [path for path in paths if os.path.exists(path)]
+        self._watcher.addPaths(paths)
+
+    def _unwatchPaths(self):
+        paths = self.watchedPaths()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    # ------------
+    # Notification
+    # ------------
+
+    def _pathChanged(self, path):
+        now = time.monotonic()
+        if not self._timer.isActive():
+            self._firstEventTime = now
+        elif now - self._firstEventTime > _maxDelay:
+            return
+        self._timer.start()
+
+    def _fontWillSave(self, notification):
+        if notification.data["font"] is not self._font:
+            return
+        self._saving = True
+        self._timer.stop()
+
+    def _fontSaved(self, notification):
+        if notification.data["font"] is not self._font:
+            return
+        self._saving = False
+        # the save may have been made elsewhere, and writes files that
+        # weren't watched yet
+        self._watchPaths()
+
+    # -----
+    # Check
+    # -----
+
+    def scheduleCheck(self):
+        """
+        Has the UFO checked for changes shortly.
+        """
+        if not self._timer.isActive():
+            self._firstEventTime = time.monotonic()
+        self._timer.start()
+
+    def check(self):
+        """
+        Looks for changes made to the UFO right away, and reports them if
+        there are any.
+        """
+        self._timer.stop()
+        # files are stamped once the save is done
+        if self._saving:
+            return
+        font = self._font
+        if font.path != self._path:
+            self._watchPaths()
+        changes = self.externalChanges()
+        # files moved into place are new files to the system
+        self._watchPaths()
+        if not changes["fontFiles"] and not changes["layers"]:
+            self._lastChanges = None
+            return
+        if changes == self._lastChanges:
+            return
+        self._lastChanges = changes
+        self.changed.emit(changes)
+        app = QApplication.instance()
+        data = dict(font=font, **changes)
+        app.postNotification("fontChangedExternally", data)
+
+    def externalChanges(self):
+        """
+        Returns the changes made to the UFO since the font read it, as a
+        dictionary::
+
+            {
+                "fontFiles": ["kerning.plist", ...],
+                "layers": {
+                    "layer name": {
+                        "added": ["glyph name", ...],
+                        "modified": [...],
+                        "deleted": [...],
+                    },
+                },
+            }
+
+        Only font files and glyphs that were loaded can be modified, and only
+        layers with changes are listed.
+        """
+        font = self._font
+        changes = dict(fontFiles=[], layers={})
+        if font.path is None or not os.path.isdir(font.path):
+            return changes
+        with UFOReader(font.path, validate=False) as reader:
+            for attr, fileName in fontFiles:
+                obj = getattr(font, "_" + attr)
+                if obj is None:
+                    continue
+                if font._testFontDataForExternalModifications(obj, fileName, reader):
+                    changes["fontFiles"].append(fileName)
+        for layer in font.layers:
+            added, modified, deleted = layer.externalChanges()
+            if added or modified or deleted:
+                changes["layers"][layer.name] = dict(
+                    added=sorted(added),
+                    modified=sorted(modified),
+                    deleted=sorted(deleted),
+                )
+        return changes
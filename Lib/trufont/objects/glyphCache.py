@@ -0,0 +1,245 @@
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+from PyQt5.QtCore import QStandardPaths
+
+from trufont.objects.glyphLoader import GlyphRecord
+
+# bump whenever the layout of the file or of its entries changes
+_version = 1
+# magic, version, marshal version, index offset
+_header = struct.Struct("<4sHHQ")
+_magic = b"TFGC"
+
+_recordAttrs = tuple(attr for attr in GlyphRecord.__slots__ if attr != "text")
+
+
+def defaultCacheDirectory():
+    """
+    Returns the folder glyph caches are kept in by default.
+    """
+    location = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+    return os.path.join(location, "glyphs")
+
+
+def glyphSetDirectory(glyphSet):
+    """
+    Returns the folder of *glyphSet* on disk, or None if it doesn't live
+    in a folder (e.g. zipped UFOs).
+    """
+    try:
+        return glyphSet.fs.getsyspath("")
+    except Exception:
+        return None
+
+
+def _encodeRecord(record):
+    data = {}
+    for attr in _recordAttrs:
+        if hasattr(record, attr):
+            data[attr] = getattr(record, attr)
+    return marshal.dumps(data)
+
+
+def _decodeRecord(data):
+    record = GlyphRecord()
+    for attr, value in marshal.loads(data).items():
+        setattr(record, attr, value)
+    # the GLIF source isn't kept, only its parsed content
+    record.text = None
+    return record
+
+
+class GlyphCache:
+    """
+    A sidecar file that holds the parsed GLIF files of a glyph set folder,
+    so that reopening a font doesn't go through the XML parser for glyphs
+    whose file didn't change.
+
+    Entries are marshalled :class:`GlyphRecord` attributes, keyed by glyph
+    name and checked against the file name, modification time and size of
+    the GLIF file. The cache file is memory-mapped and entries are decoded
+    only when requested. A cache written by another format version is
+    ignored.
+
+    Entries may be read and added from several threads.
+    """
+
+    def __init__(self, path, directory):
+        self._path = path
+        self._directory = directory
+        self._lock = threading.Lock()
+        self._file = None
+        self._mmap = None
+        # glyphName: (key, offset, length)
+        self._index = {}
+        # glyphName: (key, data)
+        self._entries = {}
+        self._read()
+
+    @classmethod
+    def forGlyphSet(cls, glyphSet, cacheDirectory=None):
+        """
+        Returns the cache of *glyphSet*, stored in *cacheDirectory* (which
+        defaults to :func:`defaultCacheDirectory`), or None if the glyph set
+        can’t be cached.
+        """
+        directory = glyphSetDirectory(glyphSet)
+        if directory is None:
+            return None
+        if cacheDirectory is None:
+            cacheDirectory = defaultCacheDirectory()
+        directory = os.path.realpath(directory)
+        digest = hashlib.sha1(os.fsencode(directory)).hexdigest()
+        path = os.path.join(cacheDirectory, f"{digest}.glyphcache")
+        return cls(path, directory)
+
+    def path(self):
+        return self._path
+
+    def directory(self):
+        return self._directory
+
+    def isModified(self):
+        return bool(self._entries)
+
+    def __len__(self):
+        return len(self._index.keys() | self._entries.keys())
+
+    def _read(self):
+        try:
+            file = open(self._path, "rb")
+        except OSError:
+            return
+        try:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, marshalVersion, indexOffset = _header.unpack_from(buffer)
+            if (
+                magic != _magic
+                or version != _version
+                or marshalVersion != marshal.version
+            ):
+                raise ValueError("incompatible glyph cache")
+            index = marshal.loads(buffer[indexOffset:])
+        except Exception:
+            # missing, stale or corrupt: start over
+            file.close()
+            return
+        self._file = file
+        self._mmap = buffer
+        self._index = index
+
+    def fileKey(self, fileName):
+        """
+        Returns the key that identifies the current state of the GLIF file
+        *fileName*, or None if it can’t be read.
+        """
+        try:
+            stat = os.stat(os.path.join(self._directory, fileName))
+        except OSError:
+            return None
+        return (fileName, stat.st_mtime_ns, stat.st_size)
+
+    def get(self, glyphName, key):
+        """
+        Returns the cached :class:`GlyphRecord` of *glyphName*, or None if
+        there is none for the file state *key*.
+        """
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(glyphName)
+            if entry is not None:
+                if entry[0] != key:
+                    return None
+                data = entry[1]
+            else:
+                entry = self._index.get(glyphName)
+                if entry is None or entry[0] != key:
+                    return None
+                _, offset, length = entry
+                data = self._mmap[offset : offset + length]
+        try:
+            return _decodeRecord(data)
+        except Exception:
+            return None
+
+    def put(self, glyphName, key, record):
+        """
+        Stores *record* as the parsed content of *glyphName* for the file
+        state *key*.
+        """
+        if key is None:
+            return
+        try:
+            data = _encodeRecord(record)
+        except ValueError:
+            # e.g. dates in the glyph lib, which marshal doesn't handle
+            return
+        with self._lock:
+            self._entries[glyphName] = (key, data)
+
+    def save(self, glyphNames=None):
+        """
+        Writes the cache to disk, if it changed. Only entries for
+        *glyphNames* are kept, if given.
+        """
+        with self._lock:
+            if not self._entries:
+                return
+            if glyphNames is not None:
+                glyphNames = set(glyphNames)
+            chunks = []
+            index = {}
+            offset = _header.size
+            for glyphName, (key, offset_, length) in self._index.items():
+                if glyphName in self._entries:
+                    continue
+                if glyphNames is not None and glyphName not in glyphNames:
+                    continue
+                chunks.append(self._mmap[offset_ : offset_ + length])
+                index[glyphName] = (key, offset, length)
+                offset += length
+            for glyphName, (key, data) in self._entries.items():
+                if glyphNames is not None and glyphName not in glyphNames:
+                    continue
+                chunks.append(data)
+                index[glyphName] = (key, offset, len(data))
+                offset += len(data)
+            header = _header.pack(_magic, _version, marshal.version, offset)
+            chunks.insert(0, header)
+            chunks.append(marshal.dumps(index))
+            self._close()
+            self._index = {}
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            fd, tempPath = tempfile.mkstemp(
+                prefix=".glyphcache-", dir=os.path.dirname(self._path)
+            )
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.writelines(chunks)
+                os.replace(tempPath, self._path)
+            except BaseException:
+                if os.path.exists(tempPath):
+                    os.remove(tempPath)
+                raise
+            self._entries = {}
+        self._read()
+
+    def close(self):
+        with self._lock:
+            self._close()
+            self._index = {}
+
+    def _close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,223 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fontTools.pens.recordingPen import RecordingPointPen
+from fontTools.ufoLib.glifLib import readGlyphFromString
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+_glyphAttrs = (
+    "width",
+    "height",
+    "unicodes",
+    "note",
+    "lib",
+    "anchors",
+    "guidelines",
+    "image",
+)
+
+# number of glyphs parsed per worker job
+_chunkSize = 128
+# time spent inserting parsed glyphs per event loop iteration, in seconds
+_insertBudget = 0.012
+
+
+class GlyphRecord:
+    """
+    Holds the parsed content of a GLIF file, so that it can be loaded into a
+    glyph without going through the XML parser again.
+
+    Only the attributes found in the file are set.
+    """
+
+    __slots__ = _glyphAttrs + ("points", "text", "modTime")
+
+    def drawPoints(self, pointPen):
+        for method, args, kwargs in self.points:
+            getattr(pointPen, method)(*args, **kwargs)
+
+    def copyToGlyph(self, glyph):
+        for attr in _glyphAttrs:
+            if hasattr(self, attr):
+                setattr(glyph, attr, getattr(self, attr))
+        self.drawPoints(glyph.getPointPen())
+
+
+def readGlyphRecord(glyphSet, glyphName, validate=False, cache=None):
+    """
+    Reads and parses *glyphName* from *glyphSet* into a :class:`GlyphRecord`.
+
+    If a :class:`GlyphCache` is given, the record is taken from it when the
+    GLIF file didn't change, and added to it otherwise.
+
+    This doesn't touch any defcon object and may be called from a worker
+    thread.
+    """
+    if cache is not None:
+        key = cache.fileKey(glyphSet.contents[glyphName])
+        record = cache.get(glyphName, key)
+        if record is not None:
+            return record
+    record = GlyphRecord()
+    record.modTime = glyphSet.getGLIFModificationTime(glyphName)
+    record.text = glyphSet.getGLIF(glyphName)
+    pen = RecordingPointPen()
+    readGlyphFromString(record.text, record, pen, validate=validate)
+    record.points = pen.value
+    if cache is not None:
+        cache.put(glyphName, key, record)
+    return record
+
+
+def _readGlyphRecords(glyphSet, glyphNames, validate, cache):
+    records = []
+    for glyphName in glyphNames:
+        try:
+            record = readGlyphRecord(glyphSet, glyphName, validate, cache)
+        except Exception:
+            # leave it to the regular loading path to report the error
+            continue
+        records.append((glyphName, record))
+    return records
+
+
+class GlyphLoader(QObject):
+    """
+    Loads the glyphs of a font’s default layer in the background.
+
+    GLIF files are read and parsed by a pool of worker threads, and the
+    resulting records are inserted into the layer on the GUI thread in small
+    time slices, in glyph order. The *glyphsLoaded* signal yields the names
+    of the glyphs inserted during a time slice.
+
+    Glyphs requested before the loader reaches them are loaded synchronously
+    by the layer, as usual.
+    """
+
+    glyphsLoaded = pyqtSignal(list)
+    progressChanged = pyqtSignal(int, int)
+    finished = pyqtSignal()
+
+    def __init__(self, font, parent=None):
+        super().__init__(parent)
+        self._font = font
+        self._layer = font.layers.defaultLayer
+        self._executor = None
+        self._futures = []
+        self._records = []
+        self._pendingGlyphNames = set()
+        self._glyphCount = 0
+        self._loadedCount = 0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._insertRecords)
+
+    def font(self):
+        return self._font
+
+    def isRunning(self):
+        return self._executor is not None
+
+    def isPending(self, glyphName):
+        """
+        Returns whether *glyphName* is scheduled for loading and has not been
+        inserted in the layer yet.
+        """
+        return glyphName in self._pendingGlyphNames
+
+    def progress(self):
+        return self._loadedCount, self._glyphCount
+
+    def start(self):
+        if self.isRunning():
+            return
+        layer = self._layer
+        glyphSet = layer.glyphSet()
+        if glyphSet is None:
+            self.finished.emit()
+            return
+        # glyph order first, so that the top of the grid fills up first
+        glyphNames = []
+        for glyphName in self._font.glyphOrder:
+            if glyphName in layer and not layer.isGlyphLoaded(glyphName):
+                glyphNames.append(glyphName)
+        self._pendingGlyphNames = set(glyphNames)
+        for glyphName in sorted(layer.keys()):
+            if glyphName in self._pendingGlyphNames:
+                continue
+            if not layer.isGlyphLoaded(glyphName):
+                glyphNames.append(glyphName)
+                self._pendingGlyphNames.add(glyphName)
+        self._glyphCount = len(glyphNames)
+        self._loadedCount = 0
+        if not glyphNames:
+            self.finished.emit()
+            return
+
+        self._executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        validate = layer.ufoLibReadValidate
+        cache = layer.glyphCache()
+        for index in range(0, len(glyphNames), _chunkSize):
+            chunk = glyphNames[index : index + _chunkSize]
+            future = self._executor.submit(
+                _readGlyphRecords, glyphSet, chunk, validate, cache
+            )
+            self._futures.append(future)
+        self.progressChanged.emit(0, self._glyphCount)
+        self._timer.start()
+
+    def cancel(self):
+        if not self.isRunning():
+            return
+        self._timer.stop()
+        for future in self._futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self._futures = []
+        self._records = []
+        self._pendingGlyphNames = set()
+
+    def _insertRecords(self):
+        # collect chunks in order, so that cells fill from the top
+        while self._futures and self._futures[0].done():
+            future = self._futures.pop(0)
+            self._records.extend(future.result())
+        if not self._records:
+            if not self._futures:
+                self._finish()
+            return
+        layer = self._layer
+        pending = self._pendingGlyphNames
+        glyphNames = []
+        deadline = time.monotonic() + _insertBudget
+        index = 0
+        for glyphName, record in self._records:
+            index += 1
+            pending.discard(glyphName)
+            # the glyph may have been loaded on demand (or deleted) meanwhile
+            if glyphName in layer and not layer.isGlyphLoaded(glyphName):
+                layer.loadGlyph(glyphName, record)
+            glyphNames.append(glyphName)
+            if time.monotonic() > deadline:
+                break
+        del self._records[:index]
+        self._loadedCount += len(glyphNames)
+        self.glyphsLoaded.emit(glyphNames)
+        self.progressChanged.emit(self._loadedCount, self._glyphCount)
+        if not self._records and not self._futures:
+            self._finish()
+
+    def _finish(self):
+        self._timer.stop()
+        if self._executor is not None:
+            layer = self._layer
+            cache = layer.glyphCache()
+            if cache is not None and cache.isModified():
+                self._executor.submit(cache.save, list(layer.glyphSet().contents))
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        # glyphs that failed to parse are left to the layer
+        self._pendingGlyphNames = set()
+        self.finished.emit()
@@ -0,0 +1,73 @@
+class GlyphOrderIndex:
+    """
+    A glyph order, along with the position of each of its glyph names.
+
+    Membership tests and :meth:`index` are dict lookups rather than scans
+    of the glyph order list. A name that’s in the order more than once maps
+    to its first position, like with list.index().
+
+    :meth:`update` only indexes the names that were appended to the order,
+    which is how glyphs added to a font change it. The index keeps its own
+    copy of the order, so that changes made in place to the list it was
+    updated from are seen by :meth:`isCurrent`.
+    """
+
+    def __init__(self, glyphNames=None):
+        self._glyphNames = []
+        self._positions = {}
+        self.update(glyphNames)
+
+    def __contains__(self, glyphName):
+        return glyphName in self._positions
+
+    def __iter__(self):
+        return iter(self._glyphNames)
+
+    def __len__(self):
+        return len(self._glyphNames)
+
+    def glyphNames(self):
+        """
+        Returns a copy of the glyph order.
+        """
+        return list(self._glyphNames)
+
+    def index(self, glyphName):
+        """
+        Returns the position of *glyphName* in the glyph order. Raises
+        ValueError if it isn’t there.
+        """
+        try:
+            return self._positions[glyphName]
+        except KeyError:
+            raise ValueError(f"{glyphName!r} is not in the glyph order")
+
+    def isCurrent(self, glyphNames):
+        """
+        Returns whether the index matches the glyph order *glyphNames*.
+        """
+        if glyphNames is None:
+            glyphNames = []
+        oldGlyphNames = self._glyphNames
+        # cheap checks first, edits usually change the length or the end
+        if len(glyphNames) != len(oldGlyphNames):
+            return False
+        if glyphNames and glyphNames[-1] != oldGlyphNames[-1]:
+            return False
+        return glyphNames == oldGlyphNames
+
+    def update(self, glyphNames):
+        """
+        Updates the index to the glyph order *glyphNames*.
+        """
+        if glyphNames is None:
+            glyphNames = []
+        oldGlyphNames = self._glyphNames
+        count = len(oldGlyphNames)
+        positions = self._positions
+        if len(glyphNames) < count or glyphNames[:count] != oldGlyphNames:
+            count = 0
+            positions.clear()
+        for index in range(count, len(glyphNames)):
+            positions.setdefault(glyphNames[index], index)
+        self._glyphNames = list(glyphNames)
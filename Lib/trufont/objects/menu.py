@@ -159,6 +159,7 @@ class Entries:
     Window_Scripting = "&Scripting"
     Window_Properties = "&Properties"
     Window_Output = "&Output"
+    Window_Representation_Cache = "&Representation Cache"
 
     Help = "&Help"
     Help_Documentation = "&Documentation"
@@ -287,6 +288,7 @@ def globalMenuBar():
     windowMenu.fetchAction(Entries.Window_Properties)
     windowMenu.addSeparator()
     windowMenu.fetchAction(Entries.Window_Output)
+    windowMenu.fetchAction(Entries.Window_Representation_Cache)
 
     helpMenu = menuBar.fetchMenu(Entries.Help)
     helpMenu.fetchAction(Entries.Help_Documentation)
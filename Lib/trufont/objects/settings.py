@@ -223,6 +223,9 @@ _fallbackValues = {
     "fontWindow/glyphCellSize": 86,
     "fontWindow/propertiesHidden": False,
     "metricsWindow/comboBoxItems": _metricsWindowComboBoxItems,
+    "misc/cacheParsedGlyphs": True,
+    "misc/glyphCellCacheSize": 256,
+    "misc/loadGlyphsInBackground": True,
     "misc/loadRecentFile": False,
     "outputWindow/wrapLines": False,
     "scriptingWindow/hSplitterSizes": [0, 1],
@@ -519,6 +522,30 @@ def setLoadRecentFile(value):
     setValue("misc/loadRecentFile", value)
 
 
+def loadGlyphsInBackground():
+    return value("misc/loadGlyphsInBackground")
+
+
+def setLoadGlyphsInBackground(value):
+    setValue("misc/loadGlyphsInBackground", value)
+
+
+def cacheParsedGlyphs():
+    return value("misc/cacheParsedGlyphs")
+
+
+def setCacheParsedGlyphs(value):
+    setValue("misc/cacheParsedGlyphs", value)
+
+
+def glyphCellCacheSize():
+    return value("misc/glyphCellCacheSize")
+
+
+def setGlyphCellCacheSize(value):
+    setValue("misc/glyphCellCacheSize", value)
+
+
 def recentFiles():
     return value("core/recentFiles", [], type=list)
 
@@ -21,6 +21,10 @@ del n
 del tr
 
 
+def isUndoableNotification(name):
+    return name in _valueNotifications or name in _contentNotifications
+
+
 def _attrForNotification(name):
     attr = name[6:-7].lower()
     if attr == "contours":
@@ -75,12 +79,16 @@ class UndoManager(QObject):
     # undoTextChanged = pyqtSignal(str)
     # redoTextChanged = pyqtSignal(str)
 
-    def __init__(self, glyph):
+    def __init__(self, glyph, baseline=None):
+        """
+        If given, *baseline* is a glyph holding the content of *glyph* prior
+        to its latest change, which then becomes the first undoable change.
+        """
         super().__init__()
         self._glyph = weakref.ref(glyph)
         self._init()
 
-        self._subscribeToGlyph()
+        self._subscribeToGlyph(baseline)
 
     def _init(self):
         self._undoStack = []
@@ -90,19 +98,23 @@ class UndoManager(QObject):
         self._stashedNotifications = dict()
         self._undoGroups = 0
 
-    def _subscribeToGlyph(self):
+    def _subscribeToGlyph(self, baseline=None):
         glyph = self.glyph
+        if baseline is None:
+            baseline = glyph
         for name in _valueNotifications.keys():
             glyph.addObserver(self, "_valueChanged", name)
         for name in _contentNotifications.keys():
             attr = _attrForNotification(name)
             data = None
             if attr == "_contours":
-                data = getattr(glyph, "_shallowLoadedContours", None)
+                data = getattr(baseline, "_shallowLoadedContours", None)
             elif attr == "image":
-                data = getattr(glyph, attr).getDataForSerialization()
+                data = getattr(baseline, attr).getDataForSerialization()
             if data is None:
-                data = [item.getDataForSerialization() for item in getattr(glyph, attr)]
+                data = [
+                    item.getDataForSerialization() for item in getattr(baseline, attr)
+                ]
             self._dumps[name] = pickle.dumps(data)
             glyph.addObserver(self, "_contentChanged", name)
 
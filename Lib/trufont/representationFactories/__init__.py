@@ -1,35 +1,60 @@
-from defcon import Component, Glyph, registerRepresentationFactory
+from defcon import Component, Glyph, Layer, registerRepresentationFactory
 
+from defconQt.tools.representationStats import instrumentedFactory
 from trufont.representationFactories.glyphCellFactory import TFGlyphCellFactory
 from trufont.representationFactories.glyphViewFactory import (
     ComponentQPainterPathFactory,
+    ComponentQPainterPathsFactory,
     FilterSelectionFactory,
+    OutlineSegmentsFactory,
+    PointSelectionFactory,
     SelectedComponentsQPainterPathFactory,
     SelectedContoursQPainterPathFactory,
     SplitLinesQPainterPathFactory,
 )
+from trufont.representationFactories.layerFactory import SortedGlyphNamesFactory
 
-# TODO: fine-tune the destructive notifications
 _glyphFactories = {
+    "TruFont.ComponentQPainterPaths": (
+        ComponentQPainterPathsFactory,
+        ("Glyph.ComponentsChanged", "Glyph.ComponentBaseGlyphDataChanged"),
+    ),
     "TruFont.SelectedComponentsQPainterPath": (
         SelectedComponentsQPainterPathFactory,
-        ("Glyph.Changed", "Glyph.SelectionChanged"),
+        (
+            "Glyph.ComponentsChanged",
+            "Glyph.ComponentBaseGlyphDataChanged",
+            "Glyph.SelectionChanged",
+        ),
     ),
     "TruFont.SplitLinesQPainterPath": (SplitLinesQPainterPathFactory, None),
     "TruFont.FilterSelection": (
         FilterSelectionFactory,
         ("Glyph.Changed", "Glyph.SelectionChanged"),
     ),
+    "TruFont.PointSelection": (
+        PointSelectionFactory,
+        ("Glyph.ContoursChanged", "Glyph.SelectionChanged"),
+    ),
+    "TruFont.OutlineSegments": (OutlineSegmentsFactory, ("Glyph.ContoursChanged",)),
     "TruFont.SelectedContoursQPainterPath": (
         SelectedContoursQPainterPathFactory,
-        ("Glyph.Changed", "Glyph.SelectionChanged"),
+        ("Glyph.ContoursChanged", "Glyph.SelectionChanged"),
     ),
     "TruFont.GlyphCell": (TFGlyphCellFactory, None),
 }
 _componentFactories = {
-    "TruFont.QPainterPath": (
-        ComponentQPainterPathFactory,
-        ("Component.Changed", "Component.BaseGlyphDataChanged"),
+    "TruFont.QPainterPath": (ComponentQPainterPathFactory, ("Component.Changed",))
+}
+_layerFactories = {
+    "TruFont.SortedGlyphNames": (
+        SortedGlyphNamesFactory,
+        (
+            "Layer.GlyphAdded",
+            "Layer.GlyphDeleted",
+            "Layer.GlyphNameChanged",
+            "Layer.GlyphUnicodesChanged",
+        ),
     )
 }
 
@@ -37,9 +62,22 @@ _componentFactories = {
 def registerAllFactories():
     for name, (factory, destructiveNotifications) in _glyphFactories.items():
         registerRepresentationFactory(
-            Glyph, name, factory, destructiveNotifications=destructiveNotifications
+            Glyph,
+            name,
+            instrumentedFactory(name, factory),
+            destructiveNotifications=destructiveNotifications,
         )
     for name, (factory, destructiveNotifications) in _componentFactories.items():
         registerRepresentationFactory(
-            Component, name, factory, destructiveNotifications=destructiveNotifications
+            Component,
+            name,
+            instrumentedFactory(name, factory),
+            destructiveNotifications=destructiveNotifications,
+        )
+    for name, (factory, destructiveNotifications) in _layerFactories.items():
+        registerRepresentationFactory(
+            Layer,
+            name,
+            instrumentedFactory(name, factory),
+            destructiveNotifications=destructiveNotifications,
         )
@@ -18,6 +18,7 @@ def TFGlyphCellFactory(
     drawHeader=None,
     drawMetrics=None,
     pixelRatio=1.0,
+    image=False,
 ):
     if drawHeader is None:
         drawHeader = height >= GlyphCellMinHeightForHeader
@@ -34,6 +35,8 @@ def TFGlyphCellFactory(
         drawMetrics=drawMetrics,
         pixelRatio=pixelRatio,
     )
+    if image:
+        return obj.getImage()
     return obj.getPixmap()
 
 
@@ -54,6 +57,10 @@ class TFGlyphCellFactoryDrawingController(GlyphCellFactoryDrawingController):
         if not self.glyph.template:
             super().drawCellVerticalMetrics(painter, rect)
 
+    def drawCellGlyph(self, painter):
+        if not self.glyph.template:
+            super().drawCellGlyph(painter)
+
     def drawCellForeground(self, painter, rect):
         if self.shouldDrawTemplate and self.glyph.template:
             painter.save()
@@ -1,7 +1,9 @@
 from fontTools.misc.transform import Transform
+from fontTools.pens.basePen import BasePen
 from fontTools.pens.qtPen import QtPen
 from fontTools.ufoLib.pointPen import PointToSegmentPen
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainterPath
 
 from defconQt.representationFactories.glyphViewFactory import OnlyComponentsQtPen
 
@@ -18,22 +20,34 @@ def _reverseEnumerate(seq):
 # -------------------
 
 
+def ComponentQPainterPathsFactory(glyph):
+    """
+    Returns the (path, origin) of each component of *glyph*, which don't
+    change with selection.
+    """
+    paths = []
+    for component in glyph.components:
+        pen = OnlyComponentsQtPen(glyph.layer)
+        component.drawPoints(PointToSegmentPen(pen))
+        t = Transform(*component.transformation)
+        paths.append((pen.path, t.transformPoint((0, 0))))
+    return paths
+
+
 def SelectedComponentsQPainterPathFactory(glyph):
-    pen = OnlyComponentsQtPen(glyph.layer)
-    pointPen = PointToSegmentPen(pen)
-    selectedPen = OnlyComponentsQtPen(glyph.layer)
-    selectedPointPen = PointToSegmentPen(selectedPen)
+    path = QPainterPath()
+    selectedPath = QPainterPath()
     originPts = []
-    for component in glyph.components:
+    componentPaths = glyph.getRepresentation("TruFont.ComponentQPainterPaths")
+    for component, (componentPath, origin) in zip(glyph.components, componentPaths):
         if component.selected:
-            component.drawPoints(selectedPointPen)
-            t = Transform(*component.transformation)
-            originPts.append(t.transformPoint((0, 0)))
+            selectedPath.addPath(componentPath)
+            originPts.append(origin)
         else:
-            component.drawPoints(pointPen)
-    pen.path.setFillRule(Qt.WindingFill)
-    selectedPen.path.setFillRule(Qt.WindingFill)
-    return (pen.path, selectedPen.path, originPts)
+            path.addPath(componentPath)
+    path.setFillRule(Qt.WindingFill)
+    selectedPath.setFillRule(Qt.WindingFill)
+    return (path, selectedPath, originPts)
 
 
 # --------------
@@ -122,9 +136,142 @@ def FilterSelectionFactory(glyph):
     return copyGlyph
 
 
+# ----------------------
+# selected contours path
+# ----------------------
+
+
+def PointSelectionFactory(glyph):
+    """
+    Returns the indexes of the selected points of *glyph*, counted across
+    its contours as in the defconQt.OutlineInformation representation.
+    """
+    selection = set()
+    index = 0
+    for contour in glyph:
+        for point in contour:
+            if getattr(point, "selected", False):
+                selection.add(index)
+            index += 1
+    return frozenset(selection)
+
+
+class SegmentRecordingPen(BasePen):
+    """
+    Records the QPainterPath calls that draw a segment, as QtPen makes them.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+        self.calls = []
+
+    def _moveTo(self, p):
+        pass
+
+    def _lineTo(self, p):
+        self.calls.append((QPainterPath.lineTo, p))
+
+    def _curveToOne(self, p1, p2, p3):
+        self.calls.append((QPainterPath.cubicTo, p1 + p2 + p3))
+
+    def _qCurveToOne(self, p1, p2):
+        self.calls.append((QPainterPath.quadTo, p1 + p2))
+
+
+def OutlineSegmentsFactory(glyph):
+    """
+    Returns the path of each contour of *glyph* and its segments, as
+    (endIndex, segmentType, endPoint, calls) tuples where endIndex is the
+    index of the segment’s on-curve point, counted like in
+    :func:`PointSelectionFactory`, and calls draw the segment from the
+    previous on-curve point.
+
+    Segments are ordered as in defcon’s Contour.segments.
+    """
+    contours = []
+    index = 0
+    for contour in glyph:
+        pen = QtPen(None)
+        contour.draw(pen)
+        segments = []
+        points = list(contour)
+        onCurves = [i for i, point in enumerate(points) if point.segmentType]
+        if onCurves:
+            previous = points[onCurves[-1]]
+            for i, pointIndex in enumerate(onCurves):
+                on = points[pointIndex]
+                if i:
+                    offCurves = points[onCurves[i - 1] + 1 : pointIndex]
+                else:
+                    # wraps around the start of the contour
+                    offCurves = points[onCurves[-1] + 1 :] + points[:pointIndex]
+                recordingPen = SegmentRecordingPen()
+                if on.segmentType != "move":
+                    recordingPen.moveTo((previous.x, previous.y))
+                    pts = [(point.x, point.y) for point in offCurves]
+                    pts.append((on.x, on.y))
+                    if on.segmentType == "qcurve":
+                        recordingPen.qCurveTo(*pts)
+                    elif on.segmentType == "curve":
+                        recordingPen.curveTo(*pts)
+                    else:
+                        recordingPen.lineTo(pts[-1])
+                segments.append(
+                    (
+                        index + pointIndex,
+                        on.segmentType,
+                        (on.x, on.y),
+                        recordingPen.calls,
+                    )
+                )
+                previous = on
+            if segments[0][1] != "move":
+                # like defcon, start closed contours after their first point
+                segments.append(segments.pop(0))
+        contours.append((pen.path, segments))
+        index += len(points)
+    return contours
+
+
 def SelectedContoursQPainterPathFactory(glyph):
-    copyGlyph = glyph.getRepresentation("TruFont.FilterSelection")
-    path = copyGlyph.getRepresentation("defconQt.NoComponentsQPainterPath")
+    """
+    Returns the path of the selected contours and segments of *glyph*, the
+    outline of the TruFont.FilterSelection representation.
+
+    It is made from the segments of the outline and the point selection,
+    so that only the latter is computed again when selection changes.
+    """
+    selection = glyph.getRepresentation("TruFont.PointSelection")
+    path = QPainterPath()
+    for contourPath, segments in glyph.getRepresentation("TruFont.OutlineSegments"):
+        selected = [segment[0] in selection for segment in segments]
+        # addPath() skips a lone move, which the segments draw below
+        if all(selected) and not contourPath.isEmpty():
+            path.addPath(contourPath)
+            continue
+        # start at the beginning of the last run of selected segments
+        lastRun = None
+        for i in range(len(segments) - 1, -1, -1):
+            if selected[i]:
+                lastRun = i
+            elif lastRun is not None:
+                break
+        if lastRun is None:
+            continue
+        shouldMoveTo = True
+        for i in range(lastRun, lastRun + len(segments)):
+            i %= len(segments)
+            if not selected[i]:
+                shouldMoveTo = True
+                continue
+            _, segmentType, endPoint, calls = segments[i]
+            if shouldMoveTo or segmentType == "move":
+                path.moveTo(*endPoint)
+                shouldMoveTo = False
+                continue
+            for method, args in calls:
+                method(path, *args)
+    path.setFillRule(Qt.WindingFill)
     return path
 
 
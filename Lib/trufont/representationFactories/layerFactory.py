@@ -0,0 +1,24 @@
+# ------------------
+# sorted glyph names
+# ------------------
+
+
+def SortedGlyphNamesFactory(layer, templates=False):
+    """
+    Returns a tuple of the glyph names of *layer*, in alphabetical order
+    (by unicode, with pseudo-unicodes for unencoded glyphs).
+
+    If *templates* is True, the glyph order entries of the font that aren’t
+    in *layer* are sorted along with them, as template glyphs.
+    """
+    glyphNames = layer.keys()
+    if templates:
+        glyphNames = list(dict.fromkeys(glyphNames))
+        glyphNames.extend(
+            name for name in layer.font.glyphOrderIndex if name not in layer
+        )
+    return tuple(
+        layer.unicodeData.sortGlyphNames(
+            glyphNames, [dict(type="alphabetical", allowPseudoUnicode=True)]
+        )
+    )
@@ -401,6 +401,12 @@ def drawGlyphPoints(
     notchColor = defaultColor("glyphContourStroke").lighter(200)
     # get the outline data
     outlineData = glyph.getRepresentation("defconQt.OutlineInformation")
+    if drawSelection and (
+        outlineData["onCurvePoints"] or outlineData["offCurvePoints"]
+    ):
+        selection = glyph.getRepresentation("TruFont.PointSelection")
+    else:
+        selection = frozenset()
     points = []
     handles = []
     # blue zones markers
@@ -426,7 +432,7 @@ def drawGlyphPoints(
                 x, y = point["point"]
                 # TODO: we could add a non-overlapping interval tree special
                 # cased for borders
-                selected = drawSelection and point.get("selected", False)
+                selected = point["index"] in selection
                 if selected:
                     size_ = selectedSize
                     snapSize_ = selectedSnapSize
@@ -482,7 +488,7 @@ def drawGlyphPoints(
                 notchPath.moveTo(x1, y1)
                 notchPath.lineTo(x2, y2)
             # points
-            selected = drawSelection and point.get("selected", False)
+            selected = point["index"] in selection
             if selected:
                 size_ = selectedSize
                 smoothSize_ = selectedSmoothSize
@@ -541,7 +547,7 @@ def drawGlyphPoints(
         selectedPath.setFillRule(Qt.WindingFill)
         for point in outlineData["offCurvePoints"]:
             x, y = point["point"]
-            selected = drawSelection and point.get("selected", False)
+            selected = point["index"] in selection
             if selected:
                 offSize_ = selectedOffSize
             else:
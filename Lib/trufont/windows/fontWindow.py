@@ -31,6 +31,10 @@ from trufont.controls.statusBar import StatusBar
 from trufont.controls.tabWidget import TabWidget
 from trufont.controls.toolBar import ToolBar
 from trufont.objects import settings
+from trufont.objects.defcon import TemplateGlyph
+from trufont.objects.fontExtractor import FontReextractor
+from trufont.objects.fontSaver import FontSaver
+from trufont.objects.fontWatcher import FontWatcher
 from trufont.objects.menu import Entries
 from trufont.tools import errorReports, platformSpecific
 from trufont.tools.uiMethods import deleteUISelection, removeUIGlyphElements
@@ -101,9 +105,15 @@ class PreviewEventFilter(QObject):
 
 
 class FontWindow(BaseWindow):
-    def __init__(self, font, parent=None):
+    def __init__(self, font, parent=None, glyphLoader=None):
         super().__init__(parent)
         self._font = None
+        self._glyphLoader = None
+        self._fontSaver = None
+        self._fontWatcher = None
+        self._fontReextractor = None
+        self._pendingGlyphIndexes = {}
+        self._templateGlyphs = {}
 
         self._infoWindow = None
         self._featuresWindow = None
@@ -143,8 +153,9 @@ class FontWindow(BaseWindow):
         self.statusBar.setMinimumSize(32)
         self.statusBar.setMaximumSize(128)
         self.statusBar.sizeChanged.connect(self._sizeChanged)
+        self.statusBar.progressCancelled.connect(self._glyphLoadingCancelled)
 
-        self.setFont_(font)
+        self.setFont_(font, glyphLoader)
 
         app = QApplication.instance()
         app.dispatcher.addObserver(
@@ -294,6 +305,7 @@ class FontWindow(BaseWindow):
         windowMenu.addSeparator()
         action = windowMenu.fetchAction(Entries.Window_Output)
         action.setEnabled(app.outputWindow is not None)
+        windowMenu.fetchAction(Entries.Window_Representation_Cache)
 
         helpMenu = menuBar.fetchMenu(Entries.Help)
         helpMenu.fetchAction(Entries.Help_Documentation)
@@ -310,15 +322,43 @@ class FontWindow(BaseWindow):
     def font_(self):
         return self._font
 
-    def setFont_(self, font):
+    def setFont_(self, font, glyphLoader=None):
+        """
+        Sets the font displayed by this window.
+
+        If *glyphLoader* is given, the window shows right away with
+        placeholder cells that fill in as the loader brings in glyphs.
+        """
         if self._font is not None:
             self._font.removeObserver(self, "Font.Changed")
             self._font.removeObserver(self, "Font.GlyphOrderChanged")
             self._font.removeObserver(self, "Font.SortDescriptorChanged")
+        self._stopGlyphLoader()
+        self._stopFontSaver()
+        self._stopFontWatcher()
+        self._stopFontReextractor()
         self._font = font
         self.setWindowTitle(self.fontTitle())
         if font is None:
             return
+        self._fontSaver = FontSaver(font, self)
+        self._fontSaver.saved.connect(self._fontSaved)
+        self._fontSaver.failed.connect(self._fontSaveFailed)
+        self._fontWatcher = FontWatcher(font, self)
+        self._fontWatcher.changed.connect(self._fontChangedExternally)
+        self._fontReextractor = FontReextractor(font, self)
+        self._fontReextractor.finished.connect(self._fontReloaded)
+        self._fontReextractor.failed.connect(self._fontReloadFailed)
+        if glyphLoader is not None:
+            self._glyphLoader = glyphLoader
+            glyphLoader.setParent(self)
+            glyphLoader.glyphsLoaded.connect(self._glyphsLoaded)
+            glyphLoader.progressChanged.connect(self.statusBar.setProgress)
+            glyphLoader.finished.connect(self._glyphLoaderFinished)
+            # reordering cells needs every glyph to be there
+            self.glyphCellView.setAcceptDrops(False)
+            self.statusBar.setProgressVisible(True)
+            glyphLoader.start()
         self._updateGlyphsFromGlyphOrder()
         font.addObserver(self, "_fontChanged", "Font.Changed")
         font.addObserver(self, "_glyphOrderChanged", "Font.GlyphOrderChanged")
@@ -332,6 +372,60 @@ class FontWindow(BaseWindow):
             return os.path.basename(path.rstrip(os.sep))
         return self.tr("Untitled")
 
+    def _stopGlyphLoader(self):
+        glyphLoader = self._glyphLoader
+        if glyphLoader is None:
+            return
+        glyphLoader.glyphsLoaded.disconnect(self._glyphsLoaded)
+        glyphLoader.finished.disconnect(self._glyphLoaderFinished)
+        glyphLoader.cancel()
+        glyphLoader.deleteLater()
+        self._glyphLoader = None
+        self._pendingGlyphIndexes = {}
+        self.glyphCellView.setAcceptDrops(True)
+        self.statusBar.setProgressVisible(False)
+
+    def _stopFontSaver(self):
+        fontSaver = self._fontSaver
+        if fontSaver is None:
+            return
+        fontSaver.shutdown()
+        fontSaver.deleteLater()
+        self._fontSaver = None
+
+    def _stopFontWatcher(self):
+        fontWatcher = self._fontWatcher
+        if fontWatcher is None:
+            return
+        fontWatcher.shutdown()
+        fontWatcher.deleteLater()
+        self._fontWatcher = None
+
+    def _stopFontReextractor(self):
+        fontReextractor = self._fontReextractor
+        if fontReextractor is None:
+            return
+        fontReextractor.shutdown()
+        fontReextractor.deleteLater()
+        self._fontReextractor = None
+
+    def lookupExternalChanges(self):
+        if self._fontWatcher is not None:
+            self._fontWatcher.scheduleCheck()
+
+    def _saveGlyphCaches(self):
+        for layer in self._font.layers:
+            cache = layer.glyphCache()
+            if cache is None:
+                continue
+            if cache.isModified():
+                try:
+                    cache.save(layer.glyphSet().contents)
+                except OSError:
+                    # only a cache
+                    pass
+            cache.close()
+
     def isGlyphTab(self):
         return bool(self.stackWidget.currentIndex())
 
@@ -369,7 +463,9 @@ class FontWindow(BaseWindow):
             ret = CloseMessageBox.getCloseDocument(self, self.fontTitle())
             if ret == QMessageBox.Save:
                 self.saveFile()
-                return True
+                # stay open if the save failed or was cancelled
+                self._fontSaver.wait()
+                return not self._font.dirty
             elif ret == QMessageBox.Discard:
                 return True
             return False
@@ -398,6 +494,77 @@ class FontWindow(BaseWindow):
     def _glyphViewGlyphsChanged(self, notification):
         self._updateGlyphActions()
 
+    # glyph loader
+
+    def _glyphsLoaded(self, glyphNames):
+        font = self._font
+        pendingGlyphIndexes = self._pendingGlyphIndexes
+        glyphs = {}
+        for glyphName in glyphNames:
+            index = pendingGlyphIndexes.pop(glyphName, None)
+            if index is not None and glyphName in font:
+                glyphs[index] = font[glyphName]
+        if glyphs:
+            self.glyphCellView.replaceGlyphs(glyphs)
+
+    def _glyphLoaderFinished(self):
+        pending = bool(self._pendingGlyphIndexes)
+        self._stopGlyphLoader()
+        # pick up glyphs the loader couldn't parse, the regular way
+        if pending:
+            self._updateGlyphsFromGlyphOrder()
+
+    def _fontSaved(self, stats):
+        duration = round(stats["duration"] * 1000)
+        if stats["files"] is None:
+            text = self.tr("Saved in {} ms").format(duration)
+        else:
+            text = self.tr("Saved {} files ({} bytes), removed {} in {} ms").format(
+                stats["files"], stats["bytes"], stats["removed"], duration
+            )
+        self.statusBar.setText(text)
+
+    def _fontSaveFailed(self, e):
+        errorReports.showCriticalException(e)
+
+    def _fontReloaded(self, changes):
+        if changes["added"] or changes["removed"] or "lib" in changes["fontData"]:
+            self._updateGlyphsFromGlyphOrder()
+        duration = round(changes["duration"] * 1000)
+        text = self.tr("Reloaded {} glyphs, added {}, removed {} in {} ms").format(
+            len(changes["changed"]),
+            len(changes["added"]),
+            len(changes["removed"]),
+            duration,
+        )
+        self.statusBar.setText(text)
+
+    def _fontReloadFailed(self, e):
+        self.statusBar.setText("")
+        errorReports.showCriticalException(e)
+
+    def _fontChangedExternally(self, changes):
+        font = self._font
+        # ask before throwing away local changes
+        if font.hasLocalChanges(changes):
+            ret = ReloadMessageBox.getReloadChanges(self, self.fontTitle())
+            if ret != QMessageBox.Yes:
+                return
+        # a background save would stamp files over the reloaded ones
+        self._fontSaver.wait()
+        font.reloadExternalChanges(changes)
+        if any(
+            glyphChanges["added"] or glyphChanges["deleted"]
+            for glyphChanges in changes["layers"].values()
+        ):
+            self._updateGlyphsFromGlyphOrder()
+
+    def _glyphLoadingCancelled(self):
+        if self._glyphLoader is None:
+            return
+        # glyphs that weren't loaded yet are loaded by the layer, as needed
+        self._glyphLoaderFinished()
+
     # widgets
 
     def _activeLayerModified(self):
@@ -490,8 +657,11 @@ class FontWindow(BaseWindow):
             selection = self.glyphCellView.selection()
             if selection is not None:
                 count = len(selection)
+                # don't promote template cells just to read their name
+                glyph = None
                 if count == 1:
-                    glyph = self.glyphCellView.glyphsForIndexes(selection)[0]
+                    glyph = self.glyphCellView.glyphs()[selection.first()]
+                if glyph is not None:
                     text = "%s " % glyph.name
                 else:
                     text = ""
@@ -513,35 +683,84 @@ class FontWindow(BaseWindow):
         self.setWindowModified(font.dirty)
 
     def _glyphOrderChanged(self, notification):
-        self._updateGlyphsFromGlyphOrder()
+        oldValue = notification.data["oldValue"] or []
+        newValue = notification.data["newValue"] or []
+        count = len(oldValue)
+        # glyphs added to the font are appended to the glyph order, only
+        # add their cells
+        if (
+            len(newValue) > count
+            and count == len(self.glyphCellView.glyphs())
+            and newValue[:count] == oldValue
+        ):
+            font = self._font
+            glyphs = []
+            for glyphName in newValue[count:]:
+                if glyphName in font:
+                    glyph = self._glyphForName(glyphName, count + len(glyphs))
+                else:
+                    glyph = self._templateGlyphForName(
+                        glyphName, self._templateGlyphs
+                    )
+                glyphs.append(glyph)
+            self.glyphCellView.appendGlyphs(glyphs)
+        else:
+            self._updateGlyphsFromGlyphOrder()
+
+    def _glyphForName(self, glyphName, index):
+        # glyphs that are still being loaded get a placeholder cell
+        glyphLoader = self._glyphLoader
+        if glyphLoader is not None and glyphLoader.isPending(glyphName):
+            self._pendingGlyphIndexes[glyphName] = index
+            return None
+        return self._font[glyphName]
+
+    def _templateGlyphForName(self, glyphName, templateGlyphs):
+        # reuse stand-ins, along with their cell images
+        layer = self._font.layers.defaultLayer
+        glyph = self._templateGlyphs.get(glyphName)
+        if glyph is None or glyph.layer is not layer:
+            glyph = TemplateGlyph(glyphName, layer)
+        templateGlyphs[glyphName] = glyph
+        return glyph
 
     def _updateGlyphsFromGlyphOrder(self):
         font = self._font
         glyphOrder = font.glyphOrder
+        self._pendingGlyphIndexes = {}
+        templateGlyphs = {}
         if glyphOrder:
             glyphCount = 0
             glyphs = []
             for glyphName in glyphOrder:
                 if glyphName in font:
-                    glyph = font[glyphName]
+                    glyph = self._glyphForName(glyphName, len(glyphs))
                     glyphCount += 1
                 else:
-                    glyph = font.get(glyphName, asTemplate=True)
+                    glyph = self._templateGlyphForName(glyphName, templateGlyphs)
                 glyphs.append(glyph)
             if glyphCount < len(font):
                 # if some glyphs in the font are not present in the glyph
                 # order, loop again to add them at the end
-                for glyph in font:
-                    if glyph not in glyphs:
-                        glyphs.append(glyph)
+                glyphNames = list(glyphOrder)
+                glyphOrderIndex = font.glyphOrderIndex
+                for glyphName in font.keys():
+                    if glyphName not in glyphOrderIndex:
+                        glyphs.append(self._glyphForName(glyphName, len(glyphs)))
+                        glyphNames.append(glyphName)
                 font.disableNotifications(observer=self)
-                font.glyphOrder = [glyph.name for glyph in glyphs]
+                font.glyphOrder = glyphNames
                 font.enableNotifications(observer=self)
         else:
-            glyphs = list(font)
+            glyphNames = list(font.keys())
+            glyphs = [
+                self._glyphForName(glyphName, index)
+                for index, glyphName in enumerate(glyphNames)
+            ]
             font.disableNotifications(observer=self)
-            font.glyphOrder = [glyph.name for glyph in glyphs]
+            font.glyphOrder = glyphNames
             font.enableNotifications(observer=self)
+        self._templateGlyphs = templateGlyphs
         self.glyphCellView.setGlyphs(glyphs)
 
     def _sortDescriptorChanged(self, notification):
@@ -552,7 +771,13 @@ class FontWindow(BaseWindow):
         if descriptors[0]["type"] == "glyphSet":
             glyphNames = descriptors[0]["glyphs"]
         else:
-            glyphNames = font.unicodeData.sortGlyphNames(font.keys(), descriptors)
+            # including the glyph order entries drawn as template glyphs
+            glyphOrderIndex = font.glyphOrderIndex
+            glyphNames = list(dict.fromkeys(glyphOrderIndex))
+            glyphNames.extend(
+                name for name in font.keys() if name not in glyphOrderIndex
+            )
+            glyphNames = font.unicodeData.sortGlyphNames(glyphNames, descriptors)
         font.glyphOrder = glyphNames
 
     # ------------
@@ -567,7 +792,7 @@ class FontWindow(BaseWindow):
         else:
             if path is None:
                 path = self._font.path
-            self._font.save(path, ufoFormatVersion)
+            self._fontSaver.save(path, ufoFormatVersion)
 
     def saveFileAs(self):
         fileFormats = OrderedDict(
@@ -615,21 +840,15 @@ class FontWindow(BaseWindow):
         path = font.path or font.binaryPath
         if not font.dirty or path is None:
             return
-        if not ReloadMessageBox.getReloadDocument(self, self.fontTitle()):
+        ret = ReloadMessageBox.getReloadDocument(self, self.fontTitle())
+        if ret != QMessageBox.Yes:
             return
+        self._fontSaver.wait()
         if font.path is not None:
-            font.reloadInfo()
-            font.reloadKerning()
-            font.reloadGroups()
-            font.reloadFeatures()
-            font.reloadLib()
-            font.reloadGlyphs(font.keys())
-            font.dirty = False
+            font.reloadChanges()
         else:
-            # TODO: we should do this in-place
-            font_ = font.__class__().new()
-            font_.extract(font.binaryPath)
-            self.setFont_(font_)
+            self._fontReextractor.start()
+            self.statusBar.setText(self.tr("Reloading…"))
 
     def exportFile(self):
         params, ok = ExportDialog.getExportParameters(self, self._font)
@@ -676,9 +895,7 @@ class FontWindow(BaseWindow):
             glyph = widget.activeGlyph()
             deleteUISelection(glyph)
         else:
-            glyphs = widget.glyphs()
-            for index in widget.selection():
-                glyph = glyphs[index]
+            for glyph in widget.glyphsForIndexes(widget.selection()):
                 glyph.clear()
 
     def copy(self):
@@ -691,9 +908,8 @@ class FontWindow(BaseWindow):
             copyGlyph = glyph.getRepresentation("TruFont.FilterSelection")
             packGlyphs = (copyGlyph,)
         else:
-            glyphs = self.glyphCellView.glyphs()
-            packGlyphs = (
-                glyphs[index] for index in sorted(self.glyphCellView.selection())
+            packGlyphs = self.glyphCellView.glyphsForIndexes(
+                self.glyphCellView.selection()
             )
 
         svgGlyphs = []
@@ -732,10 +948,9 @@ class FontWindow(BaseWindow):
         if self.isGlyphTab():
             pass
         else:
-            glyphs = self.glyphCellView.glyphs()
             pickled = []
-            for index in self.glyphCellView.selection():
-                glyph = glyphs[index]
+            selection = self.glyphCellView.selection()
+            for glyph in self.glyphCellView.glyphsForIndexes(selection):
                 componentGlyph = glyph.__class__()
                 componentGlyph.width = glyph.width
                 component = componentGlyph.instantiateComponent()
@@ -923,9 +1138,14 @@ class FontWindow(BaseWindow):
             # should be enforced in fontView already
             if not (glyphOrder and len(glyphOrder)):
                 return
-            index = glyphOrder.index(currentGlyph.name)
+            index = font.glyphOrderIndex.index(currentGlyph.name)
             newIndex = (index + value) % len(glyphOrder)
-            glyph = font[glyphOrder[newIndex]]
+            glyphName = glyphOrder[newIndex]
+            if glyphName in font:
+                glyph = font[glyphName]
+            else:
+                # a template cell, promote it so the cell follows the glyph
+                (glyph,) = self.glyphCellView.glyphsForIndexes((newIndex,))
             widget.setActiveGlyph(glyph)
         else:
             lastSelectedCell = widget.lastSelectedCell()
@@ -1142,6 +1362,14 @@ class FontWindow(BaseWindow):
             app = QApplication.instance()
             data = dict(font=self._font, window=self)
             app.postNotification("fontWindowWillClose", data)
+            self._stopGlyphLoader()
+            # let a background save complete
+            self._stopFontSaver()
+            self._stopFontWatcher()
+            self._stopFontReextractor()
+            self._saveGlyphCaches()
+            # drops the font's cells from the shared cell cache
+            self.glyphCellView.setGlyphs([])
             self._font.removeObserver(self, "Font.Changed")
             app = QApplication.instance()
             app.dispatcher.removeObserver(self, "drawingToolRegistered")
@@ -33,7 +33,7 @@ from defconQt.controls.glyphLineView import GlyphLineView, GlyphLineWidget
 from defconQt.controls.glyphSequenceEdit import GlyphSequenceComboBox, GlyphSequenceEdit
 from defconQt.windows.baseWindows import BaseWindow
 from trufont.objects import settings
-from trufont.objects.defcon import TGlyph
+from trufont.objects.defcon import TemplateGlyph, TGlyph
 from trufont.resources import icons_db  # noqa
 
 pointSizes = [50, 75, 100, 125, 150, 200, 250, 300, 350, 400, 450, 500]
@@ -213,6 +213,9 @@ def _glyphs(self):
             glyphs.append(glyph)
         elif glyphName in self._font:
             glyphs.append(self._font[glyphName])
+        elif glyphName in self._font.glyphOrderIndex:
+            template = TemplateGlyph(glyphName, self._font.layers.defaultLayer)
+            glyphs.append(template.promote())
     return glyphs
 
 
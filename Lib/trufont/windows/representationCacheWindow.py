@@ -0,0 +1,130 @@
+from PyQt5.QtCore import QSize, Qt, QTimer
+from PyQt5.QtWidgets import (
+    QCheckBox,
+    QHeaderView,
+    QMainWindow,
+    QPushButton,
+    QTreeWidget,
+    QTreeWidgetItem,
+)
+
+from defconQt.tools import representationStats
+from trufont.tools import platformSpecific
+
+# in ms
+refreshInterval = 1000
+
+
+def _formatBound(seconds):
+    if seconds < 1e-3:
+        return "%d µs" % round(seconds * 1e6)
+    return "%d ms" % round(seconds * 1e3)
+
+
+class RepresentationCacheWindow(QMainWindow):
+    """
+    Shows statistics on the representation cache of defcon objects, as
+    recorded by :mod:`defconQt.tools.representationStats`.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent, Qt.Tool)
+        bounds = representationStats.histogramBounds
+        labels = [
+            self.tr("Representation"),
+            self.tr("Hits"),
+            self.tr("Misses"),
+            self.tr("Hit Rate (%)"),
+            self.tr("Destroyed"),
+            self.tr("Cached"),
+            self.tr("Memory (KiB)"),
+            self.tr("Time (ms)"),
+        ]
+        labels.extend("< %s" % _formatBound(bound) for bound in bounds)
+        labels.append("≥ %s" % _formatBound(bounds[-1]))
+        self.statsView = QTreeWidget(self)
+        self.statsView.setHeaderLabels(labels)
+        self.statsView.setRootIsDecorated(False)
+        self.statsView.setSortingEnabled(True)
+        self.statsView.sortByColumn(0, Qt.AscendingOrder)
+        self.statsView.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self._items = {}
+
+        self.recordBox = QCheckBox(self.tr("Record"), self)
+        self.recordBox.setChecked(representationStats.isEnabled())
+        self.recordBox.toggled.connect(self.setRecording)
+        resetButton = QPushButton(self.tr("Reset"), self)
+        resetButton.clicked.connect(self.reset)
+
+        self.setCentralWidget(self.statsView)
+        self.setWindowTitle(self.tr("Representation Cache"))
+        statusBar = self.statusBar()
+        statusBar.addWidget(self.recordBox)
+        statusBar.addPermanentWidget(resetButton)
+        statusBar.setSizeGripEnabled(False)
+        if platformSpecific.needsTighterMargins():
+            margins = (7, -10, 9, -12)
+        else:
+            margins = (4, -1, 5, 0)
+        statusBar.setContentsMargins(*margins)
+
+        self._refreshTimer = QTimer(self)
+        self._refreshTimer.setInterval(refreshInterval)
+        self._refreshTimer.timeout.connect(self.refresh)
+
+    def setRecording(self, value):
+        representationStats.setEnabled(value)
+        self._updateRefreshTimer()
+        self.refresh()
+
+    def reset(self):
+        representationStats.resetStats()
+        self.statsView.clear()
+        self._items = {}
+        self.refresh()
+
+    def refresh(self):
+        items = self._items
+        view = self.statsView
+        view.setSortingEnabled(False)
+        for name, stats in representationStats.stats().items():
+            item = items.get(name)
+            if item is None:
+                item = items[name] = QTreeWidgetItem(view, [name])
+            hits, misses = stats["hits"], stats["misses"]
+            requests = hits + misses
+            values = [
+                hits,
+                misses,
+                round(100 * hits / requests) if requests else 0,
+                stats["destructions"],
+                stats["cached"],
+                round(stats["memory"] / 1024),
+                round(stats["time"] * 1e3, 1),
+            ]
+            values.extend(stats["histogram"])
+            for column, value in enumerate(values, 1):
+                item.setData(column, Qt.DisplayRole, value)
+        view.setSortingEnabled(True)
+
+    def _updateRefreshTimer(self):
+        if self.isVisible() and representationStats.isEnabled():
+            self._refreshTimer.start()
+        else:
+            self._refreshTimer.stop()
+
+    # ----------
+    # Qt methods
+    # ----------
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._updateRefreshTimer()
+        self.refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._updateRefreshTimer()
+
+    def sizeHint(self):
+        return QSize(900, 300)
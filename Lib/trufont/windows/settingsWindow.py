@@ -18,6 +18,7 @@ from PyQt5.QtWidgets import (
     QPlainTextEdit,
     QPushButton,
     QSizePolicy,
+    QSpinBox,
     QSplitter,
     QVBoxLayout,
     QWidget,
@@ -327,6 +328,18 @@ class MiscTab(QWidget):
         self.loadRecentFileBox = QCheckBox(
             self.tr("Load most recent file on start"), self
         )
+        self.loadGlyphsInBackgroundBox = QCheckBox(
+            self.tr("Load glyphs in the background when opening a font"), self
+        )
+        self.cacheParsedGlyphsBox = QCheckBox(
+            self.tr("Cache glyphs on disk to open fonts faster"), self
+        )
+        self.glyphCellCacheSizeLabel = QLabel(
+            self.tr("Memory for glyph cell images:"), self
+        )
+        self.glyphCellCacheSizeEdit = QSpinBox(self)
+        self.glyphCellCacheSizeEdit.setRange(16, 4096)
+        self.glyphCellCacheSizeEdit.setSuffix(self.tr(" MB"))
 
         buttonsLayout = QHBoxLayout()
         buttonsLayout.setSizeConstraint(QHBoxLayout.SetMinimumSize)
@@ -341,6 +354,13 @@ class MiscTab(QWidget):
         layout.addWidget(self.markColorView)
         layout.addLayout(buttonsLayout)
         layout.addWidget(self.loadRecentFileBox)
+        layout.addWidget(self.loadGlyphsInBackgroundBox)
+        layout.addWidget(self.cacheParsedGlyphsBox)
+        glyphCellCacheSizeLayout = QHBoxLayout()
+        glyphCellCacheSizeLayout.addWidget(self.glyphCellCacheSizeLabel)
+        glyphCellCacheSizeLayout.addWidget(self.glyphCellCacheSizeEdit)
+        glyphCellCacheSizeLayout.addStretch()
+        layout.addLayout(glyphCellCacheSizeLayout)
         self.setLayout(layout)
 
         self.readSettings()
@@ -365,6 +385,12 @@ class MiscTab(QWidget):
 
         loadRecentFile = settings.loadRecentFile()
         self.loadRecentFileBox.setChecked(loadRecentFile)
+        loadGlyphsInBackground = settings.loadGlyphsInBackground()
+        self.loadGlyphsInBackgroundBox.setChecked(loadGlyphsInBackground)
+        cacheParsedGlyphs = settings.cacheParsedGlyphs()
+        self.cacheParsedGlyphsBox.setChecked(cacheParsedGlyphs)
+        glyphCellCacheSize = settings.glyphCellCacheSize()
+        self.glyphCellCacheSizeEdit.setValue(glyphCellCacheSize)
 
     def writeSettings(self):
         markColors = self.markColorView.list()
@@ -372,3 +398,9 @@ class MiscTab(QWidget):
 
         loadRecentFile = self.loadRecentFileBox.isChecked()
         settings.setLoadRecentFile(loadRecentFile)
+        loadGlyphsInBackground = self.loadGlyphsInBackgroundBox.isChecked()
+        settings.setLoadGlyphsInBackground(loadGlyphsInBackground)
+        cacheParsedGlyphs = self.cacheParsedGlyphsBox.isChecked()
+        settings.setCacheParsedGlyphs(cacheParsedGlyphs)
+        glyphCellCacheSize = self.glyphCellCacheSizeEdit.value()
+        settings.setGlyphCellCacheSize(glyphCellCacheSize)
@@ -0,0 +1,331 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from defcon import Font
+
+from defconQt import representationFactories as baseRepresentationFactories
+from defconQt.controls.glyphCellView import GlyphCellView
+from trufont import representationFactories
+from trufont.objects.application import Application
+from trufont.objects.defcon import TemplateGlyph, TFont
+
+
+class ReloadChangesTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        for name in ("a", "b", "c"):
+            glyph = font.newGlyph(name)
+            glyph.width = 500
+        font.kerning["a", "b"] = -10
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempDir.name, "test.ufo")
+        font.save(self.path)
+        self.font = TFont(self.path)
+        for glyph in self.font:
+            pass
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_reloadChanges(self):
+        font = self.font
+        font["a"].width = 600
+        font.kerning["a", "b"] = -20
+        font.get("d").width = 300
+        undoManager = font["c"].undoManager
+        font.info.familyName = "Test"
+        font.info.dirty = False
+
+        changes = font.reloadChanges()
+        # the glyph order in the lib picked up the new glyph
+        self.assertEqual(changes["fontFiles"], ["kerning.plist", "lib.plist"])
+        self.assertEqual(sorted(changes["layers"]["public.default"]), ["a", "d"])
+        self.assertEqual(font["a"].width, 500)
+        self.assertFalse(font["a"].undoManager.canUndo())
+        self.assertEqual(font.kerning["a", "b"], -10)
+        # former template glyph
+        self.assertTrue(font["d"].template)
+        # untouched
+        self.assertEqual(font.info.familyName, "Test")
+        self.assertIs(font["c"].undoManager, undoManager)
+        self.assertFalse(font.dirty)
+
+    def test_reloadExternalChanges(self):
+        font = self.font
+        other = TFont(self.path)
+        other["b"].width = 700
+        other.save()
+        font["a"].width = 600
+
+        changes = font.reloadChanges()
+        self.assertEqual(sorted(changes["layers"]["public.default"]), ["a", "b"])
+        self.assertEqual(font["a"].width, 500)
+        self.assertEqual(font["b"].width, 700)
+        self.assertEqual(font.reloadChanges()["layers"], {})
+
+
+class MergeFontTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def makeFont(self, cls):
+        font = cls()
+        for name, unicode in (("a", 97), ("b", 98), ("c", 99)):
+            glyph = font.newGlyph(name)
+            glyph.width = 500
+            glyph.unicodes = [unicode]
+            pen = glyph.getPointPen()
+            pen.beginPath()
+            pen.addPoint((0, 0), "line")
+            pen.addPoint((100, 0), "line")
+            pen.addPoint((100, 100), "line")
+            pen.endPath()
+        font.kerning["a", "b"] = -10
+        font.info.unitsPerEm = 1000
+        return font
+
+    def test_mergeFont(self):
+        source = self.makeFont(Font)
+        font = self.makeFont(TFont)
+        font["a"].width = 600
+        font["a"][0].selected = True
+        font["b"].move((10, 0))
+        font.newGlyph("d")
+        source["b"].unicodes = [66]
+        del source["c"]
+        source.newGlyph("e")
+        source.kerning["a", "b"] = -20
+        undoManager = font["a"].undoManager
+        font.dirty = False
+
+        changes = font.mergeFont(source)
+        self.assertEqual(changes["changed"], ["a", "b"])
+        self.assertEqual(changes["added"], ["e"])
+        self.assertEqual(changes["removed"], ["c", "d"])
+        # the glyph order changed along with the glyphs
+        self.assertEqual(changes["fontData"], ["kerning", "lib"])
+        self.assertEqual(font["a"].width, 500)
+        self.assertIsNot(font["a"].undoManager, undoManager)
+        self.assertFalse(font["a"].undoManager.canUndo())
+        self.assertEqual(font["b"][0][0].x, 0)
+        self.assertEqual(font.unicodeData.glyphNameForUnicode(66), "b")
+        self.assertIsNone(font.unicodeData.glyphNameForUnicode(98))
+        self.assertEqual(font.kerning["a", "b"], -20)
+        self.assertFalse(font.dirty)
+        self.assertFalse(font["a"].dirty)
+
+    def test_mergeFontGlyphNames(self):
+        source = self.makeFont(Font)
+        font = self.makeFont(TFont)
+        source["a"].width = 600
+        font["b"].width = 600
+        undoManager = font["c"].undoManager
+        # "a" isn't compared
+        changes = font.mergeFont(source, glyphNames={"b"})
+        self.assertEqual(changes["changed"], ["b"])
+        self.assertEqual(font["a"].width, 500)
+        self.assertEqual(font["b"].width, 500)
+        self.assertIs(font["c"].undoManager, undoManager)
+
+    def _changed(self, notification):
+        self.changed.append(notification.object.name)
+        # the other glyphs are in place already
+        self.assertEqual(self.font["c"][0][0].x, 10)
+
+    def _layerChanged(self, notification):
+        self.changed.append(notification.name)
+
+    def test_mergeFontNotifications(self):
+        source = self.makeFont(Font)
+        font = self.font = self.makeFont(TFont)
+        for glyph in source:
+            glyph.move((10, 0))
+        source.newGlyph("d")
+        self.changed = []
+        font.dispatcher.addObserver(self, "_changed", "Glyph.Changed")
+        font.dispatcher.addObserver(self, "_layerChanged", "Layer.Changed")
+        font.mergeFont(source)
+        self.assertEqual(sorted(self.changed), ["Layer.Changed", "a", "b", "c", "d"])
+
+
+class TemplateGlyphTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def test_promote(self):
+        font = TFont()
+        font.newGlyph("a")
+        font.glyphOrder = ["a", "uni0431"]
+        font.dirty = False
+        layer = font.layers.defaultLayer
+        template = TemplateGlyph("uni0431", layer)
+        self.assertEqual(template.unicodes, [0x0431])
+        self.assertNotIn("uni0431", font)
+        view = GlyphCellView()
+        view.setGlyphs([font["a"], template])
+        (glyph,) = view.glyphsForIndexes([1])
+        self.assertIs(glyph, font["uni0431"])
+        self.assertTrue(glyph.template)
+        self.assertEqual(glyph.unicodes, [0x0431])
+        self.assertIs(view.glyphs()[1], glyph)
+        self.assertIs(template.promote(), glyph)
+        self.assertEqual(font.glyphOrder, ["a", "uni0431"])
+        self.assertFalse(font.dirty)
+
+    def test_unicodeData(self):
+        font = TFont()
+        font.newGlyph("b").unicode = 0x62
+        font.newGlyph("zero")
+        font.glyphOrder = ["a", "b", "c", "zero", "template"]
+        unicodeData = font.unicodeData
+        self.assertEqual(unicodeData.glyphNameForUnicode(0x61), "a")
+        self.assertEqual(unicodeData.glyphNameForUnicode(0x62), "b")
+        self.assertEqual(unicodeData.unicodeForGlyphName("c"), 0x63)
+        self.assertIsNone(unicodeData.unicodeForGlyphName("template"))
+        # glyphs of the font go by their own unicodes
+        self.assertIsNone(unicodeData.unicodeForGlyphName("zero"))
+        self.assertIsNone(unicodeData.glyphNameForUnicode(0x30))
+        self.assertEqual(
+            unicodeData.sortGlyphNames(["c", "b", "a"], [dict(type="unicode")]),
+            ["a", "b", "c"],
+        )
+        font.glyphOrder = ["b", "zero", "uni0431"]
+        self.assertIsNone(unicodeData.glyphNameForUnicode(0x61))
+        self.assertEqual(unicodeData.glyphNameForUnicode(0x0431), "uni0431")
+        TemplateGlyph("uni0431", font.layers.defaultLayer).promote()
+        self.assertEqual(unicodeData.glyphNameForUnicode(0x0431), "uni0431")
+
+
+class CompositeGlyphTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        baseRepresentationFactories.registerAllFactories()
+        representationFactories.registerAllFactories()
+        font = self.font = TFont()
+        pen = font.newGlyph("a").getPen()
+        pen.moveTo((0, 0))
+        pen.lineTo((0, 100))
+        pen.lineTo((100, 0))
+        pen.closePath()
+        font.newGlyph("acute")
+        for name, baseGlyphs in (
+            ("aacute", ("a", "acute")),
+            ("aacute.sc", ("aacute",)),
+            ("b", ()),
+        ):
+            pointPen = font.newGlyph(name).getPointPen()
+            for baseGlyph in baseGlyphs:
+                pointPen.addComponent(baseGlyph, (1, 0, 0, 1, 0, 0))
+        for glyph in font:
+            glyph.resetUndoManager()
+            glyph.dirty = False
+        self.changed = []
+        font.dispatcher.addObserver(self, "_glyphChanged", "Glyph.Changed")
+
+    def _glyphChanged(self, notification):
+        self.changed.append(notification.object.name)
+
+    def test_compositeGlyphNames(self):
+        layer = self.font.layers.defaultLayer
+        self.assertEqual(layer.compositeGlyphNames("a"), {"aacute", "aacute.sc"})
+        self.assertEqual(layer.compositeGlyphNames("aacute"), {"aacute.sc"})
+        self.assertEqual(layer.compositeGlyphNames("b"), set())
+        self.font["aacute"].components[1].baseGlyph = "b"
+        self.assertEqual(layer.compositeGlyphNames("acute"), set())
+        self.assertEqual(layer.compositeGlyphNames("b"), {"aacute", "aacute.sc"})
+        del self.font["aacute.sc"]
+        self.assertEqual(layer.compositeGlyphNames("a"), {"aacute"})
+
+    def test_baseGlyphChange(self):
+        font = self.font
+        composite = font["aacute.sc"]
+        path = composite.getRepresentation("defconQt.QPainterPath")
+        components = composite.getRepresentation("TruFont.ComponentQPainterPaths")
+        self.assertEqual(composite.bounds, (0, 0, 100, 100))
+        font["a"][0][1].y = 200
+        font["a"][0].postNotification("Contour.Changed")
+        self.assertCountEqual(self.changed, ["a", "aacute", "aacute.sc"])
+        path = composite.getRepresentation("defconQt.QPainterPath")
+        self.assertEqual(path.boundingRect().height(), 200)
+        self.assertIsNot(
+            composite.getRepresentation("TruFont.ComponentQPainterPaths"), components
+        )
+        self.assertEqual(composite.components[0].bounds, (0, 0, 100, 200))
+        # only the base glyph changed
+        self.assertFalse(composite.dirty)
+        self.assertIsNone(composite._undoManager)
+
+    def test_baseGlyphDeleted(self):
+        font = self.font
+        del font["acute"]
+        self.assertCountEqual(self.changed, ["aacute", "aacute.sc"])
+        self.changed.clear()
+        font.newGlyph("acute")
+        self.assertCountEqual(self.changed, ["aacute", "aacute.sc"])
+
+    def _checkBaseGlyphB(self):
+        font = self.font
+        layer = font.layers.defaultLayer
+        composite = font["aacute.sc"]
+        self.assertEqual(layer.compositeGlyphNames("a"), set())
+        self.assertEqual(layer.compositeGlyphNames("b"), {"aacute", "aacute.sc"})
+        path = composite.getRepresentation("defconQt.QPainterPath")
+        self.assertEqual(path.boundingRect().width(), 50)
+        font["b"].move((0, 100))
+        path = composite.getRepresentation("defconQt.QPainterPath")
+        self.assertEqual(path.boundingRect().top(), 100)
+
+    def test_mergeFont(self):
+        font = self.font
+        font["aacute.sc"].getRepresentation("defconQt.QPainterPath")
+        source = Font()
+        for glyph in font:
+            source.insertGlyph(glyph, glyph.name)
+        pen = source["b"].getPen()
+        pen.moveTo((0, 0))
+        pen.lineTo((50, 50))
+        pen.lineTo((50, 0))
+        pen.closePath()
+        source["aacute"].components[0].baseGlyph = "b"
+        font.mergeFont(source)
+        self._checkBaseGlyphB()
+
+    def test_reloadGlyphs(self):
+        font = self.font
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, "test.ufo")
+            font.save(path)
+            font["aacute.sc"].getRepresentation("defconQt.QPainterPath")
+            other = Font(path)
+            pen = other["b"].getPen()
+            pen.moveTo((0, 0))
+            pen.lineTo((50, 50))
+            pen.lineTo((50, 0))
+            pen.closePath()
+            other["aacute"].components[0].baseGlyph = "b"
+            other.save()
+            font.reloadChanges()
+        self._checkBaseGlyphB()
+
+
+if __name__ == "__main__":
+    unittest.main()
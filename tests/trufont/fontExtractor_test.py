@@ -0,0 +1,106 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import extractor
+from defcon import Font
+from fontTools.pens.recordingPen import RecordingPointPen
+from ufo2ft import compileOTF, compileTTF
+
+from trufont.objects import fontExtractor
+from trufont.objects.application import Application
+
+
+def _glyphData(font):
+    data = {}
+    for glyph in font:
+        pen = RecordingPointPen()
+        glyph.drawPoints(pen)
+        data[glyph.name] = (pen.value, glyph.width, glyph.unicodes)
+    return data
+
+
+class ExtractGlyphsTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    @classmethod
+    def setUpClass(cls):
+        font = Font()
+        font.info.unitsPerEm = 1000
+        font.info.familyName = "Test"
+        font.info.styleName = "Regular"
+        font.info.ascender = 800
+        font.info.descender = -200
+        font.newGlyph(".notdef").width = 500
+        font.newGlyph("space").unicodes = [0x20]
+        a = font.newGlyph("a")
+        a.unicodes = [0x61, 0x251]
+        a.width = 520
+        pen = a.getPen()
+        pen.moveTo((50, 0))
+        pen.lineTo((50, 500))
+        pen.curveTo((150, 600), (350, 600), (450, 500))
+        pen.lineTo((450, 0))
+        pen.closePath()
+        pen.moveTo((150, 100))
+        pen.lineTo((350, 100))
+        pen.lineTo((250, 300))
+        pen.closePath()
+        acute = font.newGlyph("acute")
+        acute.unicodes = [0xB4]
+        pen = acute.getPen()
+        pen.moveTo((200, 650))
+        pen.lineTo((300, 750))
+        pen.lineTo((250, 650))
+        pen.closePath()
+        aacute = font.newGlyph("aacute")
+        aacute.unicodes = [0xE1]
+        aacute.width = 520
+        pen = aacute.getPen()
+        pen.addComponent("a", (1, 0, 0, 1, 0, 0))
+        pen.addComponent("acute", (1, 0, 0, 1, 20, 0))
+        font.glyphOrder = [".notdef", "space", "a", "acute", "aacute"]
+        cls.tempDir = tempfile.TemporaryDirectory()
+        cls.paths = {}
+        for ext, compile in (("otf", compileOTF), ("ttf", compileTTF)):
+            path = os.path.join(cls.tempDir.name, "Test." + ext)
+            compile(font).save(path)
+            cls.paths[ext] = path
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tempDir.cleanup()
+
+    def test_extractFont(self):
+        minGlyphCount = fontExtractor._minGlyphCount
+        for ext, path in self.paths.items():
+            expected = Font()
+            extractor.extractUFO(path, expected, format="OTF")
+            expected = _glyphData(expected)
+            self.assertEqual(len(expected), 5)
+            serial = Font()
+            fontExtractor.extractFont(path, serial, "OTF")
+            self.assertEqual(_glyphData(serial), expected, msg=ext)
+            # have the pool convert this few glyphs too
+            fontExtractor._minGlyphCount = 0
+            try:
+                pooled = Font()
+                fontExtractor.extractFont(path, pooled, "OTF", maxWorkers=2)
+            finally:
+                fontExtractor._minGlyphCount = minGlyphCount
+            self.assertEqual(_glyphData(pooled), expected, msg=ext)
+            self.assertEqual(pooled.glyphOrder, serial.glyphOrder)
+
+    def test_unsupportedFormat(self):
+        font = Font()
+        self.assertFalse(fontExtractor.extractGlyphs(self.paths["otf"], font, "WOFF"))
+        self.assertEqual(len(font), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from fontTools.misc import plistlib
+
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+from trufont.objects.fontSaver import FontSaver, _SaveJob
+from trufont.objects.fontWatcher import FontWatcher
+
+
+class FontSaverTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        for name in ("a", "b", "c"):
+            glyph = font.newGlyph(name)
+            glyph.width = 500
+            pen = glyph.getPen()
+            pen.moveTo((0, 0))
+            pen.lineTo((100, 0))
+            pen.lineTo((100, 100))
+            pen.closePath()
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempDir.name, "test.ufo")
+        font.save(self.path)
+        self.font = TFont(self.path)
+        self.saver = FontSaver(self.font)
+        self.stats = []
+        self.saver.saved.connect(self.stats.append)
+
+    def tearDown(self):
+        self.saver.shutdown()
+        self.tempDir.cleanup()
+
+    def test_saveIncrementally(self):
+        font = self.font
+        font["a"].width = 600
+        font["a"].appendAnchor(dict(x=50, y=100, name="top"))
+        del font["b"]
+        font.newGlyph("d").width = 250
+        font.kerning["a", "c"] = -20
+        self.assertTrue(self.saver.canSaveIncrementally())
+        self.saver.save()
+        self.saver.wait()
+        self.assertFalse(font.dirty)
+        # a.glif, d.glif, contents.plist, kerning.plist and the glyph order
+        # in lib.plist
+        self.assertEqual(self.stats[0]["files"], 5)
+        self.assertEqual(self.stats[0]["removed"], 1)
+        self.assertEqual(len(font.layers.defaultLayer.dirtyGlyphs()), 0)
+        self.assertFalse(any(font.testForExternalChanges()["layers"]["modified"]))
+
+        other = TFont(self.path)
+        self.assertEqual(sorted(other.keys()), ["a", "c", "d"])
+        self.assertEqual(other["a"].width, 600)
+        self.assertEqual(other["a"].anchors[0].name, "top")
+        self.assertEqual(len(other["a"]), 1)
+        self.assertEqual(other["d"].width, 250)
+        self.assertEqual(other.kerning["a", "c"], -20)
+
+    def test_saveUnchanged(self):
+        font = self.font
+        font["c"].width = 500
+        self.saver.save()
+        self.saver.wait()
+        self.assertEqual(self.stats[0]["files"], 0)
+
+    def test_saveAs(self):
+        path = os.path.join(self.tempDir.name, "other.ufo")
+        self.assertFalse(self.saver.canSaveIncrementally(path))
+        self.font["a"].width = 600
+        self.saver.save(path)
+        self.assertIsNone(self.stats[0]["files"])
+        self.assertEqual(TFont(path)["a"].width, 600)
+
+    def test_saveAsFailed(self):
+        font = self.font
+        watcher = FontWatcher(font)
+        errors = []
+        self.saver.failed.connect(errors.append)
+
+        def save(path=None, formatVersion=None):
+            TFont.save(font, os.path.join(self.tempDir.name, "missing", "x.ufo"))
+
+        font.save = save
+        font["a"].width = 600
+        self.saver.save(os.path.join(self.tempDir.name, "other.ufo"))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(self.stats, [])
+        self.assertTrue(font.dirty)
+        # the watcher isn't left paused
+        self.assertFalse(watcher._saving)
+        watcher.shutdown()
+
+    def test_saveEmptyFiles(self):
+        job = _SaveJob(self.path)
+        job.fontFiles = [
+            ("info", "fontinfo.plist", {}),
+            ("groups", "groups.plist", {}),
+            ("features", "features.fea", ""),
+        ]
+        with open(os.path.join(self.path, "groups.plist"), "wb") as file:
+            plistlib.dump(dict(group=["a"]), file)
+        job.run()
+        # like ufoLib, the font info is written even if empty
+        self.assertEqual(TFont(self.path).info.unitsPerEm, None)
+        self.assertTrue(os.path.exists(os.path.join(self.path, "fontinfo.plist")))
+        self.assertFalse(os.path.exists(os.path.join(self.path, "groups.plist")))
+        self.assertFalse(os.path.exists(os.path.join(self.path, "features.fea")))
+
+
+if __name__ == "__main__":
+    unittest.main()
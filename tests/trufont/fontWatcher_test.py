@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+from trufont.objects.fontSaver import FontSaver
+from trufont.objects.fontWatcher import FontWatcher
+
+
+class FontWatcherTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        for name, unicode in (("a", 97), ("b", 98), ("c", 99)):
+            glyph = font.newGlyph(name)
+            glyph.width = 500
+            glyph.unicodes = [unicode]
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempDir.name, "test.ufo")
+        font.save(self.path)
+        self.font = TFont(self.path)
+        self.font["a"]
+        self.font["b"]
+        self.font.kerning
+        self.watcher = FontWatcher(self.font)
+        self.changes = []
+        self.watcher.changed.connect(self.changes.append)
+
+    def tearDown(self):
+        self.watcher.shutdown()
+        self.tempDir.cleanup()
+
+    def test_watchedPaths(self):
+        paths = self.watcher.watchedPaths()
+        self.assertIn(self.path, paths)
+        self.assertIn(os.path.join(self.path, "glyphs"), paths)
+        self.assertIn(os.path.join(self.path, "glyphs", "contents.plist"), paths)
+
+    def test_externalChanges(self):
+        other = TFont(self.path)
+        other["a"].width = 700
+        # not loaded, read from disk when needed
+        other["c"].width = 800
+        del other["b"]
+        other.newGlyph("d").unicodes = [100]
+        other.kerning["a", "c"] = -30
+        other.save()
+
+        self.watcher.check()
+        self.assertEqual(len(self.changes), 1)
+        changes = self.changes[0]
+        self.assertEqual(changes["fontFiles"], ["kerning.plist"])
+        self.assertEqual(
+            changes["layers"]["public.default"],
+            dict(added=["d"], modified=["a"], deleted=["b"]),
+        )
+        # the same changes aren't reported again
+        self.watcher.check()
+        self.assertEqual(len(self.changes), 1)
+
+        font = self.font
+        self.assertFalse(font.hasLocalChanges(changes))
+        font.reloadExternalChanges(changes)
+        self.assertEqual(font["a"].width, 700)
+        self.assertTrue(font["b"].template)
+        self.assertEqual(font["c"].width, 800)
+        self.assertEqual(font.unicodeData.glyphNameForUnicode(100), "d")
+        self.assertEqual(font.kerning["a", "c"], -30)
+        self.assertFalse(font.dirty)
+        changes = self.watcher.externalChanges()
+        self.assertEqual(changes, dict(fontFiles=[], layers={}))
+
+    def test_localChanges(self):
+        self.font["a"].width = 600
+        other = TFont(self.path)
+        other["a"].width = 700
+        other.save()
+        changes = self.watcher.externalChanges()
+        self.assertTrue(self.font.hasLocalChanges(changes))
+
+    def test_ownSave(self):
+        saver = FontSaver(self.font)
+        self.font["a"].width = 600
+        del self.font["b"]
+        self.font.newGlyph("d")
+        saver.save()
+        # files are written in the background, and only stamped at the end
+        self.watcher.check()
+        saver.wait()
+        self.watcher.check()
+        saver.shutdown()
+        self.assertEqual(self.changes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
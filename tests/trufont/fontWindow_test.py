@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from PyQt5.QtWidgets import QMessageBox
+
+from trufont.controls.fileMessageBoxes import CloseMessageBox
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+from trufont.windows.fontWindow import FontWindow
+
+
+class FontWindowTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def test_sortDescriptor(self):
+        font = TFont()
+        font.newGlyph("b").unicode = 0x62
+        font.glyphOrder = ["c", "b", "zero", "a"]
+        font.newGlyph("b.alt")
+        window = FontWindow(font)
+        # template glyphs are sorted along with the others
+        font.sortDescriptor = [dict(type="unicode")]
+        self.assertEqual(font.glyphOrder, ["zero", "a", "b", "c", "b.alt"])
+        self.assertEqual(
+            [glyph.name for glyph in window.glyphCellView.glyphs()], font.glyphOrder
+        )
+        self.assertEqual(sorted(font.keys()), ["b", "b.alt"])
+        font.sortDescriptor = [dict(type="alphabetical")]
+        self.assertEqual(font.glyphOrder, ["a", "b", "b.alt", "c", "zero"])
+
+    def test_closeSaveFailed(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, "test.ufo")
+            font = TFont()
+            font.newGlyph("a")
+            font.save(path)
+            font = TFont(path)
+            window = FontWindow(font)
+            window._fontSaver.failed.disconnect(window._fontSaveFailed)
+            getCloseDocument = CloseMessageBox.getCloseDocument
+            answers = []
+            try:
+                CloseMessageBox.getCloseDocument = lambda *args: answers.pop()
+                # doesn't validate, the background save fails
+                font.lib["public.glyphOrder"] = 5
+                answers.append(QMessageBox.Save)
+                self.assertFalse(window.close())
+                self.assertTrue(font.dirty)
+                font.lib["public.glyphOrder"] = ["a"]
+                answers.append(QMessageBox.Save)
+                self.assertTrue(window.close())
+                self.assertEqual(TFont(path).glyphOrder, ["a"])
+            finally:
+                CloseMessageBox.getCloseDocument = getCloseDocument
+
+
+if __name__ == "__main__":
+    unittest.main()
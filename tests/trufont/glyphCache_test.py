@@ -0,0 +1,111 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+from trufont.objects.glyphCache import GlyphCache
+from trufont.objects.glyphLoader import readGlyphRecord
+
+
+class GlyphCacheTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        glyph = font.newGlyph("a")
+        glyph.width = 500
+        glyph.unicodes = [97]
+        glyph.appendAnchor(dict(x=250, y=500, name="top"))
+        pen = glyph.getPen()
+        pen.moveTo((0, 0))
+        pen.lineTo((100, 0))
+        pen.lineTo((100, 100))
+        pen.closePath()
+        glyph = font.newGlyph("b")
+        glyph.width = 600
+        glyph.getPen().addComponent("a", (1, 0, 0, 1, 50, 0))
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempDir.name, "test.ufo")
+        self.cacheDirectory = os.path.join(self.tempDir.name, "cache")
+        font.save(self.path)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def openFont(self):
+        font = TFont(self.path)
+        layer = font.layers.defaultLayer
+        cache = GlyphCache.forGlyphSet(layer.glyphSet(), self.cacheDirectory)
+        layer.setGlyphCache(cache)
+        return font, cache
+
+    def test_reopen(self):
+        font, cache = self.openFont()
+        for glyph in font:
+            pass
+        self.assertTrue(cache.isModified())
+        cache.save()
+        cache.close()
+
+        font, cache = self.openFont()
+        self.assertEqual(len(cache), 2)
+        glyphSet = font.layers.defaultLayer.glyphSet()
+        record = cache.get("a", cache.fileKey(glyphSet.contents["a"]))
+        self.assertIsNotNone(record)
+        self.assertIsNone(record.text)
+        glyph = font["a"]
+        self.assertEqual(glyph.width, 500)
+        self.assertEqual(glyph.unicodes, [97])
+        self.assertEqual(glyph.anchors[0].name, "top")
+        self.assertEqual(len(glyph), 1)
+        self.assertEqual(len(glyph[0]), 3)
+        self.assertFalse(glyph.dirty)
+        glyph = font["b"]
+        self.assertEqual(glyph.components[0].baseGlyph, "a")
+        self.assertEqual(glyph.components[0].transformation, (1, 0, 0, 1, 50, 0))
+        self.assertFalse(cache.isModified())
+        # the first edit can be undone though the GLIF source isn't cached
+        glyph = font["a"]
+        glyph.width = 550
+        glyph.undoManager.undo()
+        self.assertEqual(glyph.width, 500)
+        cache.close()
+
+    def test_invalidation(self):
+        font, cache = self.openFont()
+        glyphSet = font.layers.defaultLayer.glyphSet()
+        readGlyphRecord(glyphSet, "a", cache=cache)
+        cache.save()
+        cache.close()
+
+        fileName = glyphSet.contents["a"]
+        glyphPath = os.path.join(self.path, "glyphs", fileName)
+        with open(glyphPath) as file:
+            text = file.read()
+        with open(glyphPath, "w") as file:
+            file.write(text.replace('width="500"', 'width="5100"'))
+        font, cache = self.openFont()
+        self.assertIsNone(cache.get("a", cache.fileKey(fileName)))
+        self.assertEqual(font["a"].width, 5100)
+        cache.close()
+
+    def test_version(self):
+        os.makedirs(self.cacheDirectory)
+        font, cache = self.openFont()
+        with open(cache.path(), "wb") as file:
+            file.write(b"TFGC\xff\xff")
+        cache.close()
+        font, cache = self.openFont()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(font["a"].width, 500)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys
+import unittest
+
+from PyQt5.QtGui import QPixmap
+
+from defconQt.tools.glyphCellCache import GlyphCellCache, representationKey
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+
+
+class GlyphCellCacheTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def test_lru(self):
+        font = TFont()
+        a, b, c = (font.newGlyph(name) for name in "abc")
+        small = representationKey("cell", dict(width=10, height=10))
+        large = representationKey("cell", dict(width=20, height=10))
+        # room for four small cells
+        cache = GlyphCellCache(4 * 10 * 10 * 4)
+        for glyph in (a, b, c):
+            cache.put(glyph, small, QPixmap(10, 10))
+        self.assertEqual(len(cache), 3)
+        self.assertIsNotNone(cache.get(a, small))
+        self.assertIsNone(cache.get(a, large))
+        # evicts b, a was used last
+        cache.put(c, large, QPixmap(20, 10))
+        self.assertEqual(len(cache), 3)
+        self.assertFalse(cache.contains(b, small))
+        self.assertTrue(cache.contains(a, small))
+        self.assertTrue(cache.contains(c, small))
+        cache.put(b, large, QPixmap(20, 10))
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(cache.contains(c, small))
+        self.assertEqual(cache.size(), 2 * 20 * 10 * 4)
+        self.assertEqual(cache.stats(), dict(hits=1, misses=1, evictions=3))
+
+        # outdated pixmaps are still handed out
+        pixmap = cache.get(b, large)
+        cache.invalidate(b)
+        self.assertFalse(cache.contains(b, large))
+        self.assertIs(cache.get(b, large), pixmap)
+        cache.put(b, large, QPixmap(20, 10))
+        self.assertTrue(cache.contains(b, large))
+
+        cache.setMaxSize(20 * 10 * 4)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.stats()["evictions"], 4)
+        cache.resetStats()
+        self.assertEqual(cache.stats(), dict(hits=0, misses=0, evictions=0))
+        cache.removeFont(font)
+        self.assertEqual((len(cache), cache.size()), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,268 @@
+import sys
+import time
+import unittest
+
+from PyQt5.QtCore import QEvent, Qt
+from PyQt5.QtGui import QKeyEvent
+
+from defconQt import representationFactories as baseRepresentationFactories
+from defconQt.controls.glyphCellView import GlyphCellView
+from defconQt.tools.glyphCellCache import GlyphCellCache
+from defconQt.tools.glyphCellRenderer import GlyphCellRenderer
+from trufont import representationFactories
+from trufont.objects.application import Application
+from trufont.objects.defcon import TemplateGlyph, TFont
+
+
+class GlyphCellViewTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        for name in ("a", "b", "c"):
+            font.newGlyph(name)
+        font.newLayer("background").newGlyph("b")
+        self.font = font
+        self.view = GlyphCellView()
+        self.view.setGlyphs([font[name] for name in ("a", "b", "c", "b")])
+
+    def test_glyphChanged(self):
+        font = self.font
+        widget = self.view.widget()
+        self.assertFalse(font["b"].hasObserver(self.view, "Glyph.Changed"))
+        font["b"].width = 250
+        font["b"].width = 300
+        font.layers["background"]["b"].width = 250
+        self.assertEqual(widget._dirtyIndexes, {1, 3})
+        self.app.processEvents()
+        self.assertEqual(widget._dirtyIndexes, set())
+
+    def test_setGlyphs(self):
+        font = self.font
+        widget = self.view.widget()
+        self.view.setGlyphs([font["c"]])
+        font["b"].width = 250
+        font["c"].width = 250
+        self.assertEqual(widget._dirtyIndexes, {0})
+        self.view.setGlyphs([])
+        font["c"].width = 300
+        self.assertEqual(widget._dirtyIndexes, {0})
+        self.assertFalse(font.dispatcher.hasObserver(self.view, "Glyph.Changed", None))
+
+    def test_fontInfoChanged(self):
+        info = self.font.info
+        widget = self.view.widget()
+        info.copyright = "Copyright"
+        info.versionMajor = 2
+        self.assertEqual(widget._dirtyIndexes, set())
+        info.xHeight = 500
+        self.assertEqual(widget._dirtyIndexes, {0, 1, 2, 3})
+
+    def test_glyphNameInput(self):
+        widget = self.view.widget()
+
+        def typeText(text):
+            for char in text:
+                event = QKeyEvent(
+                    QEvent.KeyPress, ord(char.upper()), Qt.NoModifier, char
+                )
+                widget.keyPressEvent(event)
+
+        typeText("b")
+        self.assertEqual(list(widget.selection()), [1])
+        self.font["c"].name = "ba"
+        typeText("a")
+        self.assertEqual(list(widget.selection()), [2])
+
+    def test_setCellSize(self):
+        widget = self.view.widget()
+
+        def cellHeight():
+            widget._updateRenderer()
+            return dict(widget.renderer().representationKey()[1])["height"]
+
+        self.view.setCellSize(60)
+        self.assertEqual(cellHeight(), 60)
+        # changed again before it settled, drawn at a level size
+        self.view.setCellSize(70)
+        self.assertEqual(cellHeight(), 128)
+        self.view.setCellSize(62)
+        self.assertEqual(cellHeight(), 64)
+        widget._cellSizeTimer.timeout.emit()
+        self.assertEqual(cellHeight(), 62)
+
+
+class GlyphCellRendererTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        baseRepresentationFactories.registerAllFactories()
+        representationFactories.registerAllFactories()
+
+    def _waitUntil(self, predicate):
+        deadline = time.monotonic() + 10
+        while not predicate() and time.monotonic() < deadline:
+            self.app.processEvents()
+        return predicate()
+
+    def test_setQueue(self):
+        font = TFont()
+        glyph = font.newGlyph("a")
+        pen = glyph.getPen()
+        pen.moveTo((100, 0))
+        pen.lineTo((100, 500))
+        pen.lineTo((400, 500))
+        pen.closePath()
+        template = TemplateGlyph("uni0431", font.layers.defaultLayer)
+        cache = GlyphCellCache()
+        renderer = GlyphCellRenderer(maxWorkers=1, cache=cache)
+        arguments = dict(width=50, height=40, pixelRatio=1)
+        renderer.setRepresentation("TruFont.GlyphCell", arguments)
+        renderer.setQueue([glyph, None, template])
+        self.assertTrue(
+            self._waitUntil(
+                lambda: None not in (renderer.pixmap(glyph), renderer.pixmap(template))
+            )
+        )
+        for glyph_ in (glyph, template):
+            pixmap = renderer.pixmap(glyph_)
+            self.assertEqual((pixmap.width(), pixmap.height()), (50, 40))
+            expected = glyph_.getRepresentation("TruFont.GlyphCell", **arguments)
+            self.assertEqual(pixmap.toImage(), expected.toImage())
+        # outdated pixmaps are kept until drawn again
+        glyph.width = 300
+        renderer.invalidate(glyph)
+        pixmap = renderer.pixmap(glyph)
+        self.assertIsNotNone(pixmap)
+        renderer.setQueue([template, glyph])
+        self.assertTrue(self._waitUntil(lambda: renderer.pixmap(glyph) is not pixmap))
+        # other representations are cached separately
+        renderer.setRepresentation("TruFont.GlyphCell", dict(arguments, width=60))
+        self.assertIsNone(renderer.pixmap(template))
+        self.assertEqual(len(cache), 2)
+        renderer.removeFont(font)
+        self.assertEqual(len(cache), 0)
+
+    def test_cellGlyph(self):
+        font = TFont()
+        font.info.descender = -200
+        glyph = font.newGlyph("a")
+        glyph.unicode = 0x61
+        glyph.width = 400
+        glyph.markColor = "1,0,0,1"
+        renderer = GlyphCellRenderer(maxWorkers=1, cache=GlyphCellCache())
+        # cells are drawn from what's read on the GUI thread, not through
+        # the glyph nor by falling back to the GUI thread
+        renderer.renderCell = self.fail
+        arguments = dict(width=50, height=100, pixelRatio=1)
+        renderer.setRepresentation("TruFont.GlyphCell", arguments)
+        renderer.setQueue([glyph])
+        self.assertTrue(self._waitUntil(lambda: renderer.pixmap(glyph) is not None))
+        expected = glyph.getRepresentation("TruFont.GlyphCell", **arguments)
+        self.assertEqual(renderer.pixmap(glyph).toImage(), expected.toImage())
+
+    def test_pixelRatio(self):
+        font = TFont()
+        glyph = font.newGlyph("a")
+        # the default ratio is a float
+        for image in (False, True):
+            cell = glyph.getRepresentation(
+                "defconQt.GlyphCell", width=50, height=40, image=image
+            )
+            self.assertEqual((cell.width(), cell.height()), (50, 40))
+        cell = glyph.getRepresentation(
+            "defconQt.GlyphCell", width=51, height=40, pixelRatio=1.5, image=True
+        )
+        self.assertEqual((cell.width(), cell.height()), (76, 60))
+
+
+class GlyphCellBandsTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        baseRepresentationFactories.registerAllFactories()
+        representationFactories.registerAllFactories()
+        font = self.font = TFont()
+        for index in range(40):
+            glyph = font.newGlyph("g%02d" % index)
+            pen = glyph.getPen()
+            pen.moveTo((100, 0))
+            pen.lineTo((100 + 10 * index, 500))
+            pen.lineTo((500, 0))
+            pen.closePath()
+        self.view = GlyphCellView()
+        self.view.resize(400, 300)
+        self.view.setGlyphs([font["g%02d" % index] for index in range(30)])
+        self.view.show()
+        self._grab()
+
+    def _grab(self):
+        # once the cells drawn in the background are in, i.e. the view
+        # stopped changing
+        widget = self.view.widget()
+        image = widget.grab().toImage()
+        stableSince = time.monotonic()
+        deadline = stableSince + 10
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            newImage = widget.grab().toImage()
+            if newImage != image:
+                image = newImage
+                stableSince = time.monotonic()
+            elif time.monotonic() - stableSince > 0.2:
+                break
+        return image
+
+    def _assertRedrawn(self):
+        image = self._grab()
+        # compare with bands drawn from scratch
+        self.view.widget()._invalidateBands()
+        self.assertEqual(image, self._grab())
+
+    def test_selection(self):
+        self.view.setSelection({1, 8, 20})
+        self._assertRedrawn()
+        self.view.setSelection({8})
+        self._assertRedrawn()
+
+    def test_glyphChanged(self):
+        self.font["g03"].markColor = (1, 0, 0, 1)
+        self._assertRedrawn()
+        self.font["g24"].move((0, 100))
+        self._assertRedrawn()
+
+    def test_cellSize(self):
+        self.view.setCellSize(72)
+        self.view.widget()._cellSizeTimer.timeout.emit()
+        self._assertRedrawn()
+
+    def test_columnCount(self):
+        columnCount = self.view.widget()._columnCount
+        self.view.resize(300, 300)
+        self._assertRedrawn()
+        self.assertNotEqual(self.view.widget()._columnCount, columnCount)
+
+    def test_appendGlyphs(self):
+        font = self.font
+        # to the last row, which is in view
+        self.view.appendGlyphs([font["g30"], font["g31"]])
+        self._assertRedrawn()
+        # and past it
+        self.view.appendGlyphs([font["g%02d" % index] for index in range(32, 40)])
+        self._assertRedrawn()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+import unittest
+
+from trufont import representationFactories
+from trufont.controls.glyphDialogs import FindDialog, GlyphNameListModel
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+
+
+class GlyphNameListModelTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def test_setFilter(self):
+        model = GlyphNameListModel(("a", "aacute", "b", "bacute", ""))
+        self.assertEqual(model.rowCount(), 4)
+        model.setFilter("a")
+        self.assertEqual(model.glyphNames(), ["a", "aacute"])
+        model.setFilter("aa")
+        self.assertEqual(model.glyphNames(), ["aacute"])
+        model.setFilter("a")
+        self.assertEqual(model.glyphNames(), ["a", "aacute"])
+        model.setFilter("a", beginsWith=False)
+        self.assertEqual(model.glyphNames(), ["a", "aacute", "bacute"])
+        model.setFilter("acute", beginsWith=False)
+        self.assertEqual(model.glyphNames(), ["aacute", "bacute"])
+        model.setFilter("bacute")
+        self.assertEqual(model.glyphNames(), ["bacute"])
+        self.assertEqual(model.index(0).data(), "bacute")
+        model.setGlyphNames(("bacute", "bb"))
+        self.assertEqual(model.glyphNames(), ["bacute"])
+
+
+class FindDialogTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        representationFactories.registerAllFactories()
+
+    def test_sortedGlyphNames(self):
+        font = TFont()
+        for name, uni in (("b", 0x62), ("a", 0x61)):
+            font.newGlyph(name).unicode = uni
+        layer = font.layers.defaultLayer
+        dialog = FindDialog(font["a"])
+        self.assertEqual(dialog.glyphModel.glyphNames(), ["a", "b"])
+        glyphNames = layer.getRepresentation("TruFont.SortedGlyphNames")
+        font["a"].width = 250
+        self.assertIs(layer.getRepresentation("TruFont.SortedGlyphNames"), glyphNames)
+        font["a"].name = "c"
+        self.assertEqual(
+            layer.getRepresentation("TruFont.SortedGlyphNames"), ("b", "c")
+        )
+        font.newGlyph("d")
+        self.assertEqual(
+            layer.getRepresentation("TruFont.SortedGlyphNames"), ("b", "c", "d")
+        )
+
+    def test_templateGlyphs(self):
+        font = TFont()
+        font.newGlyph("b")
+        font.glyphOrder = ["c", "b", "a"]
+        dialog = FindDialog(font["b"])
+        self.assertEqual(dialog.glyphModel.glyphNames(), ["a", "b", "c"])
+        # cached until the glyph order changes
+        layer = font.layers.defaultLayer
+        glyphNames = layer.getRepresentation("TruFont.SortedGlyphNames", templates=True)
+        self.assertIs(FindDialog(font["b"])._sortedGlyphNames, glyphNames)
+        font.glyphOrder = ["b", "d"]
+        dialog = FindDialog(font["b"])
+        self.assertEqual(dialog.glyphModel.glyphNames(), ["b", "d"])
+        font.newGlyph("e")
+        dialog = FindDialog(font["b"])
+        self.assertEqual(dialog.glyphModel.glyphNames(), ["b", "d", "e"])
+        font.glyphOrder = ["c", "b", "a"]
+
+        class Dialog(FindDialog):
+            def exec_(self):
+                return True
+
+        # a template glyph is added to the font once found
+        glyph, _ = Dialog.getNewGlyph(None, font["b"])
+        self.assertIs(glyph, font["a"])
+        self.assertTrue(glyph.template)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+from trufont.objects.glyphLoader import GlyphLoader
+from trufont.windows.fontWindow import FontWindow
+
+_glyphNames = ["g%03d" % i for i in range(300)]
+
+
+class GlyphLoaderTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        for index, name in enumerate(_glyphNames):
+            glyph = font.newGlyph(name)
+            glyph.width = index
+            pen = glyph.getPen()
+            pen.moveTo((0, 0))
+            pen.lineTo((index, 100))
+            pen.lineTo((100, 0))
+            pen.closePath()
+        # last in the glyph order, first alphabetically
+        font.newGlyph("a").width = 1000
+        font.glyphOrder = list(reversed(_glyphNames))
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempDir.name, "test.ufo")
+        font.save(self.path)
+        self.font = TFont(self.path)
+        self.loaded = []
+        self.finished = False
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def _glyphsLoaded(self, glyphNames):
+        self.loaded.extend(glyphNames)
+
+    def _finished(self):
+        self.finished = True
+
+    def _startLoader(self):
+        loader = GlyphLoader(self.font)
+        loader.glyphsLoaded.connect(self._glyphsLoaded)
+        loader.finished.connect(self._finished)
+        loader.start()
+        return loader
+
+    def _waitUntilFinished(self):
+        deadline = time.monotonic() + 10
+        while not self.finished and time.monotonic() < deadline:
+            self.app.processEvents()
+        return self.finished
+
+    def test_order(self):
+        layer = self.font.layers.defaultLayer
+        loader = self._startLoader()
+        self.assertTrue(loader.isRunning())
+        self.assertTrue(loader.isPending("a"))
+        self.assertTrue(self._waitUntilFinished())
+        self.assertFalse(loader.isRunning())
+        # glyph order first, then the other glyphs
+        self.assertEqual(self.loaded, list(reversed(_glyphNames)) + ["a"])
+        self.assertEqual(loader.progress(), (301, 301))
+        self.assertTrue(all(layer.isGlyphLoaded(name) for name in self.loaded))
+        self.assertEqual(self.font["g123"].width, 123)
+        self.assertEqual(self.font["g123"][0][1].x, 123)
+        self.assertFalse(self.font["g123"].dirty)
+        self.assertFalse(loader.isPending("a"))
+
+    def test_loadOnDemand(self):
+        loader = self._startLoader()
+        self.assertTrue(loader.isPending("g000"))
+        glyph = self.font["g000"]
+        glyph.width = 50
+        self.assertTrue(self._waitUntilFinished())
+        self.assertIn("g000", self.loaded)
+        # the glyph isn't loaded again
+        self.assertIs(self.font["g000"], glyph)
+        self.assertEqual(glyph.width, 50)
+
+    def test_parseFailure(self):
+        layer = self.font.layers.defaultLayer
+        fileName = layer.glyphSet().contents["g100"]
+        with open(os.path.join(self.path, "glyphs", fileName), "w") as file:
+            file.write("<glyph")
+        loader = self._startLoader()
+        self.assertTrue(self._waitUntilFinished())
+        self.assertNotIn("g100", self.loaded)
+        self.assertEqual(len(self.loaded), 300)
+        self.assertFalse(loader.isPending("g100"))
+        self.assertFalse(layer.isGlyphLoaded("g100"))
+        # left to the layer to report
+        with self.assertRaises(Exception):
+            self.font["g100"]
+
+    def test_cancel(self):
+        layer = self.font.layers.defaultLayer
+        loader = self._startLoader()
+        loader.cancel()
+        self.assertFalse(loader.isRunning())
+        self.assertFalse(loader.isPending("g000"))
+        for _ in range(10):
+            self.app.processEvents()
+        self.assertEqual(self.loaded, [])
+        self.assertFalse(layer.isGlyphLoaded("g000"))
+        self.assertEqual(self.font["g000"].width, 0)
+
+    def test_placeholders(self):
+        font = self.font
+        loader = GlyphLoader(font)
+        loader.finished.connect(self._finished)
+        window = FontWindow(font, glyphLoader=loader)
+        view = window.glyphCellView
+        glyphs = view.glyphs()
+        self.assertEqual(len(glyphs), 301)
+        self.assertIn(None, glyphs)
+        self.assertTrue(self._waitUntilFinished())
+        glyphNames = list(reversed(_glyphNames)) + ["a"]
+        self.assertEqual([glyph.name for glyph in view.glyphs()], glyphNames)
+        self.assertIs(view.glyphs()[0], font["g299"])
+
+    def test_cancelPlaceholders(self):
+        font = self.font
+        window = FontWindow(font, glyphLoader=GlyphLoader(font))
+        window.show()
+        view = window.glyphCellView
+        self.assertIn(None, view.glyphs())
+        window.statusBar.progressCancelled.emit()
+        self.assertTrue(window.isVisible())
+        self.assertFalse(window.statusBar.progressVisible())
+        self.assertNotIn(None, view.glyphs())
+        self.assertEqual(view.glyphs()[-1], font["a"])
+        font.dirty = False
+        window.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import sys
+import unittest
+
+from defconQt.tools.glyphNameIndex import GlyphNameIndex
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+
+
+class GlyphNameIndexTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        for name, uni in (("sys", None), ("signal", None), ("vanilla", 0xE9)):
+            glyph = font.newGlyph(name)
+            if uni is not None:
+                glyph.unicode = uni
+        self.font = font
+
+    def test_find(self):
+        font = self.font
+        index = GlyphNameIndex([font["sys"], None, font["signal"], font["vanilla"]])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.find("s"), 2)
+        self.assertEqual(index.find("sy"), 0)
+        self.assertEqual(index.find("t"), 3)
+        self.assertIsNone(index.find("w"))
+        self.assertEqual(index.indexForCodepoint(0xE9), 3)
+        self.assertIsNone(index.indexForCodepoint(0x61))
+
+    def test_setGlyph(self):
+        font = self.font
+        glyphs = [font["sys"], font["signal"], font["sys"]]
+        index = GlyphNameIndex(glyphs)
+        self.assertEqual(index.find("sy"), 0)
+        index.removeGlyph(0)
+        self.assertEqual(index.find("sy"), 2)
+        index.setGlyph(3, font["vanilla"])
+        self.assertEqual(index.find("v"), 3)
+        self.assertEqual(index.indexForCodepoint(0xE9), 3)
+        font["vanilla"].name = "zipimport"
+        font["zipimport"].unicode = 0x7A
+        index.setGlyph(3, font["zipimport"])
+        self.assertEqual(index.find("v"), 3)
+        self.assertEqual(index.find("zi"), 3)
+        self.assertIsNone(index.indexForCodepoint(0xE9))
+        self.assertEqual(index.indexForCodepoint(0x7A), 3)
+        index.setGlyph(1, None)
+        self.assertEqual(index.find("s"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+import unittest
+
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+from trufont.objects.glyphOrderIndex import GlyphOrderIndex
+
+
+class GlyphOrderIndexTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def test_update(self):
+        glyphNames = ["a", "b", "a", "c"]
+        index = GlyphOrderIndex(glyphNames)
+        self.assertEqual(len(index), 4)
+        self.assertIn("b", index)
+        self.assertNotIn("d", index)
+        self.assertEqual(index.index("a"), 0)
+        self.assertEqual(index.index("c"), 3)
+        with self.assertRaises(ValueError):
+            index.index("d")
+        self.assertTrue(index.isCurrent(list(glyphNames)))
+        # the index doesn't share the list it was given
+        glyphNames[1] = "e"
+        self.assertFalse(index.isCurrent(glyphNames))
+        self.assertIn("b", index)
+        glyphNames[1] = "b"
+        index.update(glyphNames + ["d"])
+        self.assertEqual(index.index("d"), 4)
+        index.update(["c", "b"])
+        self.assertEqual(index.index("c"), 0)
+        self.assertNotIn("a", index)
+        index.update(None)
+        self.assertEqual(len(index), 0)
+        self.assertTrue(index.isCurrent(None))
+
+    def test_font(self):
+        font = TFont()
+        for name in ("a", "b", "c"):
+            font.newGlyph(name)
+        index = font.glyphOrderIndex
+        self.assertEqual(list(index), ["a", "b", "c"])
+        self.assertEqual(index.index("c"), 2)
+        del font["b"]
+        self.assertEqual(font.glyphOrder, ["a", "c"])
+        self.assertEqual(font.glyphOrderIndex.index("c"), 1)
+        font["a"].name = "d"
+        self.assertEqual(font.glyphOrder, ["d", "c"])
+        font.newGlyph("c")
+        self.assertEqual(font.glyphOrder, ["d", "c"])
+        font.glyphOrder = ["c", "e"]
+        self.assertIs(font.glyphOrderIndex, index)
+        self.assertEqual(index.index("e"), 1)
+        self.assertNotIn("d", index)
+        # scripts may edit the glyph order in place
+        font.lib["public.glyphOrder"].insert(0, "z")
+        self.assertIn("z", font.glyphOrderIndex)
+        self.assertEqual(font.glyphOrderIndex.index("c"), 1)
+        font.lib["public.glyphOrder"][1] = "y"
+        self.assertEqual(font.glyphOrderIndex.index("y"), 1)
+        self.assertNotIn("c", font.glyphOrderIndex)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import itertools
+import sys
+import unittest
+
+from defconQt import representationFactories as baseRepresentationFactories
+from trufont import representationFactories
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+
+
+def _pathElements(path):
+    elements = []
+    for index in range(path.elementCount()):
+        element = path.elementAt(index)
+        elements.append((element.type, round(element.x, 6), round(element.y, 6)))
+    return elements
+
+
+class SelectedContoursQPainterPathTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        baseRepresentationFactories.registerAllFactories()
+        representationFactories.registerAllFactories()
+        self.glyph = TFont().newGlyph("a")
+
+    def _addContour(self, points):
+        pointPen = self.glyph.getPointPen()
+        pointPen.beginPath()
+        for point, segmentType in points:
+            pointPen.addPoint(point, segmentType)
+        pointPen.endPath()
+
+    def _assertMatchesFilterSelection(self):
+        glyph = self.glyph
+        points = [point for contour in glyph for point in contour]
+        # every selection, which covers partial runs, runs that wrap around
+        # the start of the contour and selected off-curves
+        for selected in itertools.product((False, True), repeat=len(points)):
+            glyph.selection = {p for p, s in zip(points, selected) if s}
+            expected = glyph.getRepresentation(
+                "TruFont.FilterSelection"
+            ).getRepresentation("defconQt.NoComponentsQPainterPath")
+            path = glyph.getRepresentation("TruFont.SelectedContoursQPainterPath")
+            self.assertEqual(_pathElements(path), _pathElements(expected), msg=selected)
+
+    def test_closedContour(self):
+        self._addContour(
+            [
+                ((0, 0), "curve"),
+                ((0, 100), None),
+                ((50, 150), None),
+                ((100, 100), "curve"),
+                ((100, 0), "line"),
+                ((50, -20), None),
+                ((20, -10), None),
+            ]
+        )
+        self._assertMatchesFilterSelection()
+
+    def test_openContour(self):
+        self._addContour(
+            [
+                ((0, 0), "move"),
+                ((10, 10), None),
+                ((20, 0), "qcurve"),
+                ((30, 30), "line"),
+                ((40, 0), None),
+                ((45, 5), None),
+                ((50, 0), "curve"),
+            ]
+        )
+        self._assertMatchesFilterSelection()
+
+    def test_qCurves(self):
+        self._addContour(
+            [
+                ((5, 5), None),
+                ((0, 100), "qcurve"),
+                ((50, 120), None),
+                ((60, 140), None),
+                ((100, 100), "qcurve"),
+                ((100, 0), "line"),
+                ((60, -10), None),
+            ]
+        )
+        self._assertMatchesFilterSelection()
+
+    def test_offCurvesOnly(self):
+        self._addContour([((0, 0), None), ((10, 20), None), ((30, 10), None)])
+        self._assertMatchesFilterSelection()
+
+    def test_moves(self):
+        self._addContour([((0, 0), "move"), ((10, 20), "line")])
+        self._addContour([((50, 0), "move")])
+        self._addContour([((0, 0), "line"), ((10, 20), "line"), ((30, 0), "line")])
+        self._assertMatchesFilterSelection()
+
+
+if __name__ == "__main__":
+    unittest.main()
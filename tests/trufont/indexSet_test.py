@@ -0,0 +1,63 @@
+import unittest
+
+from defconQt.tools.indexSet import IndexSet
+
+
+class IndexSetTest(unittest.TestCase):
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def test_init(self):
+        indexSet = IndexSet({5, 1, 2, 3, 8})
+        self.assertEqual(indexSet.ranges(), [range(1, 4), range(5, 6), range(8, 9)])
+        self.assertEqual(list(indexSet), [1, 2, 3, 5, 8])
+        self.assertEqual(len(indexSet), 5)
+        self.assertEqual((indexSet.first(), indexSet.last()), (1, 8))
+        self.assertEqual(IndexSet(range(3, 50000)).ranges(), [range(3, 50000)])
+        self.assertEqual(IndexSet(indexSet), indexSet)
+        self.assertFalse(IndexSet())
+        self.assertIsNone(IndexSet().first())
+
+    def test_contains(self):
+        indexSet = IndexSet(range(10, 20)) | IndexSet(range(30, 40))
+        for index in (10, 19, 30, 39):
+            self.assertIn(index, indexSet)
+        for index in (0, 9, 20, 29, 40):
+            self.assertNotIn(index, indexSet)
+
+    def test_addRange(self):
+        indexSet = IndexSet((1, 5, 10))
+        indexSet.addRange(2, 5)
+        self.assertEqual(indexSet.ranges(), [range(1, 6), range(10, 11)])
+        indexSet.add(0)
+        indexSet.addRange(20, 20)
+        self.assertEqual(indexSet.ranges(), [range(0, 6), range(10, 11)])
+        indexSet.addRange(4, 12)
+        self.assertEqual(indexSet.ranges(), [range(0, 12)])
+        self.assertEqual(len(indexSet), 12)
+
+    def test_discardRange(self):
+        indexSet = IndexSet(range(10))
+        indexSet.discard(4)
+        self.assertEqual(indexSet.ranges(), [range(0, 4), range(5, 10)])
+        indexSet.discard(4)
+        self.assertEqual(len(indexSet), 9)
+        indexSet.discardRange(2, 7)
+        self.assertEqual(indexSet.ranges(), [range(0, 2), range(7, 10)])
+        indexSet.discardRange(0, 2)
+        self.assertEqual(indexSet.ranges(), [range(7, 10)])
+        self.assertEqual(len(indexSet), 3)
+
+    def test_operators(self):
+        a = IndexSet(range(0, 10))
+        b = IndexSet((3, 4, 12))
+        self.assertEqual(list(a | b), list(range(10)) + [12])
+        self.assertEqual(list(a & b), [3, 4])
+        self.assertEqual(list(a - b), [0, 1, 2, 5, 6, 7, 8, 9])
+        self.assertEqual(list(a ^ b), [0, 1, 2, 5, 6, 7, 8, 9, 12])
+        self.assertEqual(list(b.complement(6)), [0, 1, 2, 5])
+        self.assertEqual(len(a | b), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
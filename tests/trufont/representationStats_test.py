@@ -0,0 +1,72 @@
+import sys
+import unittest
+
+from defconQt import representationFactories as baseRepresentationFactories
+from defconQt.tools import representationStats
+from trufont import representationFactories
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+from trufont.windows.representationCacheWindow import RepresentationCacheWindow
+
+
+class RepresentationStatsTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        baseRepresentationFactories.registerAllFactories()
+        representationFactories.registerAllFactories()
+        representationStats.resetStats()
+
+    def tearDown(self):
+        representationStats.setEnabled(False)
+        representationStats.resetStats()
+
+    def test_stats(self):
+        font = TFont()
+        glyph = font.newGlyph("a")
+        pen = glyph.getPen()
+        pen.moveTo((100, 0))
+        pen.lineTo((100, 500))
+        pen.lineTo((400, 500))
+        pen.closePath()
+        glyph.getRepresentation("defconQt.QPainterPath")
+        self.assertEqual(representationStats.stats(), {})
+
+        representationStats.setEnabled(True)
+        for _ in range(3):
+            glyph.getRepresentation("defconQt.QPainterPath")
+        glyph.getRepresentation("defconQt.OutlineInformation")
+        glyph.width = 250
+        glyph.getRepresentation("defconQt.QPainterPath")
+        stats = representationStats.stats()
+        pathStats = stats["defconQt.QPainterPath"]
+        # the first path was made before recording
+        self.assertEqual((pathStats["hits"], pathStats["misses"]), (3, 1))
+        self.assertEqual(pathStats["destructions"], 1)
+        self.assertEqual(sum(pathStats["histogram"]), 1)
+        self.assertEqual(pathStats["cached"], 1)
+        self.assertGreater(pathStats["memory"], 3 * 24)
+        outlineStats = stats["defconQt.OutlineInformation"]
+        self.assertEqual(outlineStats["misses"], 1)
+        # outlines aren't affected by the width
+        self.assertEqual(outlineStats["destructions"], 0)
+        self.assertEqual(outlineStats["cached"], 1)
+
+        window = RepresentationCacheWindow()
+        window.refresh()
+        self.assertEqual(window.statsView.topLevelItemCount(), 2)
+
+        representationStats.setEnabled(False)
+        glyph.getRepresentation("defconQt.QPainterPath")
+        glyph.width = 300
+        newPathStats = representationStats.stats()["defconQt.QPainterPath"]
+        for key in ("hits", "misses", "destructions"):
+            self.assertEqual(newPathStats[key], pathStats[key])
+
+
+if __name__ == "__main__":
+    unittest.main()
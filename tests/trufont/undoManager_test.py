@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from ufo2ft import compileOTF
+
+from trufont.objects.application import Application
+from trufont.objects.defcon import TFont
+
+
+class LazyUndoManagerTest(unittest.TestCase):
+
+    app = Application(sys.argv)
+
+    def __init__(self, methodName):
+        unittest.TestCase.__init__(self, methodName)
+
+    def setUp(self):
+        font = TFont()
+        glyph = font.newGlyph("a")
+        glyph.width = 500
+        pen = glyph.getPen()
+        pen.moveTo((0, 0))
+        pen.lineTo((100, 0))
+        pen.lineTo((100, 100))
+        pen.closePath()
+        self.tempDir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tempDir.name, "test.ufo")
+        font.save(path)
+        self.font = TFont(path)
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_loadGlyph(self):
+        glyph = self.font["a"]
+        self.assertTrue(glyph.undoable)
+        self.assertIsNone(glyph._undoManager)
+        self.assertIsNotNone(glyph.undoManager)
+        self.assertFalse(glyph.canUndo())
+
+    def test_undoFirstChange(self):
+        glyph = self.font["a"]
+        points = [(pt.x, pt.y) for pt in glyph[0]]
+        glyph[0].move((10, 10))
+        glyph.width = 600
+        self.assertIsNotNone(glyph._undoManager)
+        glyph.undo()
+        self.assertEqual(glyph.width, 500)
+        glyph.undo()
+        self.assertEqual([(pt.x, pt.y) for pt in glyph[0]], points)
+        self.assertFalse(glyph.canUndo())
+        glyph.redo()
+        self.assertEqual(glyph[0][0].x, 10)
+
+    def test_undoFirstChangeExtracted(self):
+        self.font.info.unitsPerEm = 1000
+        path = os.path.join(self.tempDir.name, "test.otf")
+        compileOTF(self.font).save(path)
+        font = TFont()
+        font.extract(path)
+        glyph = font["a"]
+        # no GLIF to read the glyph back from
+        glyph.appendAnchor(dict(x=50, y=100, name="top"))
+        glyph.undo()
+        self.assertEqual(len(glyph.anchors), 0)
+        self.assertFalse(glyph.canUndo())
+
+    def test_undoFirstChangeMerged(self):
+        source = TFont()
+        source.newGlyph("a").copyDataFromGlyph(self.font["a"])
+        source["a"].move((50, 0))
+        self.font.mergeFont(source)
+        glyph = self.font["a"]
+        # back to the merged glyph, not its GLIF
+        glyph.move((10, 10))
+        glyph.undo()
+        self.assertEqual((glyph[0][0].x, glyph[0][0].y), (50, 0))
+        self.assertFalse(glyph.canUndo())
+
+
+if __name__ == "__main__":
+    unittest.main()